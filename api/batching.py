@@ -0,0 +1,155 @@
+import asyncio
+import contextlib
+import logging
+import os
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from api.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# (record, key, future, enqueued_at)
+_Pending = tuple[dict[str, Any], Any, "asyncio.Future[dict[str, Any]]", float]
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+QUEUE_WAIT_MS_BUCKETS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class MicroBatcher:
+    """Collects concurrent single-record requests and scores them in one call.
+
+    A batch is dispatched once ``max_batch_size`` records are waiting or the oldest
+    waiting record has been queued for ``max_wait_ms``. A batch only holds records
+    submitted with the same ``key`` (by identity, e.g. the model resolved for the
+    request); ``score_fn(records, key)`` runs in a worker thread and must return one
+    result per record, in order.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[list[dict[str, Any]], Any], list[dict[str, Any]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1024,
+    ) -> None:
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue_size = max_queue_size
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_histogram = Histogram(QUEUE_WAIT_MS_BUCKETS)
+        self._pending: deque[_Pending] = deque()
+        self._not_empty = asyncio.Event()
+        self._full = asyncio.Event()
+        self._worker: asyncio.Task[None] | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                "Micro-batcher started: max_batch_size=%d, max_wait_ms=%.1f, max_queue_size=%d",
+                self.max_batch_size, self.max_wait_ms, self.max_queue_size,
+            )
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
+        while self._pending:
+            _, _, future, _ = self._pending.popleft()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+        logger.info("Micro-batcher stopped")
+
+    async def submit(self, record: dict[str, Any], key: Any = None) -> dict[str, Any]:
+        if self._worker is None:
+            raise RuntimeError("Micro-batcher not started")
+        if len(self._pending) >= self.max_queue_size:
+            raise QueueFullError("Prediction queue full")
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
+        self._pending.append((record, key, future, loop.time()))
+        self._not_empty.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+            remaining = self.max_wait_ms / 1000 - (loop.time() - self._pending[0][3])
+            if len(self._pending) < self.max_batch_size and remaining > 0:
+                self._full.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), remaining)
+            key = self._pending[0][1]
+            batch = []
+            while (
+                self._pending
+                and len(batch) < self.max_batch_size
+                and self._pending[0][1] is key
+            ):
+                batch.append(self._pending.popleft())
+            await self._dispatch(batch, key, loop.time())
+
+    async def _dispatch(self, batch: list[_Pending], key: Any, dispatched_at: float) -> None:
+        self.batch_size_histogram.observe(len(batch))
+        for _, _, _, enqueued_at in batch:
+            self.queue_wait_histogram.observe((dispatched_at - enqueued_at) * 1000)
+        try:
+            results = await asyncio.to_thread(
+                self.score_fn, [record for record, _, _, _ in batch], key
+            )
+        except asyncio.CancelledError:
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Micro-batcher stopped"))
+            raise
+        except Exception as exc:
+            logger.exception("Micro-batch scoring failed: size=%d", len(batch))
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, _, future, _), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "max_queue_size": self.max_queue_size,
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "queue_wait_ms": self.queue_wait_histogram.snapshot(),
+        }
+
+
+def create_micro_batcher(
+    score_fn: Callable[[list[dict[str, Any]], Any], list[dict[str, Any]]],
+) -> MicroBatcher | None:
+    if os.environ.get("MICROBATCH_ENABLED", "0").lower() not in ("1", "true", "yes"):
+        return None
+    return MicroBatcher(
+        score_fn,
+        max_batch_size=int(os.environ.get("MICROBATCH_MAX_SIZE", "32")),
+        max_wait_ms=float(os.environ.get("MICROBATCH_MAX_WAIT_MS", "5")),
+        max_queue_size=int(os.environ.get("MICROBATCH_QUEUE_SIZE", "1024")),
+    )
@@ -1,16 +1,38 @@
 import logging
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
+from typing import Annotated, Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, Response
 
-from api.predictor import get_model, get_risk_level
+from api.batching import MicroBatcher, QueueFullError, create_micro_batcher
+from api.metrics import LATENCY_BUCKETS, METRICS, metrics_enabled, observe_stage
+from api.predictor import (
+    get_model,
+    get_prediction_cache,
+    get_registry,
+    get_risk_level,
+    predict_records,
+)
+from api.registry import ModelNotFoundError
 from api.schemas import (
+    BatchingStatsResponse,
     BatchPredictionRequest,
     BatchPredictionResponse,
+    CacheStatsResponse,
     CustomerData,
     HealthResponse,
     PredictionResponse,
+    RegistryResponse,
+)
+from api.streaming import (
+    CSV_MEDIA_TYPES,
+    NDJSON_MEDIA_TYPES,
+    DuplexStreamingResponse,
+    stream_predictions,
 )
 
 logging.basicConfig(
@@ -19,12 +41,89 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Route a request to a named model, or pin a version of it, when a registry is configured.
+ModelName = Annotated[str | None, Header(alias="X-Model-Name")]
+ModelVersion = Annotated[str | None, Header(alias="X-Model-Version")]
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     get_model()
     logger.info("Model loaded and ready")
+    registry = get_registry()
+    if registry is not None:
+        registry.start()
+    batcher = create_micro_batcher(_score_records)
+    app.state.batcher = batcher
+    if batcher is not None:
+        if metrics_enabled():
+            METRICS.register(
+                "microbatch_size", "Records per micro-batch.", batcher.batch_size_histogram
+            )
+            METRICS.register(
+                "microbatch_queue_wait_milliseconds",
+                "Time a record waits in the micro-batch queue.",
+                batcher.queue_wait_histogram,
+            )
+        await batcher.start()
     yield
+    if batcher is not None:
+        await batcher.stop()
+    app.state.batcher = None
+    if registry is not None:
+        registry.stop()
+
+
+def _score_records(records: list[dict[str, Any]], model: Any) -> list[dict[str, Any]]:
+    # Batched under the model each request resolved, so responses report the version
+    # that scored them even if the registry reloads while they wait.
+    return predict_records(model, records)
+
+
+def _get_batcher() -> MicroBatcher | None:
+    return getattr(app.state, "batcher", None)
+
+
+def _resolve_model(name: str | None = None, version: str | None = None) -> Any:
+    try:
+        return get_model(name, version) if name or version else get_model()
+    except ModelNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc.args[0])) from exc
+    except Exception as exc:
+        logger.exception("Model unavailable")
+        raise HTTPException(status_code=503, detail="Model not available") from exc
+
+
+def _model_version(model: Any) -> str | None:
+    version = model.metadata.get("registry_version")
+    return str(version) if version is not None else None
+
+
+def _observe_validation(http_request: Request) -> None:
+    # Time from the request reaching the app to the handler: body parsing and validation.
+    started = getattr(http_request.state, "started_at", None)
+    if started is not None:
+        observe_stage("validate", time.perf_counter() - started)
+
+
+def _to_responses(model: Any, results: list[dict[str, Any]]) -> list[PredictionResponse]:
+    start = time.perf_counter()
+    model_type = str(model.metadata.get("model_type", "unknown"))
+    model_version = _model_version(model)
+    predictions = [
+        PredictionResponse(
+            churn_prediction=int(result["churn_prediction"]),
+            churn_probability=float(result["churn_probability"]),
+            risk_level=get_risk_level(float(result["churn_probability"])),
+            confidence=float(result["confidence"]),
+            model_type=model_type,
+            model_version=model_version,
+        )
+        for result in results
+    ]
+    if metrics_enabled():
+        observe_stage("respond", time.perf_counter() - start)
+    return predictions
 
 
 app = FastAPI(
@@ -35,6 +134,31 @@ app = FastAPI(
 )
 
 
+@app.middleware("http")
+async def record_request_metrics(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Count requests and time them per route template; streams are timed to first byte."""
+    if not metrics_enabled():
+        return await call_next(request)
+    start = request.state.started_at = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        labels = {"method": request.method, "route": route}
+        METRICS.histogram(
+            "http_request_duration_seconds", "Request latency by route.", LATENCY_BUCKETS, labels
+        ).observe(time.perf_counter() - start)
+        METRICS.counter(
+            "http_requests_total", "Requests by route and status.",
+            {**labels, "status": str(status)},
+        ).inc()
+
+
 @app.get("/health", response_model=HealthResponse)
 def health() -> HealthResponse:
     try:
@@ -49,52 +173,139 @@ def health() -> HealthResponse:
 
 
 @app.post("/predict", response_model=PredictionResponse)
-def predict(customer: CustomerData) -> PredictionResponse:
-    try:
-        model = get_model()
-    except Exception as exc:
-        logger.exception("Model unavailable")
-        raise HTTPException(status_code=503, detail="Model not available") from exc
-
+async def predict(
+    customer: CustomerData,
+    http_request: Request,
+    x_model_name: ModelName = None,
+    x_model_version: ModelVersion = None,
+) -> PredictionResponse:
+    _observe_validation(http_request)
+    model = _resolve_model(x_model_name, x_model_version)
+    # The micro-batcher scores with the default model only; routed requests bypass it.
+    batcher = None if x_model_name or x_model_version else _get_batcher()
     try:
-        result = model.predict_single(customer.model_dump())
+        if batcher is not None:
+            result = await batcher.submit(customer.model_dump(), key=model)
+        else:
+            result = (await run_in_threadpool(predict_records, model, [customer.model_dump()]))[0]
+    except QueueFullError as exc:
+        logger.warning("Prediction queue full, rejecting request")
+        raise HTTPException(status_code=503, detail="Prediction queue full") from exc
     except Exception as exc:
         logger.exception("Prediction failed")
         raise HTTPException(status_code=500, detail="Prediction failed") from exc
 
-    return PredictionResponse(
-        churn_prediction=int(result["churn_prediction"]),
-        churn_probability=float(result["churn_probability"]),
-        risk_level=get_risk_level(float(result["churn_probability"])),
-        confidence=float(result["confidence"]),
-        model_type=str(model.metadata.get("model_type", "unknown")),
-    )
+    return _to_responses(model, [result])[0]
 
 
 @app.post("/predict/batch", response_model=BatchPredictionResponse)
-def predict_batch(request: BatchPredictionRequest) -> BatchPredictionResponse:
-    try:
-        model = get_model()
-    except Exception as exc:
-        logger.exception("Model unavailable")
-        raise HTTPException(status_code=503, detail="Model not available") from exc
+def predict_batch(
+    request: BatchPredictionRequest,
+    http_request: Request,
+    x_model_name: ModelName = None,
+    x_model_version: ModelVersion = None,
+) -> BatchPredictionResponse:
+    _observe_validation(http_request)
+    model = _resolve_model(x_model_name, x_model_version)
 
-    predictions: list[PredictionResponse] = []
     try:
-        for customer in request.customers:
-            result = model.predict_single(customer.model_dump())
-            predictions.append(
-                PredictionResponse(
-                    churn_prediction=int(result["churn_prediction"]),
-                    churn_probability=float(result["churn_probability"]),
-                    risk_level=get_risk_level(float(result["churn_probability"])),
-                    confidence=float(result["confidence"]),
-                    model_type=str(model.metadata.get("model_type", "unknown")),
-                )
-            )
+        results = predict_records(model, [customer.model_dump() for customer in request.customers])
     except Exception as exc:
         logger.exception("Batch prediction failed")
         raise HTTPException(status_code=500, detail="Batch prediction failed") from exc
 
+    predictions = _to_responses(model, results)
+
     logger.info("Batch prediction: count=%d", len(predictions))
     return BatchPredictionResponse(predictions=predictions, count=len(predictions))
+
+
+@app.post("/predict/stream")
+async def predict_stream(
+    request: Request,
+    chunk_size: int = Query(1000, ge=1, le=100_000),
+    x_model_name: ModelName = None,
+    x_model_version: ModelVersion = None,
+) -> DuplexStreamingResponse:
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        body_format = "ndjson"
+    elif media_type in CSV_MEDIA_TYPES:
+        body_format = "csv"
+    else:
+        raise HTTPException(
+            status_code=415, detail="Content-Type must be application/x-ndjson or text/csv"
+        )
+
+    model = _resolve_model(x_model_name, x_model_version)
+    return DuplexStreamingResponse(
+        stream_predictions(model, request.stream(), body_format, chunk_size, get_risk_level),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.get("/cache/stats", response_model=CacheStatsResponse)
+def cache_stats() -> CacheStatsResponse:
+    cache = get_prediction_cache()
+    if cache is None:
+        return CacheStatsResponse(enabled=False)
+    return CacheStatsResponse(enabled=True, **cache.stats())
+
+
+@app.get("/batching/stats", response_model=BatchingStatsResponse)
+def batching_stats() -> BatchingStatsResponse:
+    batcher = _get_batcher()
+    if batcher is None:
+        return BatchingStatsResponse(enabled=False)
+    return BatchingStatsResponse(enabled=True, **batcher.stats())
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Request, scoring-stage, batch-size and model-load metrics in Prometheus text format."""
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="Metrics not enabled")
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+
+def _require_registry() -> Any:
+    registry = get_registry()
+    if registry is None:
+        raise HTTPException(status_code=404, detail="Model registry not enabled")
+    return registry
+
+
+@app.get("/models", response_model=RegistryResponse)
+def list_models() -> RegistryResponse:
+    registry = get_registry()
+    if registry is None:
+        return RegistryResponse(enabled=False)
+    return RegistryResponse(enabled=True, **registry.describe())
+
+
+@app.post("/models/reload", response_model=RegistryResponse)
+def reload_models() -> RegistryResponse:
+    """Load new versions now, retrying ones that failed before."""
+    registry = _require_registry()
+    registry.scan(retry_failed=True)
+    return RegistryResponse(enabled=True, **registry.describe())
+
+
+@app.post("/models/{name}/activate/{version}", response_model=RegistryResponse)
+def activate_model(name: str, version: str) -> RegistryResponse:
+    registry = _require_registry()
+    try:
+        registry.activate(name, version)
+    except ModelNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc.args[0])) from exc
+    return RegistryResponse(enabled=True, **registry.describe())
+
+
+@app.post("/models/{name}/rollback", response_model=RegistryResponse)
+def rollback_model(name: str) -> RegistryResponse:
+    registry = _require_registry()
+    try:
+        registry.rollback(name)
+    except ModelNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc.args[0])) from exc
+    return RegistryResponse(enabled=True, **registry.describe())
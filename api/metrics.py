@@ -0,0 +1,178 @@
+import bisect
+import os
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative: dict[str, int] = {}
+        running = 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts, strict=True):
+            running += count
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+
+class Counter:
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class _Family:
+    kind: str
+    description: str
+    series: dict[LabelKey, Counter | Histogram] = field(default_factory=dict)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """Named counter and histogram families rendered in the Prometheus text format.
+
+    A family holds one series per label set; ``counter`` and ``histogram`` return the
+    series for ``labels``, creating it on first use.
+    """
+
+    def __init__(self) -> None:
+        self._families: dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def _series(
+        self,
+        kind: str,
+        name: str,
+        description: str,
+        labels: Mapping[str, str] | None,
+        factory: Callable[[], Counter | Histogram],
+    ) -> Counter | Histogram:
+        key: LabelKey = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._families.setdefault(name, _Family(kind, description))
+            if family.kind != kind:
+                raise ValueError(f"Metric {name} is a {family.kind}, not a {kind}")
+            series = family.series.get(key)
+            if series is None:
+                series = family.series[key] = factory()
+            return series
+
+    def counter(
+        self, name: str, description: str, labels: Mapping[str, str] | None = None
+    ) -> Counter:
+        series = self._series("counter", name, description, labels, Counter)
+        assert isinstance(series, Counter)
+        return series
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float],
+        labels: Mapping[str, str] | None = None,
+    ) -> Histogram:
+        series = self._series("histogram", name, description, labels, lambda: Histogram(buckets))
+        assert isinstance(series, Histogram)
+        return series
+
+    def register(
+        self,
+        name: str,
+        description: str,
+        histogram: Histogram,
+        labels: Mapping[str, str] | None = None,
+    ) -> None:
+        """Expose a histogram owned elsewhere, replacing any series with the same labels."""
+        key: LabelKey = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._families.setdefault(name, _Family("histogram", description))
+            family.series[key] = histogram
+
+    def render(self) -> str:
+        with self._lock:
+            families = {
+                name: (family.kind, family.description, dict(family.series))
+                for name, family in sorted(self._families.items())
+            }
+        lines: list[str] = []
+        for name, (kind, description, series) in families.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, metric in sorted(series.items()):
+                if isinstance(metric, Counter):
+                    lines.append(f"{name}{_labels(key)} {metric.value}")
+                    continue
+                snapshot = metric.snapshot()
+                for bound, count in snapshot["buckets"].items():
+                    le = f'le="{bound}"'
+                    lines.append(f"{name}_bucket{_labels(key, le)} {count}")
+                lines.append(f"{name}_sum{_labels(key)} {snapshot['sum']}")
+                lines.append(f"{name}_count{_labels(key)} {snapshot['count']}")
+        return "\n".join(lines) + "\n"
+
+
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+STAGE_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1]
+RECORDS_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+LOAD_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+METRICS = MetricsRegistry()
+
+
+@lru_cache(maxsize=1)
+def metrics_enabled() -> bool:
+    """``METRICS_ENABLED=0`` turns off request metrics and model stage timing."""
+    return os.environ.get("METRICS_ENABLED", "1") != "0"
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Stage observer attached to served models; see ``ProductionChurnModel.stage_observer``."""
+    METRICS.histogram(
+        "prediction_stage_seconds", "Time spent in each scoring stage.", STAGE_BUCKETS,
+        {"stage": stage},
+    ).observe(seconds)
@@ -1,25 +1,223 @@
+import hashlib
+import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from src.models.production import ProductionChurnModel
+from api.metrics import (
+    LOAD_BUCKETS,
+    METRICS,
+    RECORDS_BUCKETS,
+    metrics_enabled,
+    observe_stage,
+)
+from api.registry import ModelNotFoundError, ModelRegistry
+from api.schemas import WARMUP_RECORD
+from src.models.artifact import LeanChurnModel, is_artifact, load_artifact
+from src.models.risk import get_risk_level as get_risk_level
+
+if TYPE_CHECKING:
+    from src.models.production import ProductionChurnModel
 
 logger = logging.getLogger(__name__)
 
 
-@lru_cache(maxsize=1)
-def get_model() -> ProductionChurnModel:
-    model_path = os.environ.get(
-        "MODEL_PATH", "models/production/churn_model_production.pkl"
-    )
-    model = ProductionChurnModel.load(model_path)
+def load_model(model_path: str) -> "ProductionChurnModel | LeanChurnModel":
+    """Load a lean artifact directory, or else a joblib pickle.
+
+    ``INFERENCE_THREADS`` sets the scoring thread count (0 = all cores). For a pickle,
+    ``INFERENCE_RUNTIME`` (``native``, ``auto``, ``onnx`` or ``treelite``) overrides the
+    runtime saved with it; a lean artifact is served by the backend it was exported with.
+    """
+    start = time.perf_counter()
+    threads = int(os.environ.get("INFERENCE_THREADS", "1"))
+    model: ProductionChurnModel | LeanChurnModel
+    if is_artifact(model_path):
+        model = load_artifact(model_path, threads=threads)
+    else:
+        # Imported here so serving a lean artifact never loads pandas or joblib.
+        from src.models import production
+
+        model = production.ProductionChurnModel.load(model_path)
+        saved = model.runtime.kind if model.runtime is not None else "native"
+        runtime = os.environ.get("INFERENCE_RUNTIME", saved)
+        if runtime != "native" or saved != "native":
+            model.use_runtime(runtime, threads)
+    model.metadata["identity"] = content_identity(model_path, model.metadata.get("runtime"))
+    if metrics_enabled():
+        model.stage_observer = observe_stage
+        METRICS.histogram(
+            "model_load_seconds", "Time to load a model, including runtime setup.", LOAD_BUCKETS
+        ).observe(time.perf_counter() - start)
     logger.info("Production model loaded: path=%s, type=%s", model_path, model.metadata.get("model_type"))  # noqa: E501
     return model
 
 
-def get_risk_level(probability: float) -> str:
-    if probability < 0.3:
-        return "LOW"
-    if probability < 0.6:
-        return "MEDIUM"
-    return "HIGH"
+@lru_cache(maxsize=1)
+def get_registry() -> ModelRegistry | None:
+    """Registry over ``MODEL_REGISTRY_DIR`` when set; otherwise ``MODEL_PATH`` is served."""
+    root = os.environ.get("MODEL_REGISTRY_DIR")
+    if not root:
+        return None
+    registry = ModelRegistry(
+        root,
+        loader=load_model,
+        warmup_record=WARMUP_RECORD,
+        default_name=os.environ.get("MODEL_REGISTRY_DEFAULT") or None,
+        keep_versions=int(os.environ.get("MODEL_REGISTRY_KEEP", "3")),
+        poll_seconds=float(os.environ.get("MODEL_REGISTRY_POLL_SECONDS", "30")),
+    )
+    registry.scan()
+    return registry
+
+
+@lru_cache(maxsize=1)
+def _get_single_model() -> "ProductionChurnModel | LeanChurnModel":
+    return load_model(
+        os.environ.get("MODEL_PATH", "models/production/churn_model_production.pkl")
+    )
+
+
+def get_model(name: str | None = None, version: str | None = None) -> Any:
+    """Active model for ``name`` (or the default), or a pinned ``version`` of it."""
+    registry = get_registry()
+    if registry is not None:
+        return registry.get(name, version)
+    if name or version:
+        raise ModelNotFoundError("Model routing requires MODEL_REGISTRY_DIR")
+    return _get_single_model()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache of prediction results with an optional TTL."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(customer_data: dict[str, Any], model_id: str) -> str:
+        canonical = json.dumps(customer_data, sort_keys=True, separators=(",", ":"))
+        return f"{model_id}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds > 0 and self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            # Copies on the way in and out, so callers never share a cached dict.
+            self._entries[key] = (self._clock(), dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_prediction_cache() -> PredictionCache | None:
+    max_size = int(os.environ.get("PREDICTION_CACHE_SIZE", "0"))
+    if max_size <= 0:
+        return None
+    ttl_seconds = float(os.environ.get("PREDICTION_CACHE_TTL", "0"))
+    logger.info("Prediction cache enabled: max_size=%d, ttl=%.1fs", max_size, ttl_seconds)
+    return PredictionCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+
+def content_identity(model_path: str, runtime: str | None = None) -> str:
+    """Digest of the file (or every file of the artifact directory) at ``model_path``."""
+    path = Path(model_path)
+    digest = hashlib.sha256(str(runtime).encode())
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    for file in files:
+        digest.update(file.relative_to(path).as_posix().encode() if path.is_dir() else b"")
+        with open(file, "rb") as f:
+            while block := f.read(1 << 20):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def model_identity(model: Any) -> str:
+    """Prediction cache namespace of ``model``, set by ``load_model`` from its content."""
+    identity = model.metadata.get("identity")
+    if identity is None:
+        # Models not loaded from disk only have their metadata to tell them apart.
+        payload = json.dumps(model.metadata, sort_keys=True, default=str)
+        identity = model.metadata["identity"] = hashlib.sha256(payload.encode()).hexdigest()[:16]
+    return str(identity)
+
+
+def predict_records(model: Any, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Score ``records``, serving repeated profiles from the prediction cache when enabled."""
+    if metrics_enabled():
+        METRICS.histogram(
+            "prediction_records", "Records per scoring call.", RECORDS_BUCKETS
+        ).observe(len(records))
+    cache = get_prediction_cache()
+    if cache is None:
+        if len(records) == 1:
+            return [model.predict_single(records[0])]
+        return list(model.predict_many(records))
+
+    model_id = model_identity(model)
+    keys = [cache.make_key(record, model_id) for record in records]
+    results: list[dict[str, Any] | None] = [cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if len(missing) == 1:
+        fresh = [model.predict_single(records[missing[0]])]
+    elif missing:
+        fresh = model.predict_many([records[i] for i in missing])
+    else:
+        fresh = []
+    for i, result in zip(missing, fresh, strict=True):
+        cache.put(keys[i], result)
+        results[i] = result
+    return [result for result in results if result is not None]
@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotFoundError(KeyError):
+    pass
+
+
+@dataclass
+class ModelEntry:
+    name: str
+    version: str
+    path: str
+    model: Any
+    loaded_at: float = field(default_factory=time.time)
+
+
+class ModelRegistry:
+    """Named, versioned models loaded from ``root/<name>/<version>/`` with hot reload.
+
+    A version directory holds either a lean artifact or ``churn_model_production.pkl``.
+    Versions sort by directory name, so use sortable names such as timestamps, and
+    publish a version by renaming a complete directory into place. A new
+    version is loaded off the request path and only becomes active once a warm-up
+    prediction on ``warmup_record`` succeeds; the swap is a single dict assignment
+    under the lock, so requests see either the old or the new model. Up to
+    ``keep_versions`` versions per name stay loaded for rollback and header routing.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        loader: Callable[[str], Any],
+        warmup_record: dict[str, Any],
+        default_name: str | None = None,
+        keep_versions: int = 3,
+        poll_seconds: float = 0.0,
+    ) -> None:
+        if keep_versions < 1:
+            raise ValueError("keep_versions must be at least 1")
+        self.root = Path(root)
+        self.loader = loader
+        self.warmup_record = warmup_record
+        self.default_name = default_name
+        self.keep_versions = keep_versions
+        self.poll_seconds = poll_seconds
+        self._entries: dict[str, dict[str, ModelEntry]] = {}
+        self._active: dict[str, str] = {}
+        self._failed: dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        # Serialises scans so the watcher and an admin reload never load the same version twice.
+        self._scan_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    @staticmethod
+    def model_path(version_dir: Path) -> str:
+        if (version_dir / "manifest.json").is_file():
+            return str(version_dir)
+        return str(version_dir / "churn_model_production.pkl")
+
+    def discover(self) -> dict[str, list[str]]:
+        """Versions on disk per model name, oldest first."""
+        if not self.root.is_dir():
+            return {}
+        return {
+            name_dir.name: sorted(v.name for v in name_dir.iterdir() if v.is_dir())
+            for name_dir in sorted(self.root.iterdir())
+            if name_dir.is_dir()
+        }
+
+    def scan(self, retry_failed: bool = False) -> list[tuple[str, str]]:
+        """Load unseen versions and activate the newest per name; returns what loaded."""
+        with self._scan_lock:
+            if retry_failed:
+                with self._lock:
+                    self._failed.clear()
+            loaded: list[tuple[str, str]] = []
+            for name, versions in self.discover().items():
+                # Older versions than the retained window are never loaded, so pruned
+                # versions are not reloaded on the next scan.
+                candidates = versions[-self.keep_versions:]
+                with self._lock:
+                    known = set(self._entries.get(name, {}))
+                    skip = {v for n, v in self._failed if n == name}
+                for version in candidates:
+                    if version not in known and version not in skip and self._load(name, version):
+                        loaded.append((name, version))
+                with self._lock:
+                    entries = self._entries.get(name, {})
+                    latest = next((v for v in reversed(candidates) if v in entries), None)
+                    # A rollback stays in place until a newer version arrives.
+                    switch = latest is not None and (
+                        (name, latest) in loaded or name not in self._active
+                    )
+                if switch and latest is not None:
+                    self.activate(name, latest)
+            return loaded
+
+    def _load(self, name: str, version: str) -> bool:
+        path = self.model_path(self.root / name / version)
+        try:
+            model = self.loader(path)
+            model.metadata["registry_name"] = name
+            model.metadata["registry_version"] = version
+            model.predict_single(self.warmup_record)
+        except Exception as exc:
+            logger.exception("Model version failed to load: name=%s, version=%s", name, version)
+            with self._lock:
+                self._failed[(name, version)] = f"{type(exc).__name__}: {exc}"
+            return False
+        with self._lock:
+            self._entries.setdefault(name, {})[version] = ModelEntry(name, version, path, model)
+        logger.info("Model version loaded: name=%s, version=%s, path=%s", name, version, path)
+        return True
+
+    def activate(self, name: str, version: str) -> None:
+        """Route unversioned requests for ``name`` to ``version``; also used for rollback."""
+        with self._lock:
+            if version not in self._entries.get(name, {}):
+                raise ModelNotFoundError(f"Model version not loaded: {name}/{version}")
+            previous = self._active.get(name)
+            self._active[name] = version
+            self._prune(name)
+        logger.info("Model activated: name=%s, version=%s, previous=%s", name, version, previous)
+
+    def rollback(self, name: str) -> str:
+        """Activate the newest loaded version older than the active one."""
+        with self._lock:
+            active = self._active.get(name)
+            older = [v for v in sorted(self._entries.get(name, {})) if active and v < active]
+        if not older:
+            raise ModelNotFoundError(f"No older version of {name} to roll back to")
+        self.activate(name, older[-1])
+        return older[-1]
+
+    def _prune(self, name: str) -> None:
+        # Called with the lock held; the active version is never evicted.
+        versions = self._entries[name]
+        for version in sorted(versions)[: max(0, len(versions) - self.keep_versions)]:
+            if version != self._active.get(name):
+                del versions[version]
+                logger.info("Model version unloaded: name=%s, version=%s", name, version)
+
+    def get(self, name: str | None = None, version: str | None = None) -> Any:
+        with self._lock:
+            name = name or self.default_name or next(iter(sorted(self._active)), None)
+            if name is None or name not in self._active:
+                raise ModelNotFoundError(f"No active model: {name}")
+            entry = self._entries[name].get(version or self._active[name])
+        if entry is None:
+            raise ModelNotFoundError(f"Model version not loaded: {name}/{version}")
+        return entry.model
+
+    def describe(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "default_model": self.default_name or next(iter(sorted(self._active)), None),
+                "models": [
+                    {
+                        "name": name,
+                        "active_version": self._active.get(name),
+                        "versions": sorted(entries),
+                        "failed": {v: err for (n, v), err in self._failed.items() if n == name},
+                    }
+                    for name, entries in sorted(self._entries.items())
+                ],
+            }
+
+    def start(self) -> None:
+        if self.poll_seconds <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._watcher.start()
+        logger.info("Model registry watching %s every %.1fs", self.root, self.poll_seconds)
+
+    def stop(self) -> None:
+        if self._watcher is None:
+            return
+        self._stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.scan()
+            except Exception:
+                logger.exception("Model registry scan failed")
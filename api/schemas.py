@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -64,12 +66,16 @@ class CustomerData(BaseModel):
     }
 
 
+WARMUP_RECORD: dict[str, Any] = CustomerData.model_config["json_schema_extra"]["example"]  # type: ignore[index]
+
+
 class PredictionResponse(BaseModel):
     churn_prediction: int
     churn_probability: float
     risk_level: str
     confidence: float
     model_type: str
+    model_version: str | None = None
 
 
 class BatchPredictionRequest(BaseModel):
@@ -85,3 +91,43 @@ class HealthResponse(BaseModel):
     status: str
     model_loaded: bool
     model_type: str
+
+
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    size: int = 0
+    max_size: int = 0
+    ttl_seconds: float = 0.0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class HistogramSnapshot(BaseModel):
+    buckets: dict[str, int] = Field(default_factory=dict)
+    count: int = 0
+    sum: float = 0.0
+
+
+class BatchingStatsResponse(BaseModel):
+    enabled: bool
+    queue_depth: int = 0
+    max_batch_size: int = 0
+    max_wait_ms: float = 0.0
+    max_queue_size: int = 0
+    batch_size: HistogramSnapshot = Field(default_factory=HistogramSnapshot)
+    queue_wait_ms: HistogramSnapshot = Field(default_factory=HistogramSnapshot)
+
+
+class ModelVersionsInfo(BaseModel):
+    name: str
+    active_version: str | None = None
+    versions: list[str] = Field(default_factory=list)
+    failed: dict[str, str] = Field(default_factory=dict)
+
+
+class RegistryResponse(BaseModel):
+    enabled: bool
+    default_model: str | None = None
+    models: list[ModelVersionsInfo] = Field(default_factory=list)
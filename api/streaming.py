@@ -0,0 +1,216 @@
+import csv
+import json
+import logging
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from api.schemas import CustomerData
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/json")
+CSV_MEDIA_TYPES = ("text/csv", "application/csv")
+# Longest line buffered from the body; longer lines are reported and skipped.
+MAX_LINE_BYTES = 1 << 16
+# Longest CSV record, across its lines, kept while waiting for a quoted field to close.
+MAX_CSV_RECORD_CHARS = 1 << 16
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """Streams the response while the request body is still being read.
+
+    ``StreamingResponse`` listens for client disconnects by consuming ``receive``,
+    which would swallow request body messages that the body iterator still needs.
+    Disconnects surface through ``Request.stream()`` instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[str | None]:
+    """Decoded lines of the body; ``None`` stands for a line over ``max_line_bytes``.
+
+    Only the current line is buffered, and each chunk is scanned once, so memory stays
+    bounded whatever the body. The rest of an over-long line is dropped unread.
+    """
+    buffer = bytearray()
+    discarding = False
+    async for chunk in chunks:
+        view = memoryview(chunk)
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if discarding:
+                discarding = False
+            elif len(buffer) + end - start > max_line_bytes:
+                yield None
+            else:
+                buffer += view[start:end]
+                yield buffer.decode("utf-8").rstrip("\r")
+            buffer.clear()
+            start = end + 1
+        if discarding:
+            continue
+        if len(buffer) + len(chunk) - start > max_line_bytes:
+            yield None
+            buffer.clear()
+            discarding = True
+        else:
+            buffer += view[start:]
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+class RowParser:
+    """Turns NDJSON or CSV lines into row dicts; CSV uses the first record as header.
+
+    A CSV record whose quoted field spans lines is held until the quote closes and
+    parsed as one row.
+    """
+
+    def __init__(self, body_format: str) -> None:
+        self.body_format = body_format
+        self.header: list[str] | None = None
+        self._partial: str | None = None
+
+    def __call__(self, line: str) -> dict[str, Any] | None:
+        if self.body_format == "ndjson":
+            if not line.strip():
+                return None
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("expected a JSON object")
+            return row
+        if self._partial is not None:
+            line, self._partial = f"{self._partial}\n{line}", None
+        elif not line.strip():
+            return None
+        # An odd quote count leaves a quoted field open; "" escapes keep the parity.
+        if line.count('"') % 2:
+            if len(line) > MAX_CSV_RECORD_CHARS:
+                raise ValueError("unterminated quoted field")
+            self._partial = line
+            return None
+        values = next(csv.reader([line]))
+        if self.header is None:
+            self.header = values
+            return None
+        return _normalize_csv_row(dict(zip(self.header, values, strict=False)))
+
+    def close(self) -> None:
+        """Raise ``ValueError`` if the body ended inside a quoted CSV field."""
+        if self._partial is not None:
+            self._partial = None
+            raise ValueError("unterminated quoted field")
+
+    def skip(self) -> None:
+        """Drop a CSV record left open by a line that was skipped."""
+        self._partial = None
+
+
+def _normalize_csv_row(row: dict[str, str]) -> dict[str, Any]:
+    """Strip CSV cells and treat a blank TotalCharges as 0, matching ``clean_data``."""
+    normalized: dict[str, Any] = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
+    if normalized.get("TotalCharges") == "":
+        normalized["TotalCharges"] = 0.0
+    return normalized
+
+
+async def stream_predictions(
+    model: Any,
+    chunks: AsyncIterator[bytes],
+    body_format: str,
+    chunk_size: int,
+    risk_level: Callable[[float], str],
+) -> AsyncIterator[bytes]:
+    """Validate and score rows ``chunk_size`` at a time, yielding one NDJSON line per row."""
+    pending: list[tuple[int, Any, dict[str, Any]]] = []
+    scored = 0
+
+    async def flush() -> AsyncIterator[bytes]:
+        try:
+            results = await run_in_threadpool(model.predict_many, [r for _, _, r in pending])
+        except Exception:
+            # One failing chunk is reported per row; the rest of the stream still scores.
+            logger.exception("Stream scoring failed for %d rows", len(pending))
+            for row_number, customer_id, _ in pending:
+                yield _error_line(row_number, customer_id, "Scoring failed")
+            pending.clear()
+            return
+        for (row_number, customer_id, _), result in zip(pending, results, strict=True):
+            probability = float(result["churn_probability"])
+            yield _ndjson({
+                "row": row_number,
+                "customerID": customer_id,
+                "churn_prediction": int(result["churn_prediction"]),
+                "churn_probability": probability,
+                "risk_level": risk_level(probability),
+            })
+        pending.clear()
+
+    parse = RowParser(body_format)
+    row_number = 0
+    try:
+        async for line in iter_lines(chunks):
+            row: dict[str, Any] | None = None
+            if line is None:
+                parse.skip()
+                yield _error_line(
+                    row_number, None, f"Malformed row: line exceeds {MAX_LINE_BYTES} bytes"
+                )
+                row_number += 1
+                continue
+            try:
+                row = parse(line)
+                if row is None:
+                    continue
+                customer = CustomerData.model_validate(row)
+            except ValidationError as exc:
+                yield _error_line(row_number, _customer_id(row), _format_errors(exc))
+            except ValueError as exc:
+                yield _error_line(row_number, _customer_id(row), f"Malformed row: {exc}")
+            else:
+                pending.append((row_number, row.get("customerID"), customer.model_dump()))
+                if len(pending) >= chunk_size:
+                    scored += len(pending)
+                    async for scored_line in flush():
+                        yield scored_line
+            row_number += 1
+    except UnicodeDecodeError as exc:
+        logger.warning("Stream decoding stopped at row %d: %s", row_number, exc)
+        yield _error_line(row_number, None, "Body is not valid UTF-8")
+    else:
+        try:
+            parse.close()
+        except ValueError as exc:
+            yield _error_line(row_number, None, f"Malformed row: {exc}")
+    if pending:
+        scored += len(pending)
+        async for scored_line in flush():
+            yield scored_line
+    logger.info("Stream prediction: rows=%d, scored=%d", row_number, scored)
+
+
+def _format_errors(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+
+
+def _customer_id(row: dict[str, Any] | None) -> Any:
+    return row.get("customerID") if row is not None else None
+
+
+def _error_line(row_number: int, customer_id: Any, message: str) -> bytes:
+    return _ndjson({"row": row_number, "customerID": customer_id, "error": message})
+
+
+def _ndjson(payload: dict[str, Any]) -> bytes:
+    return (json.dumps(payload) + "\n").encode("utf-8")
@@ -0,0 +1,78 @@
+"""Training and scoring time with DataFrame features versus contiguous arrays.
+
+Each layout is produced by ``TelcoPreprocessor`` from the same enlarged Telco frame.
+Per model it times SMOTE resampling, a fit, 5-fold cross-validation and
+``predict_proba`` on the held-out rows, with the model's own thread count fixed.
+
+Usage: python benchmarks/bench_array_features.py --rows 200000 [--models LightGBM XGBoost]
+"""
+
+import argparse
+import warnings
+from typing import Any
+
+import pandas as pd
+from bench_score_pipeline import enlarge
+from common import best_of, load_telco
+from sklearn.base import clone
+
+from src.features.matrix import FeatureMatrix
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.cv import cross_validate
+from src.models.resampling import ResamplingCache
+from src.models.trainer import ChurnModelTrainer
+
+LAYOUTS: dict[str, dict[str, str]] = {
+    "frame": {"output": "frame"},
+    "f64 C": {"output": "array", "dtype": "float64", "order": "C"},
+    "f32 C": {"output": "array", "dtype": "float32", "order": "C"},
+    "f32 F": {"output": "array", "dtype": "float32", "order": "F"},
+}
+
+
+def time_layout(
+    model: Any, X_train: FeatureMatrix, X_test: FeatureMatrix, y_train: pd.Series
+) -> tuple[float, float, float, float]:
+    smote = best_of(lambda: ResamplingCache("smote").resample(X_train, y_train), repeats=1)
+    fit = best_of(lambda: clone(model).fit(X_train, y_train), repeats=1)
+    cv = best_of(lambda: cross_validate(model, X_train, y_train), repeats=1)
+    fitted = clone(model).fit(X_train, y_train)
+    proba = best_of(lambda: fitted.predict_proba(X_test))
+    return smote, fit, cv, proba
+
+
+def run(rows: int, model_names: list[str], threads: int) -> None:
+    df = enlarge(load_telco(), rows)
+    trainer = ChurnModelTrainer()
+    candidates = trainer.get_models()
+    print(
+        f"{'model':<20} {'layout':<6} {'smote s':>8} {'fit s':>7} {'cv s':>7} {'proba ms':>9}"
+    )
+    for name in model_names:
+        model = candidates[name]
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=threads)
+        for layout, options in LAYOUTS.items():
+            X, y, _ = TelcoPreprocessor(**options).prepare_features(
+                df.copy(), fit=True, inplace=True
+            )
+            assert y is not None
+            X_train, X_test, y_train, _ = trainer.split_data(X, y)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                smote, fit, cv, proba = time_layout(model, X_train, X_test, y_train)
+            print(
+                f"{name:<20} {layout:<6} {smote:>8.2f} {fit:>7.2f} {cv:>7.2f} "
+                f"{proba * 1e3:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument(
+        "--models", nargs="+", default=["Logistic Regression", "XGBoost", "LightGBM"]
+    )
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    run(args.rows, args.models, args.threads)
@@ -0,0 +1,90 @@
+"""Cold-start load time, peak RSS and size on disk of the pickle versus the lean artifact.
+
+Each load runs in a fresh interpreter, so import cost is included. The xgboost and
+lightgbm packages import pandas and scikit-learn themselves, so the cold-start gain
+is largest for the linear backend, which needs numpy only.
+
+Usage: python benchmarks/bench_artifact.py [--repeats 3]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from common import build_production_model, load_telco
+from lightgbm import LGBMClassifier
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PICKLE_LOADER = (
+    "from src.models.production import ProductionChurnModel\n"
+    "model = ProductionChurnModel.load({path!r})\n"
+)
+LEAN_LOADER = (
+    "from src.models.artifact import load_artifact\n"
+    "model = load_artifact({path!r})\n"
+)
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{loader}model.predict_single({record!r})
+elapsed = time.perf_counter() - start
+# VmHWM rather than ru_maxrss, which Linux carries over from the forking parent.
+hwm_kb = next(
+    int(line.split()[1]) for line in open("/proc/self/status") if line.startswith("VmHWM")
+)
+print(json.dumps({{"seconds": elapsed, "rss_mb": hwm_kb / 1024}}))
+"""
+
+
+def measure(loader: str, record: dict[str, object], repeats: int) -> tuple[float, float]:
+    code = PROBE.format(loader=loader, record=record)
+    runs = [
+        json.loads(subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout)
+        for _ in range(repeats)
+    ]
+    return min(r["seconds"] for r in runs), min(r["rss_mb"] for r in runs)
+
+
+def size_kb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file()) / 1024
+
+
+def run(repeats: int) -> None:
+    df = load_telco()
+    record = df.iloc[0].to_dict()
+    models = {
+        "Logistic": LogisticRegression(max_iter=1000),
+        "XGBoost": XGBClassifier(n_estimators=100, max_depth=5, eval_metric="logloss"),
+        "LightGBM": LGBMClassifier(n_estimators=100, max_depth=5, verbose=-1),
+    }
+    print(f"{'model':<10} {'format':<7} {'load+score s':>13} {'peak rss MB':>12} {'size KB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, estimator in models.items():
+            prod_model = build_production_model(df, estimator)
+            pickle_dir, lean_dir = Path(tmp) / name / "pickle", Path(tmp) / name / "lean"
+            prod_model.save(str(pickle_dir))
+            prod_model.save_lean(str(lean_dir))
+            pickle_path = pickle_dir / "churn_model_production.pkl"
+            loaders = {
+                "pickle": (PICKLE_LOADER.format(path=str(pickle_path)),
+                           pickle_path.stat().st_size / 1024),
+                "lean": (LEAN_LOADER.format(path=str(lean_dir)), size_kb(lean_dir)),
+            }
+            for fmt, (loader, size) in loaders.items():
+                seconds, rss = measure(loader, record, repeats)
+                print(f"{name:<10} {fmt:<7} {seconds:>13.3f} {rss:>12.0f} {size:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.repeats)
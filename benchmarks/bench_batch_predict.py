@@ -0,0 +1,47 @@
+"""Per-record latency of predict_many versus looping predict_single, and the feature
+path crossover that sets ``COMPILED_BATCH_MAX_ROWS``.
+
+The second table times the features alone: the compiled map, built row by row, against
+the pandas stages on one frame. ``predict_many`` picks the compiled map up to the limit.
+
+Usage: python benchmarks/bench_batch_predict.py
+"""
+
+import pandas as pd
+from common import best_of, build_production_model, load_telco
+
+from src.models.production import COMPILED_BATCH_MAX_ROWS
+
+BATCH_SIZES = [1, 10, 100, 1000]
+FEATURE_BATCH_SIZES = [100, 1000, 2000, 10_000, 100_000]
+
+
+def run() -> None:
+    df = load_telco()
+    model = build_production_model(df)
+    print(f"{'batch':>6} {'loop us/rec':>12} {'batch us/rec':>13} {'speedup':>8}")
+    for size in BATCH_SIZES:
+        records = df.sample(size, random_state=0, replace=True).to_dict("records")
+        loop = best_of(lambda rs=records: [model.predict_single(r) for r in rs], repeats=3)
+        batch = best_of(lambda rs=records: model.predict_many(rs))
+        print(
+            f"{size:>6} {loop / size * 1e6:>12.1f} {batch / size * 1e6:>13.1f} "
+            f"{loop / batch:>7.1f}x"
+        )
+
+    compiled = model._compiled
+    assert compiled is not None
+    print(f"\ncompiled path up to {COMPILED_BATCH_MAX_ROWS} rows")
+    print(f"{'batch':>7} {'compiled s':>11} {'frame s':>9} {'used':>9}")
+    for size in FEATURE_BATCH_SIZES:
+        records = df.sample(size, random_state=0, replace=True).to_dict("records")
+        by_row = best_of(lambda rs=records: compiled.transform_many(rs), repeats=3)
+        by_frame = best_of(
+            lambda rs=records: model.prepare_frame(pd.DataFrame(rs), inplace=True), repeats=3
+        )
+        used = "compiled" if size <= COMPILED_BATCH_MAX_ROWS else "frame"
+        print(f"{size:>7} {by_row:>11.4f} {by_frame:>9.4f} {used:>9}")
+
+
+if __name__ == "__main__":
+    run()
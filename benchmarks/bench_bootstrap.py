@@ -0,0 +1,62 @@
+"""Wall clock of the vectorized bootstrap versus a per-resample sklearn loop.
+
+Usage: python benchmarks/bench_bootstrap.py [--rows 1409] [--resamples 10000] [--n-jobs -1]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from common import best_of
+from sklearn.metrics import (
+    average_precision_score,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+
+from src.evaluation.bootstrap import bootstrap_metrics
+
+LOOP_RESAMPLES = 200
+
+
+def _sklearn_resample(y_true: np.ndarray, y_prob: np.ndarray, idx: np.ndarray) -> None:
+    y, p = y_true[idx], y_prob[idx]
+    pred = p >= 0.5
+    precision_score(y, pred)
+    recall_score(y, pred)
+    f1_score(y, pred)
+    roc_auc_score(y, p)
+    average_precision_score(y, p)
+
+
+def run(rows: int, resamples: int, n_jobs: int) -> None:
+    rng = np.random.default_rng(0)
+    # Roughly the Telco holdout: ~27% churners, scores rounded like a tree ensemble's.
+    y_true = (rng.random(rows) < 0.27).astype(int)
+    y_prob = np.round(np.clip(y_true * 0.35 + rng.random(rows) * 0.65, 0, 1), 3)
+
+    start = time.perf_counter()
+    for _ in range(LOOP_RESAMPLES):
+        _sklearn_resample(y_true, y_prob, rng.integers(0, rows, rows))
+    loop = (time.perf_counter() - start) / LOOP_RESAMPLES * resamples
+
+    serial = best_of(lambda: bootstrap_metrics(y_true, y_prob, n_resamples=resamples), repeats=3)
+    parallel = best_of(
+        lambda: bootstrap_metrics(y_true, y_prob, n_resamples=resamples, n_jobs=n_jobs),
+        repeats=3,
+    )
+    print(f"{rows} rows x {resamples} resamples")
+    print(f"{'sklearn loop (extrapolated)':<30} {loop:>8.2f} s")
+    print(f"{'vectorized, 1 job':<30} {serial:>8.2f} s  {loop / serial:>6.1f}x")
+    print(f"{f'vectorized, n_jobs={n_jobs}':<30} {parallel:>8.2f} s  {loop / parallel:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1409)
+    parser.add_argument("--resamples", type=int, default=10_000)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+    run(args.rows, args.resamples, args.n_jobs)
@@ -0,0 +1,92 @@
+"""Peak RSS and time of training in memory versus out of core, as the file grows.
+
+Each (rows, mode, model) runs in a fresh interpreter on the same enlarged Telco CSV.
+The peak is VmHWM minus the resident size once the libraries are imported, so it
+counts the data, features and model. In memory, the whole file is loaded and
+preprocessed into one float32 matrix before fitting (LogisticRegression stands in for
+SGD there). Out of core, ``FeatureChunks`` streams ``--chunk-size`` rows at a time.
+
+Usage: python benchmarks/bench_out_of_core.py --rows 250000 1000000 --chunk-size 100000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_score_pipeline import enlarge
+from common import load_telco
+
+ROOT = Path(__file__).resolve().parents[1]
+MODELS = {"sgd": "SGD Logistic Regression", "xgboost": "XGBoost", "lightgbm": "LightGBM"}
+
+PROBE = """
+import json, time, warnings
+warnings.simplefilter("ignore")
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.out_of_core import FeatureChunks, OutOfCoreTrainer
+from src.models.trainer import ChurnModelTrainer
+
+
+def status(field):
+    return next(
+        int(line.split()[1]) for line in open("/proc/self/status") if line.startswith(field)
+    ) / 1024
+
+
+loader = TelcoDataLoader({path!r})
+preprocessor = TelcoPreprocessor(output="array", dtype="float32")
+trainer = OutOfCoreTrainer(sgd_epochs=1)
+name = {name!r}
+baseline = status("VmRSS")
+start = time.perf_counter()
+if {mode!r} == "memory":
+    X, y, _ = preprocessor.prepare_features(loader.read_data(), fit=True, inplace=True)
+    candidates = ChurnModelTrainer().get_models()
+    model = candidates["Logistic Regression" if name == "SGD Logistic Regression" else name]
+    model.fit(X, y)
+else:
+    data = FeatureChunks(loader, preprocessor, chunksize={chunk_size}).fit()
+    fit = {{"SGD Logistic Regression": trainer.fit_sgd, "XGBoost": trainer.fit_xgboost,
+           "LightGBM": trainer.fit_lightgbm}}[name]
+    fit(trainer.get_models()[name], data)
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "peak_mb": status("VmHWM") - baseline}}))
+"""
+
+
+def measure(path: Path, mode: str, name: str, chunk_size: int) -> dict[str, float]:
+    code = PROBE.format(path=str(path), mode=mode, name=name, chunk_size=chunk_size)
+    result: dict[str, float] = json.loads(subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout)
+    return result
+
+
+def run(rows: list[int], models: list[str], chunk_size: int) -> None:
+    df = load_telco()
+    print(f"{'rows':>9} {'model':<10} {'mode':<12} {'seconds':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in rows:
+            source = Path(tmp) / f"telco_{n}.csv"
+            enlarge(df, n).to_csv(source, index=False)
+            for model in models:
+                for mode in ("memory", "out_of_core"):
+                    r = measure(source, mode, MODELS[model], chunk_size)
+                    print(
+                        f"{n:>9} {model:<10} {mode:<12} {r['seconds']:>8.1f} "
+                        f"{r['peak_mb']:>8.0f}"
+                    )
+            source.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000, 1_000_000])
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.rows, args.models, args.chunk_size)
@@ -0,0 +1,77 @@
+"""Peak RSS and time of TelcoPreprocessor.prepare_features, copying versus in place.
+
+Each mode runs in a fresh interpreter on the same enlarged Telco parquet file. The
+peak is VmHWM after preprocessing minus the resident size once the data is loaded,
+so it counts only what the stages allocate. Both modes must produce the same X.
+
+Usage: python benchmarks/bench_preprocess_memory.py --rows 2000000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_score_pipeline import enlarge
+from common import load_telco
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PROBE = """
+import json, time
+import pandas as pd
+from src.features.preprocessor import TelcoPreprocessor
+
+
+def status(field):
+    return next(
+        int(line.split()[1]) for line in open("/proc/self/status") if line.startswith(field)
+    ) / 1024
+
+
+df = pd.read_parquet({path!r})
+loaded = status("VmRSS")
+start = time.perf_counter()
+X, y, _ = TelcoPreprocessor().prepare_features(df, fit=True, inplace={inplace})
+seconds = time.perf_counter() - start
+digest = int(pd.util.hash_pandas_object(X, index=False).sum())
+print(json.dumps({{
+    "seconds": seconds,
+    "peak_mb": status("VmHWM") - loaded,
+    "x_mb": X.memory_usage().sum() / 1024**2,
+    "digest": digest, "dtypes": [str(t) for t in X.dtypes], "columns": list(X.columns),
+}}))
+"""
+
+
+def measure(path: Path, inplace: bool) -> dict[str, object]:
+    code = PROBE.format(path=str(path), inplace=inplace)
+    result: dict[str, object] = json.loads(subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout)
+    return result
+
+
+def run(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / f"telco_{rows}.parquet"
+        enlarge(load_telco(), rows).to_parquet(source, index=False)
+
+        print(f"{'mode':<8} {'seconds':>8} {'peak MB':>8} {'X MB':>7}")
+        results = {}
+        for mode, inplace in (("copy", False), ("inplace", True)):
+            results[mode] = r = measure(source, inplace)
+            print(f"{mode:<8} {r['seconds']:>8.2f} {r['peak_mb']:>8.0f} {r['x_mb']:>7.0f}")
+        same = all(
+            results["copy"][k] == results["inplace"][k] for k in ("digest", "dtypes", "columns")
+        )
+        print(f"identical X: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+    run(args.rows)
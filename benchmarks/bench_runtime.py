@@ -0,0 +1,52 @@
+"""predict_proba latency of the native estimators versus the ONNX and Treelite runtimes.
+
+Usage: python benchmarks/bench_runtime.py [--models LightGBM XGBoost] [--threads 1]
+"""
+
+import argparse
+import warnings
+
+import numpy as np
+from common import best_of, load_telco
+
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.runtime import RUNTIMES, compile_runtime
+from src.models.trainer import ChurnModelTrainer
+
+BATCH_SIZES = [1, 100, 10_000]
+
+
+def run(model_names: list[str], threads: int) -> None:
+    X, y, _ = TelcoPreprocessor().prepare_features(load_telco(), fit=True)
+    rng = np.random.default_rng(0)
+    candidates = ChurnModelTrainer().get_models()
+    print(f"{'model':<20} {'runtime':<9} " + " ".join(f"{f'{n} rows ms':>13}" for n in BATCH_SIZES))
+    for name in model_names:
+        model = candidates[name]
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=threads)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model.fit(X, y)
+        batches = [X.iloc[rng.integers(0, len(X), n)] for n in BATCH_SIZES]
+        runners = {"native": model.predict_proba}
+        for kind in RUNTIMES:
+            try:
+                runners[kind] = compile_runtime(model, kind).backend(threads).predict_proba
+            except ValueError:
+                continue
+        for kind, predict in runners.items():
+            timings = []
+            for batch in batches:
+                features = batch if kind == "native" else batch.to_numpy(dtype=np.float64)
+                repeats = 50 if len(batch) < 1000 else 5
+                timings.append(best_of(lambda f=features, p=predict: p(f), repeats=repeats))
+            print(f"{name:<20} {kind:<9} " + " ".join(f"{t * 1e3:>13.3f}" for t in timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", nargs="+", default=list(ChurnModelTrainer().get_models()))
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+    run(args.models, args.threads)
@@ -0,0 +1,60 @@
+"""Throughput and peak RSS of pipelines/score_pipeline.py on an enlarged Telco dataset.
+
+Usage: python benchmarks/bench_score_pipeline.py --rows 10000000 --workers 1 4 8
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from common import build_production_model, load_telco
+
+from pipelines.score_pipeline import score_file
+
+
+def enlarge(df: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    big = df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+    big["customerID"] = [f"SYN-{i:09d}" for i in range(rows)]
+    return big
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--format", choices=["csv", "parquet"], default="parquet")
+    args = parser.parse_args()
+
+    df = load_telco()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        model = build_production_model(df)
+        model.save(str(tmp_path / "model"))
+        model_path = str(tmp_path / "model" / "churn_model_production.pkl")
+
+        source = tmp_path / f"telco_{args.rows}.{args.format}"
+        big = enlarge(df, args.rows)
+        if args.format == "parquet":
+            big.to_parquet(source, index=False)
+        else:
+            big.to_csv(source, index=False)
+        del big
+
+        print(f"{'workers':>8} {'rows/s':>12} {'seconds':>9} {'rss MB':>8} {'worker rss MB':>14}")
+        for workers in args.workers:
+            report = score_file(
+                str(source), str(tmp_path / f"scores.{args.format}"), model_path,
+                chunk_size=args.chunk_size, workers=workers,
+            )
+            print(
+                f"{workers:>8} {report['rows_per_second']:>12,.0f} {report['seconds']:>9.1f} "
+                f"{report['peak_rss_mb']:>8.0f} {report['peak_worker_rss_mb']:>14.0f}"
+            )
+
+
+if __name__ == "__main__":
+    run()
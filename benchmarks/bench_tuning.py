@@ -0,0 +1,39 @@
+"""Best CV score versus wall clock for each tuner search type.
+
+Usage: python benchmarks/bench_tuning.py [--models LightGBM XGBoost] [--n-iter 27]
+"""
+
+import argparse
+import warnings
+
+from common import load_telco
+
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.tuner import SEARCH_TYPES, HyperparameterTuner
+
+
+def run(models: list[str], search_types: list[str], n_iter: int, cv: int) -> None:
+    X, y, _ = TelcoPreprocessor().prepare_features(load_telco(), fit=True)
+    print(f"{'model':<14} {'search':<13} {'wall s':>8} {'fits':>6} {'best f1':>8}")
+    for model_name in models:
+        for search_type in search_types:
+            tuner = HyperparameterTuner()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                tuner.tune_model(model_name, X, y, search_type=search_type, n_iter=n_iter, cv=cv)
+            report = tuner.reports[model_name]
+            print(
+                f"{model_name:<14} {search_type:<13} {report.wall_seconds:>8.1f} "
+                f"{report.n_fits:>6} {report.best_score:>8.4f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", nargs="+", default=["LightGBM", "XGBoost", "Random Forest"])
+    parser.add_argument("--search-types", nargs="+", default=["random", "halving"],
+                        choices=SEARCH_TYPES)
+    parser.add_argument("--n-iter", type=int, default=27)
+    parser.add_argument("--cv", type=int, default=5)
+    args = parser.parse_args()
+    run(args.models, args.search_types, args.n_iter, args.cv)
@@ -0,0 +1,42 @@
+import logging
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.production import ProductionChurnModel
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+
+
+def load_telco() -> pd.DataFrame:
+    return TelcoDataLoader().load_data()
+
+
+def build_production_model(df: pd.DataFrame, model: Any = None) -> ProductionChurnModel:
+    preprocessor = TelcoPreprocessor()
+    X, y, _ = preprocessor.prepare_features(df, fit=True)
+    if model is None:
+        model = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, n_jobs=1)
+    model.fit(X, y)
+    return ProductionChurnModel(model, preprocessor, threshold=0.4)
+
+
+def best_of(fn: Callable[[], object], repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,182 @@
+import argparse
+import logging
+import resource
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.data.loader import TelcoDataLoader, coerce_schema, resolve_data_path
+from src.models.production import ProductionChurnModel, get_risk_levels
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+_worker_model: ProductionChurnModel | None = None
+
+
+def _init_worker(model_path: str) -> None:
+    global _worker_model
+    _worker_model = ProductionChurnModel.load(model_path)
+
+
+def score_chunk(model: ProductionChurnModel, chunk: pd.DataFrame) -> pd.DataFrame:
+    customer_ids = chunk["customerID"] if "customerID" in chunk.columns else chunk.index
+    # The chunk is ours alone, so the preprocessing stages may modify it rather than copy.
+    probabilities = model.predict_proba(model.prepare_frame(chunk, inplace=True))[:, 1]
+    return pd.DataFrame({
+        "customerID": pd.Series(customer_ids, index=chunk.index).astype(str),
+        "churn_probability": probabilities,
+        "churn_prediction": (probabilities >= model.threshold).astype(int),
+        "risk_level": get_risk_levels(probabilities),
+    })
+
+
+def _score_in_worker(chunk: pd.DataFrame) -> pd.DataFrame:
+    if _worker_model is None:
+        raise RuntimeError("Worker model not initialised")
+    return score_chunk(_worker_model, chunk)
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield coerce_schema(batch.to_pandas())
+    else:
+        yield from TelcoDataLoader(str(path)).iter_chunks(chunk_size)
+
+
+class ChunkWriter:
+    """Appends scored chunks to a Parquet or CSV file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._parquet_writer: Any = None
+        self._wrote_csv_header = False
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(
+                self.path, mode="a" if self._wrote_csv_header else "w",
+                header=not self._wrote_csv_header, index=False,
+            )
+            self._wrote_csv_header = True
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _peak_rss_mb() -> dict[str, float]:
+    # ru_maxrss is reported in kilobytes on Linux.
+    return {
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_worker_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    model_path: str,
+    chunk_size: int = 50_000,
+    workers: int = 1,
+) -> dict[str, float]:
+    source = resolve_data_path(input_path)
+    if not source.exists():
+        raise FileNotFoundError(f"Data file not found: {source}")
+    writer = ChunkWriter(resolve_data_path(output_path))
+    rows = 0
+    start = time.perf_counter()
+
+    try:
+        if workers <= 1:
+            model = ProductionChurnModel.load(model_path)
+            for chunk in read_chunks(source, chunk_size):
+                scored = score_chunk(model, chunk)
+                writer.write(scored)
+                rows += len(scored)
+        else:
+            # Bound the number of chunks in flight so memory does not grow with file size.
+            in_flight: deque[Future[pd.DataFrame]] = deque()
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(model_path,)
+            ) as pool:
+                for chunk in read_chunks(source, chunk_size):
+                    in_flight.append(pool.submit(_score_in_worker, chunk))
+                    if len(in_flight) >= workers * 2:
+                        scored = in_flight.popleft().result()
+                        writer.write(scored)
+                        rows += len(scored)
+                while in_flight:
+                    scored = in_flight.popleft().result()
+                    writer.write(scored)
+                    rows += len(scored)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    report: dict[str, float] = {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+        **_peak_rss_mb(),
+    }
+    logger.info(
+        "Scoring complete — rows=%d, %.1fs, %.0f rows/s, peak_rss=%.0fMB, peak_worker_rss=%.0fMB",
+        rows, elapsed, report["rows_per_second"],
+        report["peak_rss_mb"], report["peak_worker_rss_mb"],
+    )
+    return report
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    config_path: str = "configs/config.yaml",
+    chunk_size: int | None = None,
+    workers: int | None = None,
+) -> dict[str, float]:
+    with open(config_path) as f:
+        cfg = yaml.safe_load(f)
+    scoring_cfg = cfg.get("scoring", {})
+    return score_file(
+        input_path,
+        output_path,
+        model_path=cfg["api"]["model_path"],
+        chunk_size=chunk_size or scoring_cfg.get("chunk_size", 50_000),
+        workers=workers or scoring_cfg.get("workers", 1),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a Telco-schema CSV or Parquet file.")
+    parser.add_argument("input", help="CSV or Parquet file with the raw Telco columns")
+    parser.add_argument("output", help="Destination .parquet or .csv file")
+    parser.add_argument("--config", default="configs/config.yaml")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    run(args.input, args.output, args.config, args.chunk_size, args.workers)
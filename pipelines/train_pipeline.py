@@ -1,7 +1,9 @@
 import logging
 import os
 import sys
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Any
 
 import yaml
 
@@ -9,7 +11,11 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from src.data.loader import TelcoDataLoader
 from src.evaluation.evaluator import ModelEvaluator
+from src.evaluation.thresholds import CostMatrix
+from src.features.cache import FeatureCache, load_features
 from src.features.preprocessor import TelcoPreprocessor
+from src.features.profiling import PreprocessingProfile, profile_preprocessing
+from src.models.out_of_core import FeatureChunks, OutOfCoreTrainer
 from src.models.production import create_production_model
 from src.models.trainer import ChurnModelTrainer
 
@@ -20,6 +26,95 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def build_preprocessor(cfg: dict[str, Any]) -> TelcoPreprocessor:
+    feat_cfg = cfg.get("features", {})
+    return TelcoPreprocessor(
+        output=feat_cfg.get("output", "frame"),
+        dtype=feat_cfg.get("dtype", "float64"),
+        order=feat_cfg.get("order", "C"),
+    )
+
+
+def save_production_model(
+    cfg: dict[str, Any],
+    trainer: ChurnModelTrainer,
+    preprocessor_path: Path,
+    optimal_threshold: float,
+) -> None:
+    best_safe_name = trainer.best_model_name.replace(" ", "_").lower()  # type: ignore[union-attr]
+    model_path = Path(cfg["model"]["save_path"]) / f"{best_safe_name}.pkl"
+    trainer.save_model(path=cfg["model"]["save_path"])
+
+    prod_model = create_production_model(
+        model_path=str(model_path),
+        preprocessor_path=str(preprocessor_path),
+        optimal_threshold=optimal_threshold,
+    )
+    runtime = cfg["model"].get("runtime")
+    if runtime:
+        # Saved with both artifacts; a lean artifact then carries the compiled model.
+        try:
+            prod_model.use_runtime(runtime)
+        except (ImportError, ValueError) as exc:
+            logger.warning("Runtime %s unavailable, saving the native model: %s", runtime, exc)
+    prod_model.save(path=cfg["model"]["production_path"])
+    lean_path = cfg["model"].get("lean_path")
+    if lean_path:
+        try:
+            prod_model.save_lean(path=lean_path)
+        except ValueError as exc:
+            logger.warning("Lean artifact skipped: %s", exc)
+
+    logger.info(
+        "Pipeline complete — best_model=%s, threshold=%.2f",
+        trainer.best_model_name, optimal_threshold,
+    )
+
+
+def run_out_of_core(
+    cfg: dict[str, Any], loader: TelcoDataLoader, mlflow_uri: str, experiment_name: str
+) -> None:
+    """Steps 2-5 with the raw file streamed in chunks; see ``src.models.out_of_core``."""
+    ooc_cfg = cfg["training"]["out_of_core"]
+    logger.info("Step 2/5: Fitting the preprocessor in chunks")
+    preprocessor = build_preprocessor(cfg)
+    data = FeatureChunks(
+        loader,
+        preprocessor,
+        chunksize=ooc_cfg.get("chunk_size", 100_000),
+        test_size=cfg["training"]["test_size"],
+        random_state=cfg["training"]["random_seed"],
+    ).fit()
+
+    logger.info("Step 3/5: Training out-of-core models")
+    trainer = OutOfCoreTrainer(
+        random_state=cfg["training"]["random_seed"],
+        mlflow_tracking_uri=mlflow_uri,
+        experiment_name=experiment_name,
+        sgd_epochs=ooc_cfg.get("sgd_epochs", 5),
+        xgboost_cache_dir=ooc_cfg.get("xgboost_cache_dir"),
+    )
+    trainer.train_chunked(data, log_to_mlflow=True)
+    # Transforming chunks set feature_names, so the preprocessor is saved only now.
+    preprocessor_path = Path(cfg["model"]["preprocessor_path"])
+    preprocessor.save(str(preprocessor_path))
+
+    logger.info("Step 4/5: Evaluating best model")
+    evaluator = ModelEvaluator(trainer.best_model, trainer.best_model_name or "best_model")
+    evaluator.evaluate_chunks(data.iter_test(), resolution=trainer.metrics_resolution)
+    eval_cfg = cfg.get("evaluation", {})
+    optimal_threshold, _ = trainer.curves[trainer.best_model_name or ""].best(
+        eval_cfg.get("threshold_objective", "f1"),
+        beta=eval_cfg.get("fbeta", 1.0),
+        costs=CostMatrix(**eval_cfg["costs"]) if "costs" in eval_cfg else None,
+    )
+    logger.info("Optimal threshold: %.4f", optimal_threshold)
+    evaluator.save_metrics(cfg["model"]["results_path"])
+
+    logger.info("Step 5/5: Saving production model")
+    save_production_model(cfg, trainer, preprocessor_path, optimal_threshold)
+
+
 def run(config_path: str = "configs/config.yaml") -> None:
     with open(config_path) as f:
         cfg = yaml.safe_load(f)
@@ -29,11 +124,24 @@ def run(config_path: str = "configs/config.yaml") -> None:
 
     logger.info("Step 1/5: Loading data")
     loader = TelcoDataLoader(data_path=cfg["data"]["raw_path"])
-    df = loader.load_data()
+    if cfg["training"].get("out_of_core", {}).get("enabled"):
+        run_out_of_core(cfg, loader, mlflow_uri, experiment_name)
+        return
+    cache_cfg = cfg.get("feature_cache", {})
+    cache = FeatureCache.from_config(cache_cfg) if cache_cfg.get("enabled") else None
 
     logger.info("Step 2/5: Preprocessing")
-    preprocessor = TelcoPreprocessor()
-    X, y, _ = preprocessor.prepare_features(df, fit=True)
+    preprocessor = build_preprocessor(cfg)
+    prof_cfg = cfg.get("profiling", {})
+    profiling = (
+        profile_preprocessing(prof_cfg.get("memory", True), prof_cfg.get("profiler"))
+        if prof_cfg.get("enabled") else nullcontext()
+    )
+    with profiling as profile:
+        X, y, _ = load_features(loader, preprocessor, cache)
+    if isinstance(profile, PreprocessingProfile):
+        logger.info("Preprocessing profile:\n%s", profile.summary())
+        profile.save(prof_cfg.get("output_dir", "results/profiling"))
 
     preprocessor_path = Path(cfg["model"]["preprocessor_path"])
     preprocessor.save(str(preprocessor_path))
@@ -43,6 +151,9 @@ def run(config_path: str = "configs/config.yaml") -> None:
         random_state=cfg["training"]["random_seed"],
         mlflow_tracking_uri=mlflow_uri,
         experiment_name=experiment_name,
+        cv_n_jobs=cfg["training"].get("cv_n_jobs", 1),
+        cv_oof_threshold=cfg["training"].get("cv_oof_threshold", False),
+        resampling_cache_dir=cfg["training"].get("resampling_cache_dir"),
     )
     X_train, X_test, y_train, y_test = trainer.split_data(
         X, y, test_size=cfg["training"]["test_size"]
@@ -52,30 +163,28 @@ def run(config_path: str = "configs/config.yaml") -> None:
         imbalance_method=cfg["training"]["imbalance_method"],
         cv=cfg["training"]["cross_validate"],
         log_to_mlflow=True,
+        n_workers=cfg["training"].get("n_workers", 1),
     )
 
     logger.info("Step 4/5: Evaluating best model")
     evaluator = ModelEvaluator(trainer.best_model, trainer.best_model_name or "best_model")
     evaluator.evaluate(X_test, y_test)
-    optimal_threshold, _ = evaluator.find_optimal_threshold(X_test, y_test)
+    best_cv = trainer.results[trainer.best_model_name or ""].get("cv_results", {})
+    if "oof_threshold" in best_cv:
+        optimal_threshold = best_cv["oof_threshold"]
+        logger.info("Using out-of-fold threshold: %.2f", optimal_threshold)
+    else:
+        eval_cfg = cfg.get("evaluation", {})
+        optimal_threshold, _ = evaluator.find_optimal_threshold(
+            X_test, y_test,
+            objective=eval_cfg.get("threshold_objective", "f1"),
+            beta=eval_cfg.get("fbeta", 1.0),
+            costs=CostMatrix(**eval_cfg["costs"]) if "costs" in eval_cfg else None,
+        )
     evaluator.save_metrics(cfg["model"]["results_path"])
 
     logger.info("Step 5/5: Saving production model")
-    best_safe_name = trainer.best_model_name.replace(" ", "_").lower()  # type: ignore[union-attr]
-    model_path = Path(cfg["model"]["save_path"]) / f"{best_safe_name}.pkl"
-    trainer.save_model(path=cfg["model"]["save_path"])
-
-    prod_model = create_production_model(
-        model_path=str(model_path),
-        preprocessor_path=str(preprocessor_path),
-        optimal_threshold=optimal_threshold,
-    )
-    prod_model.save(path=cfg["model"]["production_path"])
-
-    logger.info(
-        "Pipeline complete — best_model=%s, threshold=%.2f",
-        trainer.best_model_name, optimal_threshold,
-    )
+    save_production_model(cfg, trainer, preprocessor_path, optimal_threshold)
 
 
 if __name__ == "__main__":
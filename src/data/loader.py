@@ -1,28 +1,95 @@
 import logging
+import time
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Literal
 
 import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+CATEGORY_COLUMNS: list[str] = [
+    "gender", "Partner", "Dependents", "PhoneService", "MultipleLines",
+    "InternetService", "OnlineSecurity", "OnlineBackup", "DeviceProtection",
+    "TechSupport", "StreamingTV", "StreamingMovies", "Contract",
+    "PaperlessBilling", "PaymentMethod", "Churn",
+]
+
+# TotalCharges is absent on purpose: blank strings in the raw file would make the parser
+# fail, so it is coerced after reading instead.
+TELCO_DTYPES: dict[str, str] = {
+    **{col: "category" for col in CATEGORY_COLUMNS},
+    "SeniorCitizen": "int8",
+    "tenure": "int16",
+    "MonthlyCharges": "float64",
+}
+
+
+def resolve_data_path(data_path: str | Path) -> Path:
+    """Resolve relative paths against the project root, as the loader always has."""
+    if not Path(data_path).is_absolute():
+        project_root = Path(__file__).resolve().parents[2]
+        return project_root / data_path
+    return Path(data_path)
+
 
 class TelcoDataLoader:
-    def __init__(self, data_path: str = "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv") -> None:
-        if not Path(data_path).is_absolute():
-            project_root = Path(__file__).resolve().parents[2]
-            self.data_path = project_root / data_path
-        else:
-            self.data_path = Path(data_path)
+    def __init__(
+        self,
+        data_path: str = "data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv",
+        engine: Literal["c", "pyarrow"] = "c",
+        usecols: list[str] | None = None,
+        apply_schema: bool = True,
+    ) -> None:
+        if engine not in ("c", "pyarrow"):
+            raise ValueError(f"Unknown CSV engine: {engine}")
+        self.data_path = resolve_data_path(data_path)
+        self.engine = engine
+        self.usecols = usecols
+        self.apply_schema = apply_schema
+        self.load_seconds: float | None = None
         self.df: pd.DataFrame | None = None
 
-    def load_data(self) -> pd.DataFrame:
+    def _dtypes(self) -> dict[str, str] | None:
+        if not self.apply_schema:
+            return None
+        return {
+            col: dtype for col, dtype in TELCO_DTYPES.items()
+            if self.usecols is None or col in self.usecols
+        }
+
+    def _check_exists(self) -> None:
         if not self.data_path.exists():
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
-        self.df = pd.read_csv(self.data_path)
-        logger.info("Loaded data: shape=%s", self.df.shape)
+
+    def load_data(self) -> pd.DataFrame:
+        self.df = self.read_data()
         return self.df
 
+    def read_data(self) -> pd.DataFrame:
+        """Read the file into a frame the loader does not keep, so the caller may consume it."""
+        self._check_exists()
+        start = time.perf_counter()
+        df = pd.read_csv(
+            self.data_path, engine=self.engine, usecols=self.usecols, dtype=self._dtypes()
+        )
+        if self.apply_schema:
+            df = coerce_schema(df)
+        self.load_seconds = time.perf_counter() - start
+        logger.info("Loaded data: shape=%s, %.3fs", df.shape, self.load_seconds)
+        return df
+
+    def iter_chunks(self, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Yield the file in ``chunksize``-row frames; the pyarrow engine cannot chunk."""
+        self._check_exists()
+        reader = pd.read_csv(
+            self.data_path, chunksize=chunksize, usecols=self.usecols, dtype=self._dtypes()
+        )
+        with reader:
+            for chunk in reader:
+                yield coerce_schema(chunk) if self.apply_schema else chunk
+
     def get_data_info(self) -> dict[str, object]:
         if self.df is None:
             raise ValueError("Data not loaded. Call load_data() first.")
@@ -31,6 +98,9 @@ class TelcoDataLoader:
             "columns": list(self.df.columns),
             "missing_values": self.df.isnull().sum().to_dict(),
             "duplicates": int(self.df.duplicated().sum()),
+            "dtypes": self.df.dtypes.astype(str).to_dict(),
+            "memory_mb": float(self.df.memory_usage(deep=True).sum() / 1024**2),
+            "load_seconds": self.load_seconds,
         }
         if "Churn" in self.df.columns:
             info["churn_rate"] = float((self.df["Churn"] == "Yes").mean())
@@ -44,8 +114,18 @@ class TelcoDataLoader:
     def get_categorical_features(self) -> list[str]:
         if self.df is None:
             raise ValueError("Data not loaded. Call load_data() first.")
-        categorical = self.df.select_dtypes(include=["object"]).columns.tolist()
+        categorical = self.df.select_dtypes(include=["object", "category"]).columns.tolist()
         for col in ("Churn", "customerID"):
             if col in categorical:
                 categorical.remove(col)
         return categorical
+
+
+def coerce_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Finish the schema for columns the CSV parser cannot type directly."""
+    if "TotalCharges" in df.columns and not pd.api.types.is_float_dtype(df["TotalCharges"]):
+        df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
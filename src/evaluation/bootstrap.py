@@ -0,0 +1,224 @@
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+from joblib import Parallel, delayed
+from numpy.typing import ArrayLike, NDArray
+
+from src.evaluation.metrics import compute_metrics
+
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP_METRICS: tuple[str, ...] = (
+    "precision", "recall", "f1", "roc_auc", "avg_precision", "specificity",
+)
+
+
+@dataclass
+class ConfidenceInterval:
+    estimate: float
+    lower: float
+    upper: float
+
+    def to_dict(self) -> dict[str, float]:
+        return {"estimate": self.estimate, "lower": self.lower, "upper": self.upper}
+
+
+@dataclass
+class BootstrapResult:
+    """Percentile intervals for every metric in ``EvaluationMetrics.to_loggable_dict``."""
+
+    intervals: dict[str, ConfidenceInterval] = field(default_factory=dict)
+    n_resamples: int = 0
+    confidence: float = 0.95
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "n_resamples": self.n_resamples,
+            "confidence": self.confidence,
+            "intervals": {m: ci.to_dict() for m, ci in self.intervals.items()},
+        }
+
+
+@dataclass
+class PairedComparison:
+    """Bootstrap distribution of ``metric(a) - metric(b)`` on shared resamples.
+
+    ``p_values`` are two-sided: twice the share of resamples on the minority side of 0.
+    """
+
+    differences: dict[str, ConfidenceInterval] = field(default_factory=dict)
+    p_values: dict[str, float] = field(default_factory=dict)
+    n_resamples: int = 0
+    confidence: float = 0.95
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "n_resamples": self.n_resamples,
+            "confidence": self.confidence,
+            "differences": {m: ci.to_dict() for m, ci in self.differences.items()},
+            "p_values": self.p_values,
+        }
+
+
+def _divide(num: NDArray[np.float64], den: NDArray[np.float64]) -> NDArray[np.float64]:
+    out = np.full(np.broadcast_shapes(np.shape(num), np.shape(den)), np.nan)
+    return np.divide(num, den, out=out, where=den > 0)
+
+
+def resample_counts(
+    rng: np.random.Generator, n_samples: int, n_resamples: int
+) -> NDArray[np.float64]:
+    """How often each row is drawn in each resample, shape ``(n_resamples, n_samples)``."""
+    idx = rng.integers(0, n_samples, size=(n_resamples, n_samples))
+    # Offset each resample's indices into its own block so one bincount covers the batch.
+    idx += np.arange(n_resamples)[:, None] * n_samples
+    counts = np.bincount(idx.ravel(), minlength=n_resamples * n_samples)
+    return counts.reshape(n_resamples, n_samples).astype(np.float64)
+
+
+def resampled_metrics(
+    labels: NDArray[np.bool_],
+    y_prob: NDArray[np.float64],
+    threshold: float,
+    counts: NDArray[np.float64],
+) -> dict[str, NDArray[np.float64]]:
+    """Every bootstrap metric for each row of ``counts``, with no per-resample loop.
+
+    A resample is a weighting of the original rows, so the confusion matrix is a
+    matrix product and the ranking metrics are weighted cumulative sums over the
+    rows sorted once by probability.
+    """
+    predicted = y_prob >= threshold
+    tp = counts @ (predicted & labels)
+    fp = counts @ (predicted & ~labels)
+    fn = counts @ (~predicted & labels)
+    tn = counts @ (~predicted & ~labels)
+
+    order = np.argsort(y_prob, kind="mergesort")[::-1]
+    sorted_probs = y_prob[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_probs)) + 1]
+    weights = counts[:, order]
+    pos = np.add.reduceat(weights * labels[order], starts, axis=1)
+    neg = np.add.reduceat(weights, starts, axis=1) - pos
+    cum_tp, cum_fp = np.cumsum(pos, axis=1), np.cumsum(neg, axis=1)
+    # Undefined (NaN) ranking metrics for a resample that drew a single class.
+    zero = np.zeros((len(counts), 1))
+    tpr = _divide(np.hstack([zero, cum_tp]), cum_tp[:, -1:])
+    fpr = _divide(np.hstack([zero, cum_fp]), cum_fp[:, -1:])
+    # Cut points no drawn row reaches add no recall, so their undefined precision is moot.
+    cut_precision = np.nan_to_num(_divide(cum_tp, cum_tp + cum_fp))
+
+    return {
+        "precision": np.nan_to_num(_divide(tp, tp + fp)),
+        "recall": np.nan_to_num(_divide(tp, tp + fn)),
+        "f1": np.nan_to_num(_divide(2 * tp, 2 * tp + fp + fn)),
+        "roc_auc": np.sum(np.diff(fpr, axis=1) * (tpr[:, 1:] + tpr[:, :-1]) / 2, axis=1),
+        "avg_precision": np.sum(np.diff(tpr, axis=1) * cut_precision, axis=1),
+        "specificity": np.nan_to_num(_divide(tn, tn + fp)),
+    }
+
+
+def _bootstrap_batch(
+    labels: NDArray[np.bool_],
+    probs: Sequence[NDArray[np.float64]],
+    thresholds: Sequence[float],
+    n_resamples: int,
+    seed: np.random.SeedSequence,
+) -> list[dict[str, NDArray[np.float64]]]:
+    counts = resample_counts(np.random.default_rng(seed), len(labels), n_resamples)
+    return [resampled_metrics(labels, p, t, counts) for p, t in zip(probs, thresholds, strict=True)]
+
+
+def _run_batches(
+    y_true: ArrayLike,
+    probs: Sequence[ArrayLike],
+    thresholds: Sequence[float],
+    n_resamples: int,
+    batch_size: int,
+    n_jobs: int,
+    random_state: int,
+) -> list[dict[str, NDArray[np.float64]]]:
+    """Bootstrap distributions per model; every model sees the same resamples.
+
+    Each batch draws from its own child seed, so results do not depend on ``n_jobs``.
+    """
+    labels = np.asarray(y_true).astype(bool)
+    arrays = [np.asarray(p, dtype=np.float64) for p in probs]
+    sizes = [min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    # Threads, not processes: the batch work is numpy kernels that release the GIL, and
+    # pickling the score arrays to worker processes would cost more than a batch.
+    batches = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_bootstrap_batch)(labels, arrays, thresholds, size, seed)
+        for size, seed in zip(sizes, seeds, strict=True)
+    )
+    return [
+        {m: np.concatenate([batch[i][m] for batch in batches]) for m in BOOTSTRAP_METRICS}
+        for i in range(len(arrays))
+    ]
+
+
+def _interval(
+    estimate: float, samples: NDArray[np.float64], confidence: float
+) -> ConfidenceInterval:
+    alpha = (1 - confidence) / 2
+    lower, upper = np.nanquantile(samples, [alpha, 1 - alpha])
+    return ConfidenceInterval(float(estimate), float(lower), float(upper))
+
+
+def bootstrap_metrics(
+    y_true: ArrayLike,
+    y_prob: ArrayLike,
+    threshold: float = 0.5,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    batch_size: int = 500,
+    n_jobs: int = 1,
+    random_state: int = 42,
+) -> BootstrapResult:
+    """Percentile bootstrap intervals around the full-sample metrics."""
+    point = compute_metrics(y_true, y_prob, threshold)
+    (samples,) = _run_batches(
+        y_true, [y_prob], [threshold], n_resamples, batch_size, n_jobs, random_state
+    )
+    logger.info("Bootstrapped %d resamples of %d rows", n_resamples, point.n_samples)
+    return BootstrapResult(
+        intervals={
+            m: _interval(getattr(point, m), samples[m], confidence) for m in BOOTSTRAP_METRICS
+        },
+        n_resamples=n_resamples,
+        confidence=confidence,
+    )
+
+
+def paired_bootstrap(
+    y_true: ArrayLike,
+    y_prob_a: ArrayLike,
+    y_prob_b: ArrayLike,
+    threshold_a: float = 0.5,
+    threshold_b: float = 0.5,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    batch_size: int = 500,
+    n_jobs: int = 1,
+    random_state: int = 42,
+) -> PairedComparison:
+    """Compare two models scored on the same rows, resampling rows jointly."""
+    point_a = compute_metrics(y_true, y_prob_a, threshold_a)
+    point_b = compute_metrics(y_true, y_prob_b, threshold_b)
+    samples_a, samples_b = _run_batches(
+        y_true, [y_prob_a, y_prob_b], [threshold_a, threshold_b],
+        n_resamples, batch_size, n_jobs, random_state,
+    )
+    comparison = PairedComparison(n_resamples=n_resamples, confidence=confidence)
+    for m in BOOTSTRAP_METRICS:
+        diff = samples_a[m] - samples_b[m]
+        comparison.differences[m] = _interval(
+            getattr(point_a, m) - getattr(point_b, m), diff, confidence
+        )
+        valid = diff[~np.isnan(diff)]
+        tail = min(np.mean(valid <= 0), np.mean(valid >= 0)) if len(valid) else np.nan
+        comparison.p_values[m] = float(min(1.0, 2 * tail))
+    return comparison
@@ -1,5 +1,6 @@
 import json
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -8,14 +9,16 @@ from typing import Any
 import numpy as np
 import pandas as pd
 from numpy.typing import NDArray  # noqa: F401
-from sklearn.metrics import (
-    average_precision_score,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-    roc_auc_score,
+
+from src.evaluation.bootstrap import (
+    BootstrapResult,
+    PairedComparison,
+    bootstrap_metrics,
+    paired_bootstrap,
 )
+from src.evaluation.metrics import BinaryMetrics, compute_metrics, evaluate_chunks
+from src.evaluation.thresholds import CostMatrix, ThresholdCurve, threshold_curve
+from src.features.matrix import FeatureMatrix
 
 logger = logging.getLogger(__name__)
 
@@ -43,26 +46,45 @@ class EvaluationMetrics:
 
 
 class ModelEvaluator:
-    def __init__(self, model: Any, model_name: str = "Model") -> None:
+    def __init__(self, model: Any, model_name: str = "Model", threshold: float = 0.5) -> None:
         self.model = model
         self.model_name = model_name
+        self.threshold = threshold
         self.metrics: EvaluationMetrics | None = None
+        self.intervals: BootstrapResult | None = None
+        self._scored: tuple[FeatureMatrix, NDArray[np.float64]] | None = None
+
+    def predict_proba(self, X: FeatureMatrix) -> NDArray[np.float64]:
+        """Positive-class probabilities, cached for the last frame scored."""
+        if self._scored is None or self._scored[0] is not X:
+            self._scored = (X, self.model.predict_proba(X)[:, 1])
+        return self._scored[1]
+
+    def evaluate(self, X_test: FeatureMatrix, y_test: pd.Series) -> EvaluationMetrics:
+        return self._set_metrics(
+            compute_metrics(y_test, self.predict_proba(X_test), self.threshold)
+        )
 
-    def evaluate(self, X_test: pd.DataFrame, y_test: pd.Series) -> EvaluationMetrics:
-        y_pred: NDArray[np.int_] = self.model.predict(X_test)
-        y_prob: NDArray[np.float64] = self.model.predict_proba(X_test)[:, 1]
-        cm = confusion_matrix(y_test, y_pred)
-        tn, fp, fn, tp = cm.ravel()
+    def evaluate_chunks(
+        self,
+        chunks: Iterable[tuple[FeatureMatrix, pd.Series]],
+        resolution: float | None = None,
+    ) -> EvaluationMetrics:
+        """Evaluate a holdout streamed as ``(X, y)`` chunks that need not fit in memory."""
+        return self._set_metrics(
+            evaluate_chunks(self.model, chunks, self.threshold, resolution)
+        )
 
+    def _set_metrics(self, result: BinaryMetrics) -> EvaluationMetrics:
         self.metrics = EvaluationMetrics(
             model_name=self.model_name,
-            precision=float(precision_score(y_test, y_pred)),
-            recall=float(recall_score(y_test, y_pred)),
-            f1=float(f1_score(y_test, y_pred)),
-            roc_auc=float(roc_auc_score(y_test, y_prob)),
-            avg_precision=float(average_precision_score(y_test, y_prob)),
-            specificity=float(tn / (tn + fp)),
-            confusion_matrix=cm.tolist(),
+            precision=result.precision,
+            recall=result.recall,
+            f1=result.f1,
+            roc_auc=result.roc_auc,
+            avg_precision=result.avg_precision,
+            specificity=result.specificity,
+            confusion_matrix=result.confusion_matrix,
         )
         logger.info(
             "%s — F1=%.4f, ROC-AUC=%.4f, Recall=%.4f",
@@ -70,17 +92,71 @@ class ModelEvaluator:
         )
         return self.metrics
 
+    def bootstrap(
+        self,
+        X_test: FeatureMatrix,
+        y_test: pd.Series,
+        n_resamples: int = 1000,
+        confidence: float = 0.95,
+        n_jobs: int = 1,
+        random_state: int = 42,
+    ) -> BootstrapResult:
+        """Percentile confidence intervals for every metric in ``to_loggable_dict``."""
+        self.intervals = bootstrap_metrics(
+            y_test, self.predict_proba(X_test), self.threshold,
+            n_resamples=n_resamples, confidence=confidence,
+            n_jobs=n_jobs, random_state=random_state,
+        )
+        f1 = self.intervals.intervals["f1"]
+        logger.info(
+            "%s — F1=%.4f [%.4f, %.4f] (%d resamples)",
+            self.model_name, f1.estimate, f1.lower, f1.upper, n_resamples,
+        )
+        return self.intervals
+
+    def compare(
+        self,
+        other: "ModelEvaluator",
+        X_test: FeatureMatrix,
+        y_test: pd.Series,
+        n_resamples: int = 1000,
+        confidence: float = 0.95,
+        n_jobs: int = 1,
+        random_state: int = 42,
+    ) -> PairedComparison:
+        """Paired bootstrap of this model minus ``other`` on the same holdout rows."""
+        comparison = paired_bootstrap(
+            y_test, self.predict_proba(X_test), other.predict_proba(X_test),
+            self.threshold, other.threshold,
+            n_resamples=n_resamples, confidence=confidence,
+            n_jobs=n_jobs, random_state=random_state,
+        )
+        f1 = comparison.differences["f1"]
+        logger.info(
+            "%s vs %s — F1 diff=%.4f [%.4f, %.4f], p=%.3f",
+            self.model_name, other.model_name, f1.estimate, f1.lower, f1.upper,
+            comparison.p_values["f1"],
+        )
+        return comparison
+
+    def threshold_curve(self, X_test: FeatureMatrix, y_test: pd.Series) -> ThresholdCurve:
+        return threshold_curve(y_test, self.predict_proba(X_test))
+
     def find_optimal_threshold(
-        self, X_test: pd.DataFrame, y_test: pd.Series
+        self,
+        X_test: FeatureMatrix,
+        y_test: pd.Series,
+        objective: str = "f1",
+        beta: float = 1.0,
+        costs: CostMatrix | None = None,
     ) -> tuple[float, float]:
-        y_prob: NDArray[np.float64] = self.model.predict_proba(X_test)[:, 1]
-        thresholds = np.arange(0.1, 0.9, 0.02)
-        f1_scores = [f1_score(y_test, (y_prob >= t).astype(int)) for t in thresholds]
-        optimal_idx = int(np.argmax(f1_scores))
-        optimal_threshold = float(thresholds[optimal_idx])
-        optimal_f1 = float(f1_scores[optimal_idx])
-        logger.info("Optimal threshold: %.2f (F1=%.4f)", optimal_threshold, optimal_f1)
-        return optimal_threshold, optimal_f1
+        """Best cut point over every distinct probability for F1, F-beta or total cost."""
+        curve = self.threshold_curve(X_test, y_test)
+        optimal_threshold, value = curve.best(objective, beta=beta, costs=costs)
+        logger.info(
+            "Optimal threshold: %.4f (%s=%.4f)", optimal_threshold, objective, value
+        )
+        return optimal_threshold, value
 
     def save_metrics(self, output_dir: str = "results/evaluation") -> None:
         if self.metrics is None:
@@ -89,10 +165,12 @@ class ModelEvaluator:
         out_path = Path(output_dir) / f"{self.model_name.replace(' ', '_')}_{timestamp}"
         out_path.mkdir(parents=True, exist_ok=True)
         metrics_path = out_path / "metrics.json"
-        payload = {
+        payload: dict[str, Any] = {
             **self.metrics.to_loggable_dict(),
             "confusion_matrix": self.metrics.confusion_matrix,
         }
+        if self.intervals is not None:
+            payload["confidence_intervals"] = self.intervals.to_dict()
         with open(metrics_path, "w") as f:
             json.dump(payload, f, indent=4)
         logger.info("Metrics saved: path=%s", metrics_path)
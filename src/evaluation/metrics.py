@@ -0,0 +1,138 @@
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike, NDArray
+
+from src.evaluation.thresholds import ThresholdCurve
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BinaryMetrics:
+    precision: float
+    recall: float
+    f1: float
+    roc_auc: float
+    avg_precision: float
+    specificity: float
+    confusion_matrix: list[list[int]] = field(default_factory=list)
+    n_samples: int = 0
+
+
+class MetricsAccumulator:
+    """Binary classification metrics accumulated chunk by chunk from probabilities.
+
+    Labels are derived as ``prob >= threshold``, the rule the production model uses.
+    The confusion matrix is kept as four counters. Ranking metrics are computed from
+    positive/negative counts per distinct probability, so memory grows with the number
+    of distinct scores rather than rows. ``resolution`` rounds scores onto a fixed grid
+    to cap that memory at the cost of treating nearby scores as ties.
+    """
+
+    def __init__(self, threshold: float = 0.5, resolution: float | None = None) -> None:
+        self.threshold = threshold
+        self.resolution = resolution
+        self.tp = self.fp = self.fn = self.tn = 0
+        self._values: NDArray[np.float64] = np.empty(0)
+        self._pos: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        self._neg: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+
+    def update(self, y_true: ArrayLike, y_prob: ArrayLike) -> "MetricsAccumulator":
+        labels = np.asarray(y_true).astype(bool)
+        probs = np.asarray(y_prob, dtype=np.float64)
+        predicted = probs >= self.threshold
+        tp = int(np.count_nonzero(predicted & labels))
+        fp = int(np.count_nonzero(predicted)) - tp
+        positives = int(np.count_nonzero(labels))
+        self.tp += tp
+        self.fp += fp
+        self.fn += positives - tp
+        self.tn += len(labels) - positives - fp
+
+        if self.resolution is not None:
+            probs = np.round(probs / self.resolution) * self.resolution
+        values, inverse = np.unique(probs, return_inverse=True)
+        pos = np.bincount(inverse, weights=labels, minlength=len(values))
+        neg = np.bincount(inverse, minlength=len(values)) - pos
+        self._merge(values, pos, neg)
+        return self
+
+    def _merge(
+        self, values: NDArray[np.float64], pos: NDArray[Any], neg: NDArray[Any]
+    ) -> None:
+        self._values, inverse = np.unique(
+            np.concatenate([self._values, values]), return_inverse=True
+        )
+        size = len(self._values)
+        self._pos = np.bincount(
+            inverse, weights=np.concatenate([self._pos, pos]), minlength=size
+        ).astype(np.int64)
+        self._neg = np.bincount(
+            inverse, weights=np.concatenate([self._neg, neg]), minlength=size
+        ).astype(np.int64)
+
+    @property
+    def n_samples(self) -> int:
+        return self.tp + self.fp + self.fn + self.tn
+
+    def curve(self) -> ThresholdCurve:
+        """Confusion counts at every distinct (rounded) probability, highest first."""
+        tp = np.cumsum(self._pos[::-1])
+        fp = np.cumsum(self._neg[::-1])
+        positives, negatives = int(self._pos.sum()), int(self._neg.sum())
+        return ThresholdCurve(
+            thresholds=self._values[::-1].copy(),
+            tp=tp, fp=fp, fn=positives - tp, tn=negatives - fp,
+        )
+
+    def _ranking_metrics(self) -> tuple[float, float]:
+        positives, negatives = int(self._pos.sum()), int(self._neg.sum())
+        if positives == 0 or negatives == 0:
+            return float("nan"), float("nan")
+        curve = self.curve()
+        tpr = np.r_[0.0, curve.tp / positives]
+        fpr = np.r_[0.0, curve.fp / negatives]
+        roc_auc = float(np.trapz(tpr, fpr))
+        # Step-wise average precision, as sklearn computes it: sum over cut points of
+        # (recall gained) * (precision at that cut point).
+        avg_precision = float(np.sum(np.diff(tpr) * (curve.tp / (curve.tp + curve.fp))))
+        return roc_auc, avg_precision
+
+    def result(self) -> BinaryMetrics:
+        tp, fp, fn, tn = self.tp, self.fp, self.fn, self.tn
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        roc_auc, avg_precision = self._ranking_metrics()
+        return BinaryMetrics(
+            precision=float(precision),
+            recall=float(recall),
+            f1=float(2 * tp / (2 * tp + fp + fn)) if tp else 0.0,
+            roc_auc=roc_auc,
+            avg_precision=avg_precision,
+            specificity=float(tn / (tn + fp)) if tn + fp else 0.0,
+            confusion_matrix=[[tn, fp], [fn, tp]],
+            n_samples=self.n_samples,
+        )
+
+
+def compute_metrics(y_true: ArrayLike, y_prob: ArrayLike, threshold: float = 0.5) -> BinaryMetrics:
+    return MetricsAccumulator(threshold).update(y_true, y_prob).result()
+
+
+def evaluate_chunks(
+    model: Any,
+    chunks: Iterable[tuple[pd.DataFrame, pd.Series]],
+    threshold: float = 0.5,
+    resolution: float | None = None,
+) -> BinaryMetrics:
+    """Score ``(X, y)`` chunks one at a time; only the accumulator outlives a chunk."""
+    accumulator = MetricsAccumulator(threshold, resolution)
+    for X, y in chunks:
+        accumulator.update(y, model.predict_proba(X)[:, 1])
+    logger.info("Evaluated %d rows in chunks", accumulator.n_samples)
+    return accumulator.result()
@@ -0,0 +1,113 @@
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike, NDArray
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVES: tuple[str, ...] = ("f1", "fbeta", "cost")
+
+
+@dataclass(frozen=True)
+class CostMatrix:
+    """Cost of each confusion-matrix cell for one customer.
+
+    With a retention offer costing ``c`` and a lost customer costing ``L``, a typical
+    setting is ``CostMatrix(tp=c, fp=c, fn=L)``: every flagged customer receives the
+    offer and every missed churner is lost.
+    """
+
+    tp: float = 0.0
+    fp: float = 0.0
+    fn: float = 0.0
+    tn: float = 0.0
+
+
+@dataclass
+class ThresholdCurve:
+    """Confusion counts at every distinct probability cut point (``prob >= threshold``)."""
+
+    thresholds: NDArray[np.float64]
+    tp: NDArray[np.int64]
+    fp: NDArray[np.int64]
+    fn: NDArray[np.int64]
+    tn: NDArray[np.int64]
+
+    @property
+    def precision(self) -> NDArray[np.float64]:
+        predicted = self.tp + self.fp
+        return np.divide(self.tp, predicted, out=np.zeros(len(self.tp)), where=predicted > 0)
+
+    @property
+    def recall(self) -> NDArray[np.float64]:
+        positives = self.tp + self.fn
+        return np.divide(self.tp, positives, out=np.zeros(len(self.tp)), where=positives > 0)
+
+    def fbeta(self, beta: float = 1.0) -> NDArray[np.float64]:
+        # Count form of F-beta; matches sklearn, including 0 when tp == 0.
+        b2 = beta**2
+        numerator = (1 + b2) * self.tp
+        denominator = numerator + b2 * self.fn + self.fp
+        return np.divide(
+            numerator, denominator, out=np.zeros(len(self.tp)), where=denominator > 0
+        )
+
+    @property
+    def f1(self) -> NDArray[np.float64]:
+        return self.fbeta(1.0)
+
+    def cost(self, costs: CostMatrix) -> NDArray[np.float64]:
+        total: NDArray[np.float64] = (
+            self.tp * costs.tp + self.fp * costs.fp + self.fn * costs.fn + self.tn * costs.tn
+        ).astype(np.float64)
+        return total
+
+    def best(
+        self, objective: str = "f1", beta: float = 1.0, costs: CostMatrix | None = None
+    ) -> tuple[float, float]:
+        """Threshold optimising ``objective`` and the objective's value there."""
+        if objective in ("f1", "fbeta"):
+            values = self.fbeta(beta if objective == "fbeta" else 1.0)
+            idx = int(np.argmax(values))
+        elif objective == "cost":
+            if costs is None:
+                raise ValueError("A CostMatrix is required for the cost objective")
+            values = self.cost(costs)
+            idx = int(np.argmin(values))
+        else:
+            raise ValueError(f"Unknown threshold objective: {objective}")
+        return float(self.thresholds[idx]), float(values[idx])
+
+    def to_frame(self, costs: CostMatrix | None = None) -> pd.DataFrame:
+        frame = pd.DataFrame({
+            "threshold": self.thresholds,
+            "tp": self.tp, "fp": self.fp, "fn": self.fn, "tn": self.tn,
+            "precision": self.precision, "recall": self.recall, "f1": self.f1,
+        })
+        if costs is not None:
+            frame["cost"] = self.cost(costs)
+        return frame
+
+
+def threshold_curve(y_true: ArrayLike, y_prob: ArrayLike) -> ThresholdCurve:
+    """Sweep every distinct probability in one sort and a cumulative sum."""
+    labels = np.asarray(y_true).astype(bool)
+    probs = np.asarray(y_prob, dtype=np.float64)
+    order = np.argsort(probs, kind="mergesort")[::-1]
+    probs, labels = probs[order], labels[order]
+
+    # Last index of each run of equal probabilities: everything up to it is >= that value.
+    cut = np.r_[np.flatnonzero(np.diff(probs)), len(probs) - 1]
+    tp = np.cumsum(labels, dtype=np.int64)[cut]
+    fp = (cut + 1) - tp
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    return ThresholdCurve(
+        thresholds=probs[cut],
+        tp=tp,
+        fp=fp,
+        fn=positives - tp,
+        tn=negatives - fp,
+    )
@@ -0,0 +1,210 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from src.data import loader as loader_module
+from src.data.loader import TelcoDataLoader, resolve_data_path
+from src.features import preprocessor as preprocessor_module
+from src.features import schema as schema_module
+from src.features.preprocessor import TelcoPreprocessor
+
+logger = logging.getLogger(__name__)
+
+EVICTION_POLICIES: tuple[str, ...] = ("lru", "fifo")
+
+_INDEX_FILE = "index.json"
+_CATEGORIES_KEY = b"telco.categories"
+
+
+def file_digest(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def preprocessor_version(preprocessor: TelcoPreprocessor) -> str:
+    """Tag derived from the loader/feature code and the preprocessor's own options.
+
+    Any edit to those modules changes the tag, so stale frames are never served after
+    the feature logic changes.
+    """
+    digest = hashlib.sha256()
+    for module in (loader_module, schema_module, preprocessor_module):
+        digest.update(inspect.getsource(module).encode())
+    digest.update(json.dumps({"handle_unknown": preprocessor.handle_unknown}).encode())
+    return digest.hexdigest()[:16]
+
+
+class FeatureCache:
+    """Content-addressed store of engineered (and optionally encoded) Telco frames.
+
+    Entries are Arrow IPC files named by the raw file's sha256, the preprocessor
+    version and the stage. Hits are memory-mapped rather than read into memory. When
+    the directory grows past ``max_size_mb``, entries are evicted least recently used
+    first (``"lru"``) or oldest first (``"fifo"``).
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = "data/cache/features",
+        max_size_mb: float = 1024,
+        eviction: str = "lru",
+        store_encoded: bool = False,
+    ) -> None:
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.cache_dir = resolve_data_path(cache_dir)
+        self.max_bytes = int(max_size_mb * 1024**2)
+        self.eviction = eviction
+        self.store_encoded = store_encoded
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> "FeatureCache":
+        return cls(
+            cache_dir=cfg.get("dir", "data/cache/features"),
+            max_size_mb=cfg.get("max_size_mb", 1024),
+            eviction=cfg.get("eviction", "lru"),
+            store_encoded=cfg.get("store_encoded", False),
+        )
+
+    def make_key(self, raw_path: Path, preprocessor: TelcoPreprocessor) -> str:
+        """Key prefix for one raw file under one preprocessor version; stages append to it."""
+        return f"{file_digest(raw_path)[:32]}-{preprocessor_version(preprocessor)}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.arrow"
+
+    def get(self, key: str) -> tuple[pd.DataFrame, dict[str, Any]] | None:
+        """Return the cached frame and its stored metadata, or None on a miss."""
+        import pyarrow as pa
+
+        path = self._path(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        metadata = table.schema.metadata or {}
+        extra = json.loads(metadata[_CATEGORIES_KEY]) if _CATEGORIES_KEY in metadata else {}
+        # split_blocks keeps numeric columns backed by the mapped buffers instead of
+        # consolidating them into fresh 2-D blocks.
+        df = table.to_pandas(split_blocks=True)
+        self.hits += 1
+        self._touch(key)
+        logger.info("Feature cache hit: key=%s, shape=%s", key[:12], df.shape)
+        return df, extra
+
+    def put(self, key: str, df: pd.DataFrame, extra: dict[str, Any] | None = None) -> None:
+        import pyarrow as pa
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if extra:
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}), _CATEGORIES_KEY: json.dumps(extra).encode(),
+            })
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+
+        index = self._read_index()
+        now = time.time()
+        index[key] = {"created": now, "last_access": now, "bytes": path.stat().st_size}
+        self._write_index(index)
+        logger.info("Feature cache stored: key=%s, %.1fMB", key[:12], index[key]["bytes"] / 1024**2)
+        self._evict(keep=key)
+
+    def clear(self) -> None:
+        for key in self._read_index():
+            self._path(key).unlink(missing_ok=True)
+        self._write_index({})
+
+    def size_bytes(self) -> int:
+        return sum(int(entry["bytes"]) for entry in self._read_index().values())
+
+    def _touch(self, key: str) -> None:
+        index = self._read_index()
+        if key in index:
+            index[key]["last_access"] = time.time()
+            self._write_index(index)
+
+    def _evict(self, keep: str) -> None:
+        index = self._read_index()
+        order_by = "last_access" if self.eviction == "lru" else "created"
+        total = sum(int(entry["bytes"]) for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k][order_by]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._path(key).unlink(missing_ok=True)
+            total -= int(index.pop(key)["bytes"])
+            logger.info("Feature cache evicted: key=%s", key[:12])
+        self._write_index(index)
+
+    def _read_index(self) -> dict[str, dict[str, float]]:
+        path = self.cache_dir / _INDEX_FILE
+        if not path.exists():
+            return {}
+        index: dict[str, dict[str, float]] = json.loads(path.read_text())
+        # Drop entries whose files were removed out from under us.
+        return {k: v for k, v in index.items() if self._path(k).exists()}
+
+    def _write_index(self, index: dict[str, dict[str, float]]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / _INDEX_FILE
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(index))
+        os.replace(tmp_path, path)
+
+
+def load_features(
+    loader: TelcoDataLoader,
+    preprocessor: TelcoPreprocessor,
+    cache: FeatureCache | None = None,
+) -> tuple[pd.DataFrame, pd.Series | None, list[str]]:
+    """Fit ``preprocessor`` on the loader's file, reusing cached stages when possible.
+
+    Every frame here is read from the file (``read_data``, not the loader's ``df``) or
+    from the cache for this call alone, so the stages run in place; replaced columns
+    never write into memory-mapped buffers.
+    """
+    if cache is None:
+        return preprocessor.prepare_features(loader.read_data(), fit=True, inplace=True)
+
+    key = cache.make_key(loader.data_path, preprocessor)
+    engineered_key, encoded_key = f"{key}-engineered", f"{key}-encoded"
+
+    if cache.store_encoded and (hit := cache.get(encoded_key)) is not None:
+        encoded, categories = hit
+        preprocessor.categories = categories
+        return preprocessor.prepare_features(encoded, fit=True, start="encoded", inplace=True)
+
+    if (hit := cache.get(engineered_key)) is not None:
+        engineered, _ = hit
+    else:
+        engineered = preprocessor.engineer_features(
+            preprocessor.clean_data(loader.read_data(), inplace=True), inplace=True
+        )
+        cache.put(engineered_key, engineered)
+
+    if not cache.store_encoded:
+        return preprocessor.prepare_features(
+            engineered, fit=True, start="engineered", inplace=True
+        )
+    encoded = preprocessor.encode_features(engineered, fit=True, inplace=True)
+    cache.put(encoded_key, encoded, extra=preprocessor.categories)
+    return preprocessor.prepare_features(encoded, fit=True, start="encoded", inplace=True)
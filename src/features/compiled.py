@@ -0,0 +1,216 @@
+import logging
+import math
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.features.schema import (
+    AUTO_PAYMENT_METHODS,
+    ONE_HOT_COLUMNS,
+    PREMIUM_SERVICE_COLUMNS,
+    SERVICE_COLUMNS,
+    SERVICE_FLAG_COLUMNS,
+    STREAMING_COLUMNS,
+    TENURE_BINS,
+    TENURE_LABELS,
+    YES_NO_COLUMNS,
+)
+
+logger = logging.getLogger(__name__)
+
+_ONE_HOT_SOURCES: list[str] = [*ONE_HOT_COLUMNS, "tenure_group"]
+
+_DIRECT_FEATURES: frozenset[str] = frozenset([
+    "SeniorCitizen", *YES_NO_COLUMNS, *SERVICE_FLAG_COLUMNS,
+    "tenure", "MonthlyCharges", "TotalCharges",
+    "charges_ratio", "avg_monthly_charges", "total_services", "has_internet",
+    "has_phone", "premium_services", "streaming_services", "has_family",
+    "is_senior_with_family", "auto_payment", "monthly_charges_per_service",
+])
+
+
+def _to_float(value: Any) -> float:
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if math.isnan(result) else result
+
+
+def _tenure_group(tenure: float) -> str | None:
+    for lower, upper, label in zip(TENURE_BINS[:-1], TENURE_BINS[1:], TENURE_LABELS, strict=True):
+        if lower < tenure <= upper:
+            return label
+    return None
+
+
+class CompiledFeatureMap:
+    """Record-to-vector transform equivalent to ``TelcoPreprocessor.prepare_features``.
+
+    Built once from a fitted preprocessor: every feature gets a fixed slot in
+    ``feature_names`` order, one-hot columns resolve through a precomputed
+    ``(column, value) -> slot`` table and scaling uses the scaler's ``mean_`` and
+    ``scale_`` arrays directly, so no DataFrame is created per record.
+    """
+
+    def __init__(
+        self,
+        feature_names: list[str],
+        direct_slots: list[tuple[int, str]],
+        onehot_slots: dict[str, dict[str, int]],
+        scale_index: NDArray[np.intp],
+        scale_mean: NDArray[np.float64],
+        scale_std: NDArray[np.float64],
+        known_levels: dict[str, frozenset[str]] | None = None,
+    ) -> None:
+        self.feature_names = feature_names
+        self.n_features = len(feature_names)
+        self._direct_slots = direct_slots
+        self._onehot_slots = onehot_slots
+        self._scale_index = scale_index
+        self._scale_mean = scale_mean
+        self._scale_std = scale_std
+        self._known_levels = known_levels
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor: Any) -> "CompiledFeatureMap":
+        if not preprocessor.is_fitted:
+            raise ValueError("Preprocessor not fitted. Call prepare_features first.")
+        feature_names: list[str] = list(preprocessor.feature_names)
+
+        direct_slots: list[tuple[int, str]] = []
+        onehot_slots: dict[str, dict[str, int]] = {}
+        for idx, name in enumerate(feature_names):
+            if name in _DIRECT_FEATURES:
+                direct_slots.append((idx, name))
+                continue
+            source = next((c for c in _ONE_HOT_SOURCES if name.startswith(f"{c}_")), None)
+            if source is None:
+                raise ValueError(f"Cannot compile unknown feature: {name}")
+            onehot_slots.setdefault(source, {})[name[len(source) + 1:]] = idx
+
+        scaler = preprocessor.scaler
+        scaled_names: list[str] = list(scaler.feature_names_in_)
+        scale_index = np.array([feature_names.index(c) for c in scaled_names], dtype=np.intp)
+        compiled = cls(
+            feature_names=feature_names,
+            direct_slots=direct_slots,
+            onehot_slots=onehot_slots,
+            scale_index=scale_index,
+            scale_mean=np.asarray(scaler.mean_, dtype=np.float64),
+            scale_std=np.asarray(scaler.scale_, dtype=np.float64),
+            known_levels=(
+                {col: frozenset(levels) for col, levels in preprocessor.categories.items()}
+                if getattr(preprocessor, "handle_unknown", "ignore") == "error"
+                else None
+            ),
+        )
+        logger.info(
+            "Compiled feature map: features=%d, one_hot_slots=%d",
+            compiled.n_features, sum(len(s) for s in onehot_slots.values()),
+        )
+        return compiled
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serialisable constants; ``from_dict`` rebuilds the map without a preprocessor."""
+        return {
+            "feature_names": self.feature_names,
+            "direct_slots": [[idx, name] for idx, name in self._direct_slots],
+            "onehot_slots": self._onehot_slots,
+            "scale_index": self._scale_index.tolist(),
+            "scale_mean": self._scale_mean.tolist(),
+            "scale_std": self._scale_std.tolist(),
+            "known_levels": (
+                {col: sorted(levels) for col, levels in self._known_levels.items()}
+                if self._known_levels is not None
+                else None
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CompiledFeatureMap":
+        known_levels = data.get("known_levels")
+        return cls(
+            feature_names=list(data["feature_names"]),
+            direct_slots=[(int(idx), str(name)) for idx, name in data["direct_slots"]],
+            onehot_slots={
+                col: {level: int(idx) for level, idx in slots.items()}
+                for col, slots in data["onehot_slots"].items()
+            },
+            scale_index=np.asarray(data["scale_index"], dtype=np.intp),
+            scale_mean=np.asarray(data["scale_mean"], dtype=np.float64),
+            scale_std=np.asarray(data["scale_std"], dtype=np.float64),
+            known_levels=(
+                {col: frozenset(levels) for col, levels in known_levels.items()}
+                if known_levels is not None
+                else None
+            ),
+        )
+
+    def transform_one(self, record: Mapping[str, Any]) -> NDArray[np.float64]:
+        vector = np.zeros(self.n_features, dtype=np.float64)
+        self._fill(vector, record)
+        scaled = vector[self._scale_index]
+        vector[self._scale_index] = (scaled - self._scale_mean) / self._scale_std
+        return vector
+
+    def transform_many(self, records: Iterable[Mapping[str, Any]]) -> NDArray[np.float64]:
+        rows = list(records)
+        matrix = np.zeros((len(rows), self.n_features), dtype=np.float64)
+        for row, record in zip(matrix, rows, strict=True):
+            self._fill(row, record)
+        scaled = matrix[:, self._scale_index]
+        matrix[:, self._scale_index] = (scaled - self._scale_mean) / self._scale_std
+        return matrix
+
+    def _fill(self, out: NDArray[np.float64], record: Mapping[str, Any]) -> None:
+        values = _base_values(record)
+        for idx, name in self._direct_slots:
+            out[idx] = values[name]
+        for column, slots in self._onehot_slots.items():
+            value = values[column]
+            slot = slots.get(value)
+            if slot is not None:
+                out[slot] = 1.0
+            elif (
+                self._known_levels is not None
+                and value is not None
+                and value not in self._known_levels[column]
+            ):
+                raise ValueError(f"Unknown categories for {column}: {[value]}")
+
+
+def _base_values(record: Mapping[str, Any]) -> dict[str, Any]:
+    def yes(column: str) -> int:
+        return int(record.get(column) == "Yes")
+
+    tenure = record["tenure"]
+    monthly = float(record["MonthlyCharges"])
+    total = _to_float(record["TotalCharges"])
+    senior = int(record.get("SeniorCitizen") == 1)
+    total_services = sum(yes(c) for c in SERVICE_COLUMNS)
+    has_family = int(yes("Partner") or yes("Dependents"))
+
+    values: dict[str, Any] = {c: yes(c) for c in (*YES_NO_COLUMNS, *SERVICE_FLAG_COLUMNS)}
+    values.update({c: record.get(c) for c in ONE_HOT_COLUMNS})
+    values.update({
+        "SeniorCitizen": senior,
+        "tenure": tenure,
+        "MonthlyCharges": monthly,
+        "TotalCharges": total,
+        "charges_ratio": total / (monthly + 1),
+        "avg_monthly_charges": total / (tenure + 1),
+        "total_services": total_services,
+        "has_internet": int(record.get("InternetService") != "No"),
+        "has_phone": yes("PhoneService"),
+        "premium_services": sum(yes(c) for c in PREMIUM_SERVICE_COLUMNS),
+        "streaming_services": sum(yes(c) for c in STREAMING_COLUMNS),
+        "has_family": has_family,
+        "is_senior_with_family": int(senior == 1 and has_family == 1),
+        "auto_payment": int(record.get("PaymentMethod") in AUTO_PAYMENT_METHODS),
+        "monthly_charges_per_service": monthly / (total_services + 1),
+        "tenure_group": _tenure_group(tenure),
+    })
+    return values
@@ -0,0 +1,75 @@
+"""Feature matrices: pandas frames or contiguous NumPy arrays with a feature-name sidecar.
+
+``TelcoPreprocessor(output="array")`` emits the array form. Training, tuning and
+scoring take either; these helpers do the few row operations they need in a way
+that keeps an array's dtype and memory order, so no stage converts it back.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike, NDArray
+
+FeatureMatrix = pd.DataFrame | NDArray[np.floating[Any]]
+
+OUTPUTS: tuple[str, ...] = ("frame", "array")
+DTYPES: tuple[str, ...] = ("float32", "float64")
+ORDERS: tuple[str, ...] = ("C", "F")
+
+
+def memory_order(X: NDArray[Any]) -> Literal["C", "F"]:
+    return "F" if X.flags.f_contiguous and not X.flags.c_contiguous else "C"
+
+
+def to_matrix(
+    df: pd.DataFrame,
+    columns: Sequence[str] | None = None,
+    dtype: str = "float64",
+    order: str = "C",
+) -> NDArray[np.floating[Any]]:
+    """Copy ``columns`` of ``df`` into one preallocated ``dtype`` matrix in ``order``."""
+    columns = list(df.columns) if columns is None else list(columns)
+    out: NDArray[np.floating[Any]] = np.empty(
+        (len(df), len(columns)), dtype=dtype, order="F" if order == "F" else "C"
+    )
+    for j, col in enumerate(columns):
+        out[:, j] = df[col].to_numpy()
+    return out
+
+
+def take_rows(X: Any, rows: ArrayLike) -> Any:
+    """Rows of a frame, series or array by position; arrays keep their memory order."""
+    if isinstance(X, pd.DataFrame | pd.Series):
+        return X.iloc[rows]
+    if X.ndim == 1 or memory_order(X) == "C":
+        return X[rows]
+    indices = np.asarray(rows)
+    if indices.dtype == bool:
+        indices = np.flatnonzero(indices)
+    out = np.empty((len(indices), X.shape[1]), dtype=X.dtype, order="F")
+    return np.take(X, indices, axis=0, out=out)
+
+
+def match_layout(X: Any, like: Any) -> Any:
+    """``X`` with ``like``'s memory order when both are arrays, e.g. after SMOTE."""
+    if isinstance(X, np.ndarray) and isinstance(like, np.ndarray) and X.ndim == 2:
+        return np.asarray(X, dtype=like.dtype, order=memory_order(like))
+    return X
+
+
+def stack_rows(blocks: Sequence[Any]) -> Any:
+    """Concatenate frames (with a fresh index), series or arrays row-wise."""
+    first = blocks[0]
+    if isinstance(first, pd.DataFrame | pd.Series):
+        return pd.concat(blocks, ignore_index=True)
+    if first.ndim == 1:
+        return np.concatenate(blocks)
+    rows = sum(len(b) for b in blocks)
+    out = np.empty((rows, first.shape[1]), dtype=first.dtype, order=memory_order(first))
+    offset = 0
+    for block in blocks:
+        out[offset:offset + len(block)] = block
+        offset += len(block)
+    return out
@@ -2,62 +2,127 @@ import logging
 from pathlib import Path
 
 import joblib
+import numpy as np
 import pandas as pd
+from sklearn.base import clone
 from sklearn.preprocessing import StandardScaler
 
+from src.features.matrix import DTYPES, ORDERS, OUTPUTS, FeatureMatrix, to_matrix
+from src.features.profiling import profiled_stage
+from src.features.schema import (
+    AUTO_PAYMENT_METHODS,
+    ONE_HOT_COLUMNS,
+    PREMIUM_SERVICE_COLUMNS,
+    SCALE_COLUMNS,
+    SERVICE_COLUMNS,
+    SERVICE_FLAG_COLUMNS,
+    STREAMING_COLUMNS,
+    TENURE_BINS,
+    TENURE_LABELS,
+    YES_NO_COLUMNS,
+)
+
 logger = logging.getLogger(__name__)
 
+STAGES: tuple[str, ...] = ("raw", "engineered", "encoded")
+
 
 class TelcoPreprocessor:
-    def __init__(self) -> None:
+    """Telco feature pipeline.
+
+    ``output="array"`` makes ``prepare_features`` return ``X`` as one contiguous
+    ``dtype`` matrix in ``order`` (``"C"`` or ``"F"``) instead of a DataFrame; the
+    column names are the returned ``feature_names``.
+    """
+
+    def __init__(
+        self,
+        handle_unknown: str = "ignore",
+        output: str = "frame",
+        dtype: str = "float64",
+        order: str = "C",
+    ) -> None:
+        if handle_unknown not in ("ignore", "error"):
+            raise ValueError(f"Unknown handle_unknown option: {handle_unknown}")
+        if output not in OUTPUTS:
+            raise ValueError(f"Unknown output option: {output}")
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported feature dtype: {dtype}")
+        if order not in ORDERS:
+            raise ValueError(f"Unknown memory order: {order}")
         self.scaler = StandardScaler()
+        self.handle_unknown = handle_unknown
+        self.output = output
+        self.dtype = dtype
+        self.order = order
+        self.categories: dict[str, list[str]] = {}
         self.feature_names: list[str] = []
         self.is_fitted: bool = False
 
-    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
+    def __setstate__(self, state: dict[str, object]) -> None:
+        # Preprocessors pickled before pd.get_dummies was replaced kept no vocabulary;
+        # their columns cannot be reproduced, so fail here rather than when scoring.
+        if state.get("is_fitted") and "categories" not in state:
+            raise ValueError(
+                "Preprocessor was pickled without a category vocabulary; "
+                "re-fit it with prepare_features and save it again."
+            )
+        state.setdefault("handle_unknown", "ignore")
+        state.setdefault("categories", {})
+        # Preprocessors pickled before the array output option produce frames.
+        state.setdefault("output", "frame")
+        state.setdefault("dtype", "float64")
+        state.setdefault("order", "C")
+        self.__dict__.update(state)
+
+    def to_output(self, X: pd.DataFrame, columns: list[str] | None = None) -> FeatureMatrix:
+        """``X`` (or its ``columns``) in the configured output form."""
+        if self.output == "array":
+            return to_matrix(X, columns, self.dtype, self.order)
+        return X if columns is None or list(X.columns) == columns else X[columns]
+
+    @profiled_stage("clean")
+    def clean_data(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        if not inplace:
+            df = df.copy()
         df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
         missing_mask = df["TotalCharges"].isnull()
         df.loc[missing_mask, "TotalCharges"] = 0
         logger.info("Filled %d missing TotalCharges values", missing_mask.sum())
         if "customerID" in df.columns:
-            df = df.drop("customerID", axis=1)
+            del df["customerID"]
         df["SeniorCitizen"] = df["SeniorCitizen"].map({0: "No", 1: "Yes"})
         logger.info("Data cleaned: shape=%s", df.shape)
         return df
 
-    def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
+    @profiled_stage("engineer")
+    def engineer_features(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        if not inplace:
+            df = df.copy()
         df["tenure_group"] = pd.cut(
             df["tenure"],
-            bins=[0, 12, 24, 48, 72],
-            labels=["0-1year", "1-2years", "2-4years", "4-6years"],
+            bins=TENURE_BINS,
+            labels=TENURE_LABELS,
         )
         df["charges_ratio"] = df["TotalCharges"] / (df["MonthlyCharges"] + 1)
         df["avg_monthly_charges"] = df["TotalCharges"] / (df["tenure"] + 1)
 
-        service_columns = [
-            "PhoneService", "MultipleLines", "InternetService",
-            "OnlineSecurity", "OnlineBackup", "DeviceProtection",
-            "TechSupport", "StreamingTV", "StreamingMovies",
-        ]
         df["total_services"] = sum(
             (df[col] == "Yes").astype(int)
-            for col in service_columns
+            for col in SERVICE_COLUMNS
             if col in df.columns
         )
         df["has_internet"] = (df["InternetService"] != "No").astype(int)
         df["has_phone"] = (df["PhoneService"] == "Yes").astype(int)
 
-        premium_services = ["OnlineSecurity", "OnlineBackup", "DeviceProtection", "TechSupport"]
         df["premium_services"] = sum(
             (df[col] == "Yes").astype(int)
-            for col in premium_services
+            for col in PREMIUM_SERVICE_COLUMNS
             if col in df.columns
         )
         df["streaming_services"] = sum(
             (df[col] == "Yes").astype(int)
-            for col in ["StreamingTV", "StreamingMovies"]
+            for col in STREAMING_COLUMNS
             if col in df.columns
         )
         df["has_family"] = (
@@ -66,41 +131,35 @@ class TelcoPreprocessor:
         df["is_senior_with_family"] = (
             (df["SeniorCitizen"] == "Yes") & (df["has_family"] == 1)
         ).astype(int)
-        df["auto_payment"] = df["PaymentMethod"].isin(
-            ["Bank transfer (automatic)", "Credit card (automatic)"]
-        ).astype(int)
+        df["auto_payment"] = df["PaymentMethod"].isin(AUTO_PAYMENT_METHODS).astype(int)
         df["monthly_charges_per_service"] = df["MonthlyCharges"] / (df["total_services"] + 1)
 
         logger.info("Feature engineering complete: shape=%s", df.shape)
         return df
 
-    def encode_features(self, df: pd.DataFrame, fit: bool = True) -> pd.DataFrame:
-        df = df.copy()
-        target: pd.Series | None = None
-        if "Churn" in df.columns:
-            target = df["Churn"].copy()
-            df = df.drop("Churn", axis=1)
+    @profiled_stage("encode")
+    def encode_features(
+        self, df: pd.DataFrame, fit: bool = True, inplace: bool = False
+    ) -> pd.DataFrame:
+        if not inplace:
+            df = df.copy()
+        # ``del`` and ``pop`` unlink columns without copying the rest of the frame.
+        target = df.pop("Churn") if "Churn" in df.columns else None
 
-        for col in ["Partner", "Dependents", "PhoneService", "PaperlessBilling", "SeniorCitizen"]:
+        for col in [*YES_NO_COLUMNS, "SeniorCitizen", *SERVICE_FLAG_COLUMNS]:
             if col in df.columns:
                 df[col] = (df[col] == "Yes").astype(int)
 
-        for col in ["MultipleLines", "OnlineSecurity", "OnlineBackup",
-                    "DeviceProtection", "TechSupport", "StreamingTV", "StreamingMovies"]:
-            if col in df.columns:
-                df[col] = df[col].replace(
-                    {"No phone service": "No", "No internet service": "No"}
-                )
-                df[col] = (df[col] == "Yes").astype(int)
-
-        ohe_cols = ["gender", "InternetService", "Contract", "PaymentMethod"]
-        if "tenure_group" in df.columns:
-            ohe_cols.append("tenure_group")
-        for col in ohe_cols:
-            if col in df.columns:
-                dummies = pd.get_dummies(df[col], prefix=col, drop_first=True)
-                df = pd.concat([df, dummies], axis=1)
-                df = df.drop(col, axis=1)
+        ohe_cols = [c for c in [*ONE_HOT_COLUMNS, "tenure_group"] if c in df.columns]
+        if fit:
+            self.categories = {col: _category_levels(df[col]) for col in ohe_cols}
+        elif not self.categories:
+            raise ValueError("Category vocabulary not fitted. Call prepare_features first.")
+        if ohe_cols:
+            dummies = self._one_hot(df, ohe_cols)
+            for col in ohe_cols:
+                del df[col]
+            df[list(dummies.columns)] = dummies
 
         if target is not None:
             df["Churn"] = (target == "Yes").astype(int)
@@ -108,45 +167,104 @@ class TelcoPreprocessor:
         logger.info("Encoding complete: shape=%s", df.shape)
         return df
 
-    def scale_features(self, df: pd.DataFrame, fit: bool = True) -> pd.DataFrame:
-        df = df.copy()
-        target: pd.Series | None = None
-        if "Churn" in df.columns:
-            target = df["Churn"]
-            df = df.drop("Churn", axis=1)
-
-        scale_cols = [
-            c for c in [
-                "tenure", "MonthlyCharges", "TotalCharges",
-                "charges_ratio", "avg_monthly_charges", "monthly_charges_per_service",
-            ]
-            if c in df.columns
-        ]
-        if fit:
-            df[scale_cols] = self.scaler.fit_transform(df[scale_cols])
-        else:
-            df[scale_cols] = self.scaler.transform(df[scale_cols])
+    def _one_hot(self, df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+        """Encode ``columns`` against the fitted vocabulary, dropping each baseline level."""
+        names = [f"{col}_{level}" for col in columns for level in self.categories[col][1:]]
+        encoded = np.zeros((len(df), len(names)), dtype=bool)
+        rows = np.arange(len(df))
+        offset = 0
+        for col in columns:
+            levels = self.categories[col]
+            codes = pd.Categorical(df[col], categories=levels).codes
+            unknown = (codes == -1) & df[col].notna().to_numpy()
+            if unknown.any():
+                values = sorted(map(str, pd.unique(df[col][unknown])))
+                if self.handle_unknown == "error":
+                    raise ValueError(f"Unknown categories for {col}: {values}")
+                logger.warning(
+                    "Ignoring %d rows with unknown %s categories: %s", unknown.sum(), col, values
+                )
+            hit = codes > 0
+            encoded[rows[hit], offset + codes[hit] - 1] = True
+            offset += len(levels) - 1
+        return pd.DataFrame(encoded, columns=names, index=df.index)
 
-        if target is not None:
-            df["Churn"] = target
+    @profiled_stage("scale")
+    def scale_features(
+        self, df: pd.DataFrame, fit: bool = True, inplace: bool = False
+    ) -> pd.DataFrame:
+        if not inplace:
+            df = df.copy()
+        scale_cols = [c for c in SCALE_COLUMNS if c in df.columns]
+        scaled = (
+            self.scaler.fit_transform(df[scale_cols]) if fit
+            else self.scaler.transform(df[scale_cols])
+        )
+        # Replace whole columns, so input buffers (possibly read-only) are never written.
+        for i, col in enumerate(scale_cols):
+            df[col] = scaled[:, i]
         return df
 
+    def reset(self) -> "TelcoPreprocessor":
+        """Forget everything fitted, keeping the options; ``partial_fit`` then starts over."""
+        self.scaler = clone(self.scaler)
+        self.categories = {}
+        self.feature_names = []
+        self.is_fitted = False
+        return self
+
+    def partial_fit(self, df: pd.DataFrame, inplace: bool = False) -> "TelcoPreprocessor":
+        """Update the category vocabulary and scaler statistics from one raw chunk.
+
+        Once every chunk of a file has been seen, ``prepare_features(chunk, fit=False)``
+        transforms each chunk as a single ``fit`` on the whole file would, up to float
+        rounding of the scaler statistics. ``feature_names`` is set by the first transform.
+        """
+        df = self.engineer_features(self.clean_data(df, inplace=inplace), inplace=True)
+        for col in [*ONE_HOT_COLUMNS, "tenure_group"]:
+            if col in df.columns:
+                # Sorted, as the loader's categorical columns are when read in one go.
+                seen = set(self.categories.get(col, [])) | set(_category_levels(df[col]))
+                self.categories[col] = sorted(seen)
+        self.scaler.partial_fit(df[[c for c in SCALE_COLUMNS if c in df.columns]])
+        self.is_fitted = True
+        return self
+
     def prepare_features(
-        self, df: pd.DataFrame, fit: bool = True
-    ) -> tuple[pd.DataFrame, pd.Series | None, list[str]]:
-        df = self.clean_data(df)
-        df = self.engineer_features(df)
-        df = self.encode_features(df, fit=fit)
-        df = self.scale_features(df, fit=fit)
-
-        y: pd.Series | None = None
-        if "Churn" in df.columns:
+        self, df: pd.DataFrame, fit: bool = True, start: str = "raw", inplace: bool = False
+    ) -> tuple[FeatureMatrix, pd.Series | None, list[str]]:
+        """Run the pipeline from ``start``: raw data, an engineered frame or an encoded one.
+
+        Starting from ``"encoded"`` with ``fit=True`` expects ``self.categories`` to be set
+        already, since the vocabulary is learned by ``encode_features``.
+
+        ``inplace=True`` consumes ``df``: the stages modify it instead of each copying
+        it first, and only the one-hot block and replaced columns are allocated. ``X`` is
+        the same as without it.
+        """
+        if start not in STAGES:
+            raise ValueError(f"Unknown start stage: {start}")
+        if start == "raw":
+            df = self.clean_data(df, inplace=inplace)
+            df = self.engineer_features(df, inplace=inplace)
+        if start != "encoded":
+            df = self.encode_features(df, fit=fit, inplace=inplace)
+        elif not self.categories:
+            raise ValueError("Category vocabulary not fitted. Call prepare_features first.")
+        df = self.scale_features(df, fit=fit, inplace=inplace)
+
+        y = df["Churn"] if "Churn" in df.columns else None
+        self.feature_names = [c for c in df.columns if c != "Churn"]
+        X: FeatureMatrix
+        if self.output == "array":
+            X = to_matrix(df, self.feature_names, self.dtype, self.order)
+        elif y is not None and inplace:
+            del df["Churn"]
+            X = df
+        elif y is not None:
             X = df.drop("Churn", axis=1)
-            y = df["Churn"]
         else:
             X = df
-
-        self.feature_names = list(X.columns)
         self.is_fitted = True
         logger.info("Preprocessing complete: features=%d", len(self.feature_names))
         return X, y, self.feature_names
@@ -163,3 +281,9 @@ class TelcoPreprocessor:
         preprocessor: TelcoPreprocessor = joblib.load(path)
         logger.info("Preprocessor loaded: path=%s", path)
         return preprocessor
+
+
+def _category_levels(series: pd.Series) -> list[str]:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return list(series.cat.categories)
+    return sorted(series.dropna().unique().tolist())
@@ -0,0 +1,228 @@
+"""Per-stage profiling of ``TelcoPreprocessor``.
+
+Stages run inside ``profile_preprocessing()`` record wall time, the peak memory they
+allocate and the bytes they copy; outside it the stage hooks reduce to a context
+variable lookup. A profile can also wrap the whole run in cProfile or pyinstrument,
+and writes its stages as a Chrome trace (``chrome://tracing`` or Perfetto).
+"""
+
+import contextvars
+import cProfile
+import functools
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROFILERS: tuple[str, ...] = ("cprofile", "pyinstrument")
+
+_ACTIVE: contextvars.ContextVar["PreprocessingProfile | None"] = contextvars.ContextVar(
+    "preprocessing_profile", default=None
+)
+
+F = TypeVar("F", bound=Callable[..., pd.DataFrame])
+
+
+@dataclass
+class StageProfile:
+    stage: str
+    seconds: float
+    rows: int
+    bytes_out: int
+    bytes_copied: int
+    peak_memory_bytes: int | None = None
+    started_at: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _buffers(df: pd.DataFrame) -> list[np.ndarray]:
+    arrays: list[np.ndarray] = []
+    for _, series in df.items():
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            arrays.append(np.asarray(series.cat.codes.array))
+        elif isinstance(series.dtype, np.dtype):
+            arrays.append(series.to_numpy(copy=False))
+    return arrays
+
+
+def copied_bytes(before: pd.DataFrame, after: pd.DataFrame) -> int:
+    """Bytes of ``after``'s column buffers that share no memory with ``before``.
+
+    Shallow: an object column counts its pointer array, not the strings it points to.
+    """
+    return _copied_from(_buffers(before), after)
+
+
+def _copied_from(sources: list[np.ndarray], after: pd.DataFrame) -> int:
+    return sum(
+        array.nbytes
+        for array in _buffers(after)
+        if not any(np.may_share_memory(array, source) for source in sources)
+    )
+
+
+@dataclass
+class PreprocessingProfile:
+    """Stage timings of one profiled run; see ``profile_preprocessing``."""
+
+    memory: bool = True
+    profiler: str | None = None
+    stages: list[StageProfile] = field(default_factory=list)
+    _origin: float = field(default=0.0, repr=False)
+    _profiler: Any = field(default=None, repr=False)
+    _started_tracing: bool = field(default=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.profiler is not None and self.profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler: {self.profiler}")
+
+    def start(self) -> None:
+        self._origin = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.profiler == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profiler == "pyinstrument":
+            from pyinstrument import Profiler
+
+            self._profiler = Profiler()
+            self._profiler.start()
+
+    def stop(self) -> None:
+        if self.profiler == "cprofile":
+            self._profiler.disable()
+        elif self.profiler == "pyinstrument":
+            self._profiler.stop()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def run_stage(
+        self, stage: str, method: Callable[..., pd.DataFrame], df: pd.DataFrame,
+        *args: Any, **kwargs: Any,
+    ) -> pd.DataFrame:
+        # Taken before the stage runs: an in-place stage replaces ``df``'s columns, and
+        # holding the old buffers keeps their memory from being reused meanwhile.
+        sources = _buffers(df)
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        result = method(df, *args, **kwargs)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - baseline if tracing else None
+        profile = StageProfile(
+            stage=stage,
+            seconds=seconds,
+            rows=len(result),
+            bytes_out=int(result.memory_usage(index=False, deep=False).sum()),
+            bytes_copied=_copied_from(sources, result),
+            peak_memory_bytes=peak,
+            started_at=start - self._origin,
+        )
+        with self._lock:
+            self.stages.append(profile)
+        return result
+
+    def summary(self) -> str:
+        mb = 1024**2
+        lines = [f"{'stage':<10} {'seconds':>9} {'rows':>9} {'copied MB':>10} {'peak MB':>9}"]
+        for s in self.stages:
+            peak = "-" if s.peak_memory_bytes is None else f"{s.peak_memory_bytes / mb:.1f}"
+            lines.append(
+                f"{s.stage:<10} {s.seconds:9.4f} {s.rows:9d} {s.bytes_copied / mb:10.1f} {peak:>9}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        hidden = ("stage", "started_at")
+        return {
+            "traceEvents": [
+                {
+                    "name": s.stage,
+                    "cat": "preprocessing",
+                    "ph": "X",
+                    "ts": s.started_at * 1e6,
+                    "dur": s.seconds * 1e6,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": {k: v for k, v in s.to_dict().items() if k not in hidden},
+                }
+                for s in self.stages
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def save(self, output_dir: str | Path) -> list[Path]:
+        """Write the Chrome trace, and the profiler report if one ran; returns the paths."""
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        paths = [out / "preprocessing_trace.json"]
+        with open(paths[0], "w") as f:
+            json.dump(self.chrome_trace(), f, indent=2)
+        if self.profiler == "cprofile":
+            paths.append(out / "preprocessing.prof")
+            pstats.Stats(self._profiler).dump_stats(paths[-1])
+        elif self.profiler == "pyinstrument":
+            paths.append(out / "preprocessing.html")
+            paths[-1].write_text(self._profiler.output_html())
+        logger.info("Preprocessing profile saved: %s", ", ".join(map(str, paths)))
+        return paths
+
+
+@contextmanager
+def profile_preprocessing(
+    memory: bool = True, profiler: str | None = None
+) -> Iterator[PreprocessingProfile]:
+    """Profile every ``TelcoPreprocessor`` stage run in this context.
+
+    ``memory`` traces allocations with tracemalloc, which slows pure-Python code
+    noticeably; ``profiler`` (``"cprofile"`` or ``"pyinstrument"``) also profiles
+    everything else that runs in the context.
+    """
+    profile = PreprocessingProfile(memory=memory, profiler=profiler)
+    token = _ACTIVE.set(profile)
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _ACTIVE.reset(token)
+
+
+def profiled_stage(stage: str) -> Callable[[F], F]:
+    """Route a ``(self, df, ...)`` preprocessing method through the active profile."""
+
+    def decorate(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self: Any, df: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
+            profile = _ACTIVE.get()
+            if profile is None:
+                return method(self, df, *args, **kwargs)
+            return profile.run_stage(
+                stage, functools.partial(method, self), df, *args, **kwargs
+            )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -0,0 +1,30 @@
+YES_NO_COLUMNS: list[str] = ["Partner", "Dependents", "PhoneService", "PaperlessBilling"]
+
+SERVICE_FLAG_COLUMNS: list[str] = [
+    "MultipleLines", "OnlineSecurity", "OnlineBackup",
+    "DeviceProtection", "TechSupport", "StreamingTV", "StreamingMovies",
+]
+
+SERVICE_COLUMNS: list[str] = [
+    "PhoneService", "MultipleLines", "InternetService",
+    "OnlineSecurity", "OnlineBackup", "DeviceProtection",
+    "TechSupport", "StreamingTV", "StreamingMovies",
+]
+
+PREMIUM_SERVICE_COLUMNS: list[str] = [
+    "OnlineSecurity", "OnlineBackup", "DeviceProtection", "TechSupport",
+]
+
+STREAMING_COLUMNS: list[str] = ["StreamingTV", "StreamingMovies"]
+
+AUTO_PAYMENT_METHODS: list[str] = ["Bank transfer (automatic)", "Credit card (automatic)"]
+
+ONE_HOT_COLUMNS: list[str] = ["gender", "InternetService", "Contract", "PaymentMethod"]
+
+TENURE_BINS: list[int] = [0, 12, 24, 48, 72]
+TENURE_LABELS: list[str] = ["0-1year", "1-2years", "2-4years", "4-6years"]
+
+SCALE_COLUMNS: list[str] = [
+    "tenure", "MonthlyCharges", "TotalCharges",
+    "charges_ratio", "avg_monthly_charges", "monthly_charges_per_service",
+]
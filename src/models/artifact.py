@@ -0,0 +1,238 @@
+"""Pickle-free production artifact: native booster file plus JSON preprocessing constants.
+
+Layout of an artifact directory::
+
+    manifest.json   format version, backend, threshold, metadata, feature map constants
+    model.ubj       XGBoost booster (UBJSON)       | backend "xgboost"
+    model.txt       LightGBM booster (text)        | backend "lightgbm"
+    linear.npz      coefficients and intercept     | backend "linear"
+    model.onnx      ONNX graph                     | backend "onnx"
+    model.tl        Treelite checkpoint            | backend "treelite"
+
+The last two hold a runtime compiled by ``ProductionChurnModel.use_runtime``.
+
+Loading never unpickles: boosters are read by their own libraries and ``.npz`` files
+with ``allow_pickle=False``. This module imports neither pandas nor joblib.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.features.compiled import CompiledFeatureMap
+from src.models.runtime import CompiledRuntime, RuntimeBackend, two_column_proba
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+class XGBoostBackend:
+    file_name = "model.ubj"
+
+    def __init__(self, path: Path, threads: int = 1) -> None:
+        import xgboost
+
+        self.booster = xgboost.Booster(model_file=str(path))
+        if threads > 0:
+            self.booster.set_param({"nthread": threads})
+
+    @staticmethod
+    def export(model: Any, path: Path) -> None:
+        model.get_booster().save_model(str(path))
+
+    def predict_proba(self, X: NDArray[np.float64]) -> NDArray[np.float64]:
+        return two_column_proba(self.booster.inplace_predict(X, validate_features=False))
+
+
+class LightGBMBackend:
+    file_name = "model.txt"
+
+    def __init__(self, path: Path, threads: int = 1) -> None:
+        import lightgbm
+
+        self.booster = lightgbm.Booster(model_file=str(path))
+        self.threads = threads
+
+    @staticmethod
+    def export(model: Any, path: Path) -> None:
+        model.booster_.save_model(str(path))
+
+    def predict_proba(self, X: NDArray[np.float64]) -> NDArray[np.float64]:
+        return two_column_proba(self.booster.predict(X, num_threads=self.threads))
+
+
+class LinearBackend:
+    """Binary logistic model scored as ``sigmoid(X @ coef + intercept)``."""
+
+    file_name = "linear.npz"
+
+    def __init__(self, path: Path, threads: int = 1) -> None:
+        with np.load(path, allow_pickle=False) as data:
+            self.coef = np.asarray(data["coef"], dtype=np.float64)
+            self.intercept = float(data["intercept"])
+
+    @staticmethod
+    def export(model: Any, path: Path) -> None:
+        np.savez(path, coef=model.coef_.ravel(), intercept=model.intercept_[0])
+
+    def predict_proba(self, X: NDArray[np.float64]) -> NDArray[np.float64]:
+        return two_column_proba(1.0 / (1.0 + np.exp(-(X @ self.coef + self.intercept))))
+
+
+BACKENDS: dict[str, type[XGBoostBackend] | type[LightGBMBackend] | type[LinearBackend]] = {
+    "xgboost": XGBoostBackend,
+    "lightgbm": LightGBMBackend,
+    "linear": LinearBackend,
+}
+
+RUNTIME_FILES: dict[str, str] = {"onnx": "model.onnx", "treelite": "model.tl"}
+
+
+def backend_for(model: Any) -> str:
+    """Native artifact backend for a fitted estimator, by class name."""
+    name = type(model).__name__
+    if name == "XGBClassifier":
+        return "xgboost"
+    if name == "LGBMClassifier":
+        return "lightgbm"
+    logistic = name == "LogisticRegression" or (
+        name == "SGDClassifier" and model.loss == "log_loss"
+    )
+    if logistic and len(getattr(model, "classes_", [])) == 2:
+        return "linear"
+    raise ValueError(f"No lean artifact format for {name}; save it with the pickle format")
+
+
+def format_results(proba: NDArray[np.float64], threshold: float) -> list[dict[str, Any]]:
+    churn = proba[:, 1]
+    predictions = (churn >= threshold).astype(int)
+    confidence = np.abs(churn - threshold) / (1 - threshold)
+    return [
+        {
+            "churn_prediction": int(predictions[i]),
+            "churn_probability": float(churn[i]),
+            "no_churn_probability": float(proba[i, 0]),
+            "confidence": float(confidence[i]),
+        }
+        for i in range(len(churn))
+    ]
+
+
+class LeanChurnModel:
+    """Serving-only counterpart of ``ProductionChurnModel`` loaded from an artifact."""
+
+    def __init__(
+        self,
+        backend: RuntimeBackend,
+        feature_map: CompiledFeatureMap,
+        threshold: float,
+        metadata: dict[str, Any],
+    ) -> None:
+        self.backend = backend
+        self.feature_map = feature_map
+        self.threshold = threshold
+        self.metadata = metadata
+        # Same hook as ``ProductionChurnModel.stage_observer``: "features" and "predict".
+        self.stage_observer: Callable[[str, float], None] | None = None
+
+    def _timed(self, stage: str, fn: Callable[..., Any], *args: Any) -> Any:
+        observer = self.stage_observer
+        if observer is None:
+            return fn(*args)
+        start = time.perf_counter()
+        result = fn(*args)
+        observer(stage, time.perf_counter() - start)
+        return result
+
+    def predict_proba(self, X: NDArray[np.float64]) -> NDArray[np.float64]:
+        result: NDArray[np.float64] = self._timed(
+            "predict", self.backend.predict_proba, np.asarray(X, dtype=np.float64)
+        )
+        return result
+
+    def predict(self, X: NDArray[np.float64]) -> NDArray[np.int_]:
+        return (self.predict_proba(X)[:, 1] >= self.threshold).astype(int)
+
+    def predict_single(self, customer_data: Mapping[str, Any]) -> dict[str, Any]:
+        features = self._timed("features", self.feature_map.transform_one, customer_data)
+        return format_results(self.predict_proba(features.reshape(1, -1)), self.threshold)[0]
+
+    def predict_many(self, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not records:
+            return []
+        features = self._timed("features", self.feature_map.transform_many, records)
+        return format_results(self.predict_proba(features), self.threshold)
+
+    def get_feature_importance(self, top_n: int = 10) -> dict[str, float]:
+        importance: dict[str, float] = self.metadata.get("feature_importance", {})
+        return dict(list(importance.items())[:top_n])
+
+
+def export_artifact(
+    model: Any,
+    feature_map: CompiledFeatureMap,
+    threshold: float,
+    metadata: dict[str, Any],
+    path: str,
+    runtime: CompiledRuntime | None = None,
+) -> None:
+    """Write ``runtime``'s payload if given, else the estimator's native format."""
+    backend = runtime.kind if runtime is not None else backend_for(model)
+    out_dir = Path(path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest: dict[str, Any] = {"version": ARTIFACT_VERSION, "backend": backend}
+    if runtime is not None:
+        manifest["model_file"] = RUNTIME_FILES[backend]
+        manifest["input_dtype"] = runtime.input_dtype
+        (out_dir / RUNTIME_FILES[backend]).write_bytes(runtime.payload)
+    else:
+        backend_cls = BACKENDS[backend]
+        manifest["model_file"] = backend_cls.file_name
+        backend_cls.export(model, out_dir / backend_cls.file_name)
+    manifest.update({
+        "threshold": threshold,
+        "metadata": metadata,
+        "feature_map": feature_map.to_dict(),
+    })
+    with open(out_dir / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=4, default=str)
+    logger.info("Lean artifact saved: path=%s, backend=%s", path, backend)
+
+
+def is_artifact(path: str) -> bool:
+    return (Path(path) / MANIFEST_NAME).is_file()
+
+
+def load_artifact(path: str, threads: int = 1) -> LeanChurnModel:
+    artifact_dir = Path(path)
+    with open(artifact_dir / MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported artifact version: {manifest.get('version')}")
+    backend_name = manifest["backend"]
+    backend: RuntimeBackend
+    if backend_name in RUNTIME_FILES:
+        payload = (artifact_dir / RUNTIME_FILES[backend_name]).read_bytes()
+        runtime = CompiledRuntime(backend_name, payload, manifest["input_dtype"])
+        backend = runtime.backend(threads)
+    elif backend_name in BACKENDS:
+        backend_cls = BACKENDS[backend_name]
+        backend = backend_cls(artifact_dir / backend_cls.file_name, threads)
+    else:
+        raise ValueError(f"Unknown artifact backend: {backend_name}")
+    model = LeanChurnModel(
+        backend,
+        CompiledFeatureMap.from_dict(manifest["feature_map"]),
+        float(manifest["threshold"]),
+        manifest["metadata"],
+    )
+    logger.info("Lean artifact loaded: path=%s, backend=%s", path, backend_name)
+    return model
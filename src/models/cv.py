@@ -0,0 +1,163 @@
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from numpy.typing import NDArray
+from sklearn.base import clone
+from sklearn.metrics import (
+    accuracy_score,
+    average_precision_score,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+from sklearn.model_selection import StratifiedKFold
+
+from src.evaluation.thresholds import CostMatrix, threshold_curve
+from src.features.matrix import FeatureMatrix, take_rows
+from src.models.resampling import ResamplingCache
+
+logger = logging.getLogger(__name__)
+
+# Each metric reads either the hard predictions ("pred") or the ranking scores ("score").
+METRICS: dict[str, tuple[str, Callable[..., float]]] = {
+    "f1": ("pred", f1_score),
+    "precision": ("pred", precision_score),
+    "recall": ("pred", recall_score),
+    "accuracy": ("pred", accuracy_score),
+    "roc_auc": ("score", roc_auc_score),
+    "average_precision": ("score", average_precision_score),
+}
+
+
+@dataclass
+class FoldResult:
+    fold: int
+    val_index: NDArray[np.intp]
+    y_true: NDArray[Any]
+    y_pred: NDArray[Any]
+    y_prob: NDArray[np.float64]
+    y_score: NDArray[np.float64]
+    model: Any = None
+
+
+@dataclass
+class CrossValidationResult:
+    """Cached out-of-fold predictions; every metric is derived without refitting."""
+
+    folds: list[FoldResult] = field(default_factory=list)
+    n_samples: int = 0
+
+    def scores(self, metric: str) -> NDArray[np.float64]:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown CV metric: {metric}")
+        source, fn = METRICS[metric]
+        return np.array([
+            fn(f.y_true, f.y_pred if source == "pred" else f.y_score) for f in self.folds
+        ])
+
+    def summary(self, metrics: Iterable[str] = ("f1", "roc_auc")) -> dict[str, float]:
+        scores = {m: self.scores(m) for m in metrics}
+        return {
+            f"{m}_mean": float(v.mean()) for m, v in scores.items()
+        } | {
+            f"{m}_std": float(v.std()) for m, v in scores.items()
+        }
+
+    def oof_probabilities(self) -> NDArray[np.float64]:
+        oof = np.full(self.n_samples, np.nan)
+        for f in self.folds:
+            oof[f.val_index] = f.y_prob
+        return oof
+
+    def oof_labels(self) -> NDArray[Any]:
+        labels = np.zeros(self.n_samples, dtype=self.folds[0].y_true.dtype)
+        for f in self.folds:
+            labels[f.val_index] = f.y_true
+        return labels
+
+    def optimal_threshold(
+        self, objective: str = "f1", beta: float = 1.0, costs: CostMatrix | None = None
+    ) -> tuple[float, float]:
+        """Threshold optimising ``objective`` over the out-of-fold probabilities.
+
+        Searched over every distinct probability, like the evaluator's; see
+        ``ThresholdCurve.best``.
+        """
+        curve = threshold_curve(self.oof_labels(), self.oof_probabilities())
+        return curve.best(objective, beta=beta, costs=costs)
+
+
+def _ranking_scores(model: Any, X: FeatureMatrix, y_prob: NDArray[np.float64]) -> Any:
+    # Matches sklearn's roc_auc scorer, which prefers decision_function when available;
+    # the sigmoid in predict_proba can collapse distinct scores into ties.
+    if hasattr(model, "decision_function"):
+        return model.decision_function(X)
+    return y_prob
+
+
+def _fit_fold(
+    model: Any,
+    X_train: FeatureMatrix,
+    y_train: pd.Series,
+    X_val: FeatureMatrix,
+    y_val: pd.Series,
+    fold: int,
+    val_index: NDArray[np.intp],
+    keep_model: bool,
+) -> FoldResult:
+    estimator = clone(model)
+    estimator.fit(X_train, y_train)
+    y_prob = estimator.predict_proba(X_val)[:, 1]
+    return FoldResult(
+        fold=fold,
+        val_index=val_index,
+        y_true=y_val.to_numpy(),
+        # What ``predict`` returns for a binary classifier, without scoring the fold again.
+        y_pred=estimator.classes_[(y_prob > 0.5).astype(int)],
+        y_prob=y_prob,
+        y_score=_ranking_scores(estimator, X_val, y_prob),
+        model=estimator if keep_model else None,
+    )
+
+
+def fold_indices(
+    X: FeatureMatrix, y: pd.Series, cv: int = 5, random_state: int = 42
+) -> list[tuple[NDArray[np.intp], NDArray[np.intp]]]:
+    skf = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    return list(skf.split(X, y))
+
+
+def cross_validate(
+    model: Any,
+    X: FeatureMatrix,
+    y: pd.Series,
+    cv: int = 5,
+    random_state: int = 42,
+    n_jobs: int = 1,
+    keep_models: bool = False,
+    resampler: ResamplingCache | None = None,
+) -> CrossValidationResult:
+    """Fit ``model`` once per stratified fold, optionally with folds in parallel.
+
+    With a ``resampler`` each fold's training rows are resampled (through its cache)
+    before fitting; validation rows are never resampled.
+    """
+    splits = fold_indices(X, y, cv, random_state)
+    if resampler is not None:
+        train_sets = resampler.resample_folds(X, y, splits)
+    else:
+        train_sets = [(take_rows(X, train), y.iloc[train]) for train, _ in splits]
+    folds: list[FoldResult] = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_fold)(
+            model, X_train, y_train, take_rows(X, val), y.iloc[val], i, val, keep_models
+        )
+        for i, ((X_train, y_train), (_, val)) in enumerate(zip(train_sets, splits, strict=True))
+    )
+    logger.info("Cross-validated %s: folds=%d", type(model).__name__, len(folds))
+    return CrossValidationResult(folds=folds, n_samples=len(X))
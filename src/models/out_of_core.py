@@ -0,0 +1,318 @@
+"""Out-of-core training on feature chunks streamed from the raw file.
+
+The feature matrix never exists in memory. One pass over the file fits the
+preprocessor with ``partial_fit``; every model then re-reads and transforms the file
+chunk by chunk:
+
+- SGD logistic regression with ``partial_fit``, once per chunk and epoch;
+- XGBoost from a ``DataIter``, into a ``QuantileDMatrix`` or, with a cache directory,
+  an external-memory ``DMatrix`` paged to disk;
+- LightGBM from a ``Dataset`` built over a ``lightgbm.Sequence`` of the chunks.
+
+What stays resident beyond a chunk is per row and small: the training labels, and the
+boosters' quantised features (a byte or so per value) unless XGBoost pages them out.
+"""
+
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import lightgbm
+import numpy as np
+import pandas as pd
+import xgboost
+from lightgbm import LGBMClassifier
+from numpy.typing import NDArray
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import LabelEncoder
+from xgboost import XGBClassifier
+
+from src.data.loader import TelcoDataLoader
+from src.evaluation.metrics import MetricsAccumulator
+from src.evaluation.thresholds import ThresholdCurve
+from src.features.matrix import FeatureMatrix, take_rows
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.trainer import ChurnModelTrainer
+
+logger = logging.getLogger(__name__)
+
+
+def holdout_mask(start: int, n_rows: int, test_size: float, random_state: int) -> NDArray[np.bool_]:
+    """Which of the file's rows ``start .. start + n_rows`` belong to the holdout.
+
+    Decided by a hash of each row's position and the seed, so the split is the same
+    whatever the chunk size. It is random rather than stratified.
+    """
+    positions = np.arange(start, start + n_rows, dtype=np.uint64)
+    keys = pd.util.hash_array(positions ^ np.uint64(random_state * 0x9E3779B97F4A7C15 % 2**64))
+    holdout: NDArray[np.bool_] = keys < np.uint64(test_size * 2**64)
+    return holdout
+
+
+class FeatureChunks:
+    """The raw file as preprocessed ``(X, y)`` chunks, split into training and holdout rows.
+
+    ``fit`` makes one pass over every row, holdout included as with ``load_features``,
+    to fit ``preprocessor`` incrementally. ``iter_train`` and ``iter_test`` then re-read
+    the file on each call, so only one chunk is in memory at a time.
+    """
+
+    def __init__(
+        self,
+        loader: TelcoDataLoader,
+        preprocessor: TelcoPreprocessor,
+        chunksize: int = 100_000,
+        test_size: float = 0.2,
+        random_state: int = 42,
+    ) -> None:
+        self.loader = loader
+        self.preprocessor = preprocessor
+        self.chunksize = chunksize
+        self.test_size = test_size
+        self.random_state = random_state
+        self.train_labels: NDArray[np.int8] = np.empty(0, dtype=np.int8)
+        self.n_test = 0
+
+    def _split(self) -> Iterator[tuple[pd.DataFrame, NDArray[np.bool_]]]:
+        start = 0
+        for chunk in self.loader.iter_chunks(self.chunksize):
+            yield chunk, holdout_mask(start, len(chunk), self.test_size, self.random_state)
+            start += len(chunk)
+
+    def fit(self) -> "FeatureChunks":
+        # A second fit starts over instead of merging into the previous statistics.
+        self.preprocessor.reset()
+        self.n_test = 0
+        labels = []
+        for chunk, holdout in self._split():
+            labels.append((chunk["Churn"] == "Yes").to_numpy(dtype=np.int8)[~holdout])
+            self.n_test += int(holdout.sum())
+            self.preprocessor.partial_fit(chunk, inplace=True)
+        self.train_labels = np.concatenate(labels)
+        logger.info(
+            "Fitted preprocessor in chunks — train: %d, test: %d, train_churn_rate: %.2f%%",
+            len(self.train_labels), self.n_test, float(self.train_labels.mean()) * 100,
+        )
+        return self
+
+    def class_counts(self) -> NDArray[np.intp]:
+        """Training rows per class; ``ValueError`` unless both classes are present."""
+        counts = np.bincount(self.train_labels, minlength=2)
+        if not counts.all():
+            raise ValueError(
+                f"Training rows must contain both classes, got counts {counts.tolist()}"
+            )
+        return counts
+
+    def _iter(self, holdout: bool) -> Iterator[tuple[FeatureMatrix, pd.Series]]:
+        if not self.preprocessor.is_fitted:
+            raise ValueError("Preprocessor not fitted. Call fit() first.")
+        for chunk, mask in self._split():
+            rows = np.flatnonzero(mask if holdout else ~mask)
+            if len(rows) == 0:
+                continue
+            # take, unlike a boolean mask, returns a frame the stages may modify in place.
+            subset = chunk if len(rows) == len(chunk) else chunk.take(rows)
+            X, y, _ = self.preprocessor.prepare_features(subset, fit=False, inplace=True)
+            assert y is not None
+            yield X, y
+
+    def iter_train(self) -> Iterator[tuple[FeatureMatrix, pd.Series]]:
+        return self._iter(holdout=False)
+
+    def iter_test(self) -> Iterator[tuple[FeatureMatrix, pd.Series]]:
+        return self._iter(holdout=True)
+
+
+def _as_array(X: FeatureMatrix) -> NDArray[np.floating[Any]]:
+    return X if isinstance(X, np.ndarray) else X.to_numpy(dtype=np.float64)
+
+
+class _XGBoostChunks(xgboost.DataIter):
+    def __init__(self, data: FeatureChunks, cache_prefix: str | None = None) -> None:
+        self._data = data
+        self._chunks: Iterator[tuple[FeatureMatrix, pd.Series]] | None = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Any) -> int:
+        if self._chunks is None:
+            self._chunks = self._data.iter_train()
+        batch = next(self._chunks, None)
+        if batch is None:
+            return 0
+        X, y = batch
+        input_data(data=_as_array(X), label=y.to_numpy())
+        return 1
+
+    def reset(self) -> None:
+        self._chunks = None
+
+
+class _LightGBMChunks(lightgbm.Sequence):
+    """Training rows for ``lightgbm.Dataset``, read forward from the chunk stream.
+
+    Dataset construction reads rows in increasing order, once to sample bin edges and
+    once to push every row, so holding the current chunk is enough; a read behind it
+    restarts the stream.
+    """
+
+    def __init__(self, data: FeatureChunks) -> None:
+        self._data = data
+        self.batch_size = data.chunksize
+        self._chunks: Iterator[tuple[FeatureMatrix, pd.Series]] | None = None
+        self._start = self._stop = 0
+        self._X: NDArray[np.floating[Any]] = np.empty((0, 0))
+
+    def __len__(self) -> int:
+        return len(self._data.train_labels)
+
+    def _advance_to(self, row: int) -> None:
+        if self._chunks is None or row < self._start:
+            self._chunks, self._start, self._stop = self._data.iter_train(), 0, 0
+        while row >= self._stop:
+            X, _ = next(self._chunks)
+            self._X = _as_array(X)
+            self._start, self._stop = self._stop, self._stop + len(self._X)
+
+    def __getitem__(self, idx: int | slice | list[int]) -> NDArray[np.floating[Any]]:
+        if isinstance(idx, slice):
+            start, stop, _ = idx.indices(len(self))
+            pieces = []
+            while start < stop:
+                self._advance_to(start)
+                end = min(stop, self._stop)
+                pieces.append(self._X[start - self._start:end - self._start])
+                start = end
+            return pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+        if isinstance(idx, list):
+            return np.stack([self[i] for i in idx])
+        self._advance_to(idx)
+        # Single rows are only read to sample bin edges, which LightGBM needs as float64.
+        row: NDArray[np.floating[Any]] = self._X[idx - self._start].astype(np.float64)
+        return row
+
+
+def _lgbm_classifier(template: LGBMClassifier, booster: lightgbm.Booster) -> LGBMClassifier:
+    # LightGBM has no public way to wrap a trained Booster in its scikit-learn estimator;
+    # these are the attributes LGBMClassifier.fit sets for a binary target (lightgbm 4.3).
+    model = LGBMClassifier(**template.get_params())
+    model._Booster = booster
+    model._objective = "binary"
+    model._n_features = model._n_features_in = booster.num_feature()
+    model._le = LabelEncoder().fit([0, 1])
+    model._classes = model._le.classes_
+    model._n_classes = 2
+    model._class_map = {0: 0, 1: 1}
+    model.fitted_ = True
+    return model
+
+
+class OutOfCoreTrainer(ChurnModelTrainer):
+    """``ChurnModelTrainer`` for data read chunk by chunk through ``FeatureChunks``.
+
+    Only models that learn incrementally or from external memory are candidates. The
+    class imbalance is handled by weighting rather than SMOTE, which needs every
+    minority row in memory: balanced sample weights for SGD, ``scale_pos_weight`` for
+    the boosters. Holdout metrics are accumulated chunk by chunk, with scores rounded
+    to ``metrics_resolution`` to bound the memory of the ranking metrics.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        sgd_epochs: int = 5,
+        xgboost_cache_dir: str | None = None,
+        metrics_resolution: float | None = 1e-4,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.sgd_epochs = sgd_epochs
+        self.xgboost_cache_dir = xgboost_cache_dir
+        self.metrics_resolution = metrics_resolution
+        self.curves: dict[str, ThresholdCurve] = {}
+
+    def get_models(self) -> dict[str, Any]:
+        models = super().get_models()
+        return {
+            "SGD Logistic Regression": SGDClassifier(
+                loss="log_loss", alpha=1e-3, average=True, random_state=self.random_state
+            ),
+            "XGBoost": models["XGBoost"],
+            "LightGBM": models["LightGBM"],
+        }
+
+    def fit_sgd(self, model: SGDClassifier, data: FeatureChunks) -> SGDClassifier:
+        counts = data.class_counts()
+        weights = len(data.train_labels) / (2 * counts)
+        rng = np.random.default_rng(self.random_state)
+        for _ in range(self.sgd_epochs):
+            for X, y in data.iter_train():
+                order = rng.permutation(len(y))
+                labels = y.to_numpy()[order]
+                model.partial_fit(
+                    take_rows(X, order), labels, classes=[0, 1], sample_weight=weights[labels]
+                )
+        return model
+
+    def fit_xgboost(self, model: XGBClassifier, data: FeatureChunks) -> XGBClassifier:
+        counts = data.class_counts()
+        params = {k: v for k, v in model.get_xgb_params().items() if v is not None}
+        params.update(tree_method="hist", scale_pos_weight=counts[0] / counts[1])
+        if self.xgboost_cache_dir is not None:
+            Path(self.xgboost_cache_dir).mkdir(parents=True, exist_ok=True)
+            cache_prefix = str(Path(self.xgboost_cache_dir) / "train")
+            dtrain = xgboost.DMatrix(_XGBoostChunks(data, cache_prefix))
+        else:
+            dtrain = xgboost.QuantileDMatrix(
+                _XGBoostChunks(data), max_bin=params.get("max_bin", 256)
+            )
+        booster = xgboost.train(params, dtrain, num_boost_round=model.n_estimators)
+        model.load_model(booster.save_raw("ubj"))
+        return model
+
+    def fit_lightgbm(self, model: LGBMClassifier, data: FeatureChunks) -> LGBMClassifier:
+        counts = data.class_counts()
+        params = model.get_params()
+        num_boost_round = params.pop("n_estimators")
+        for sklearn_only in ("class_weight", "importance_type"):
+            params.pop(sklearn_only)
+        params.update(objective="binary", scale_pos_weight=counts[0] / counts[1])
+        params = {k: v for k, v in params.items() if v is not None}
+        dataset = lightgbm.Dataset(_LightGBMChunks(data), label=data.train_labels, params=params)
+        booster = lightgbm.train(params, dataset, num_boost_round=num_boost_round)
+        return _lgbm_classifier(model, booster)
+
+    def evaluate_chunked(self, model: Any, data: FeatureChunks, model_name: str) -> dict[str, Any]:
+        accumulator = MetricsAccumulator(resolution=self.metrics_resolution)
+        for X, y in data.iter_test():
+            accumulator.update(y, model.predict_proba(X)[:, 1])
+        self.curves[model_name] = accumulator.curve()
+        result = accumulator.result()
+        metrics: dict[str, Any] = {
+            "model_name": model_name,
+            "precision": result.precision,
+            "recall": result.recall,
+            "f1_score": result.f1,
+            "roc_auc": result.roc_auc,
+        }
+        logger.info(
+            "%s — F1=%.4f, ROC-AUC=%.4f", model_name, metrics["f1_score"], metrics["roc_auc"]
+        )
+        return metrics
+
+    def train_chunked(self, data: FeatureChunks, log_to_mlflow: bool = True) -> None:
+        """Fit and evaluate every candidate on ``data``, which must already be fitted."""
+        fitters = {
+            "SGD Logistic Regression": self.fit_sgd,
+            "XGBoost": self.fit_xgboost,
+            "LightGBM": self.fit_lightgbm,
+        }
+        for model_name, model in self.get_models().items():
+            logger.info("Training out of core: %s", model_name)
+            model = fitters[model_name](model, data)
+            self.models[model_name] = model
+            self.results[model_name] = self.evaluate_chunked(model, data, model_name)
+            if log_to_mlflow:
+                self._log_run(model_name, model, self.results[model_name], "weights")
+        self._select_best_model()
@@ -1,5 +1,7 @@
 import json
 import logging
+import time
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -9,10 +11,20 @@ import numpy as np
 import pandas as pd
 from numpy.typing import NDArray
 
+from src.features.compiled import CompiledFeatureMap
+from src.features.matrix import FeatureMatrix
 from src.features.preprocessor import TelcoPreprocessor
+from src.models.artifact import export_artifact, format_results
+from src.models.risk import get_risk_level as get_risk_level
+from src.models.risk import get_risk_levels as get_risk_levels
+from src.models.runtime import CompiledRuntime, RuntimeBackend, compile_runtime
 
 logger = logging.getLogger(__name__)
 
+# Largest batch built row by row through the compiled map; the pandas stages work a
+# column at a time and win beyond about a thousand rows (bench_batch_predict.py).
+COMPILED_BATCH_MAX_ROWS = 1000
+
 
 class ProductionChurnModel:
     def __init__(self, model: Any, preprocessor: TelcoPreprocessor, threshold: float = 0.5) -> None:
@@ -25,38 +37,116 @@ class ProductionChurnModel:
             "model_type": type(model).__name__,
             "feature_names": preprocessor.feature_names,
         }
-
-    def predict(self, X: pd.DataFrame) -> NDArray[np.int_]:
+        self.runtime: CompiledRuntime | None = None
+        self.runtime_threads = 1
+        self._compiled = self._compile()
+        self._backend: RuntimeBackend | None = None
+        # Called as ``observer(stage, seconds)`` after each scoring stage when set.
+        self.stage_observer: Callable[[str, float], None] | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_compiled", None)
+        state.pop("_backend", None)
+        state.pop("stage_observer", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        state.setdefault("runtime", None)
+        state.setdefault("runtime_threads", 1)
+        state["stage_observer"] = None
+        self.__dict__.update(state)
+        self._compiled = self._compile()
+        self._backend = self.runtime.backend(self.runtime_threads) if self.runtime else None
+
+    def use_runtime(self, kind: str = "auto", threads: int = 1) -> None:
+        """Serve ``predict_proba`` from a compiled runtime (see ``src.models.runtime``).
+
+        ``kind="native"`` returns to the estimator's own ``predict_proba``. The compiled
+        model is pickled with this object; the runtime session is rebuilt on load.
+        """
+        if kind == "native":
+            self.runtime, self._backend = None, None
+        else:
+            if self.runtime is None or kind not in ("auto", self.runtime.kind):
+                self.runtime = compile_runtime(self.model, kind)
+            self._backend = self.runtime.backend(threads)
+        self.runtime_threads = threads
+        self.metadata["runtime"] = self.runtime.kind if self.runtime else "native"
+
+    def _compile(self) -> CompiledFeatureMap | None:
+        try:
+            return CompiledFeatureMap.from_preprocessor(self.preprocessor)
+        except (AttributeError, ValueError) as exc:
+            logger.warning("Compiled feature path unavailable, using pandas path: %s", exc)
+            return None
+
+    def _model_input(self, X: FeatureMatrix) -> Any:
+        # Only a model fitted on a DataFrame needs its column names back.
+        if isinstance(X, np.ndarray) and hasattr(self.model, "feature_names_in_"):
+            return pd.DataFrame(X, columns=self.preprocessor.feature_names, copy=False)
+        return X
+
+    def predict(self, X: FeatureMatrix) -> NDArray[np.int_]:
         proba = self.predict_proba(X)
         return (proba[:, 1] >= self.threshold).astype(int)
 
-    def predict_proba(self, X: pd.DataFrame) -> NDArray[np.float64]:
-        result: NDArray[np.float64] = self.model.predict_proba(X)
+    def _timed(self, stage: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # Without an observer this is one attribute check, so timing costs nothing when off.
+        observer = self.stage_observer
+        if observer is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        observer(stage, time.perf_counter() - start)
+        return result
+
+    def predict_proba(self, X: FeatureMatrix) -> NDArray[np.float64]:
+        result: NDArray[np.float64] = self._timed("predict", self._score, X)
+        return result
+
+    def _score(self, X: FeatureMatrix) -> NDArray[np.float64]:
+        if self._backend is not None:
+            # Frames mix int, bool and float columns; to_numpy() alone would give objects.
+            features = X.to_numpy(dtype=np.float64) if isinstance(X, pd.DataFrame) else X
+            return self._backend.predict_proba(features)
+        result: NDArray[np.float64] = self.model.predict_proba(self._model_input(X))
         return result
 
     def predict_single(self, customer_data: dict[str, Any]) -> dict[str, Any]:
-        df = pd.DataFrame([customer_data])
-        df = self.preprocessor.clean_data(df)
-        df = self.preprocessor.engineer_features(df)
-        df = self.preprocessor.encode_features(df, fit=False)
-        df = self.preprocessor.scale_features(df, fit=False)
-
-        if "Churn" in df.columns:
-            df = df.drop("Churn", axis=1)
-
-        for feature in set(self.preprocessor.feature_names) - set(df.columns):
-            df[feature] = 0
-        df = df[self.preprocessor.feature_names]
-
-        proba: NDArray[np.float64] = self.predict_proba(df)[0]
-        prediction = int(self.predict(df)[0])
-
-        return {
-            "churn_prediction": prediction,
-            "churn_probability": float(proba[1]),
-            "no_churn_probability": float(proba[0]),
-            "confidence": float(abs(proba[1] - self.threshold) / (1 - self.threshold)),
-        }
+        features: FeatureMatrix
+        if self._compiled is not None:
+            features = self._timed(
+                "features", self._compiled.transform_one, customer_data
+            ).reshape(1, -1)
+        else:
+            features = self.prepare_frame(pd.DataFrame([customer_data]), inplace=True)
+        return self._format_results(self.predict_proba(features))[0]
+
+    def predict_many(self, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not records:
+            return []
+        features: FeatureMatrix
+        if self._compiled is not None and len(records) <= COMPILED_BATCH_MAX_ROWS:
+            features = self._timed("features", self._compiled.transform_many, records)
+        else:
+            features = self.prepare_frame(pd.DataFrame(records), inplace=True)
+        return self._format_results(self.predict_proba(features))
+
+    def prepare_frame(self, df: pd.DataFrame, inplace: bool = False) -> FeatureMatrix:
+        """Model features for raw rows, in the preprocessor's output form.
+
+        ``inplace=True`` consumes ``df`` to avoid copies.
+        """
+        preprocessor = self.preprocessor
+        df = self._timed("clean", preprocessor.clean_data, df, inplace=inplace)
+        df = self._timed("engineer", preprocessor.engineer_features, df, inplace=inplace)
+        df = self._timed("encode", preprocessor.encode_features, df, False, inplace=inplace)
+        df = self._timed("scale", preprocessor.scale_features, df, False, inplace=inplace)
+        return preprocessor.to_output(df, preprocessor.feature_names)
+
+    def _format_results(self, proba: NDArray[np.float64]) -> list[dict[str, Any]]:
+        return format_results(proba, self.threshold)
 
     def get_feature_importance(self, top_n: int = 10) -> dict[str, float]:
         if not hasattr(self.model, "feature_importances_"):
@@ -74,6 +164,20 @@ class ProductionChurnModel:
             json.dump(self.get_feature_importance(20), f, indent=4)
         logger.info("Production model saved: path=%s", path)
 
+    def save_lean(self, path: str = "models/production/lean") -> None:
+        """Write the pickle-free artifact served by ``src.models.artifact.load_artifact``.
+
+        A runtime selected with ``use_runtime`` is written instead of the native model.
+        """
+        if self._compiled is None:
+            raise ValueError("Lean artifact requires a compilable preprocessor")
+        export_artifact(
+            self.model, self._compiled, self.threshold,
+            {**self.metadata, "feature_importance": self.get_feature_importance(20)},
+            path,
+            runtime=self.runtime,
+        )
+
     @classmethod
     def load(cls, path: str = "models/production/churn_model_production.pkl") -> "ProductionChurnModel":
         model: ProductionChurnModel = joblib.load(path)
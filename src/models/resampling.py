@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+import pandas as pd
+from imblearn.over_sampling import SMOTE
+from imblearn.under_sampling import RandomUnderSampler
+from numpy.typing import NDArray
+from sklearn.neighbors import NearestNeighbors
+
+from src.features.matrix import FeatureMatrix, match_layout, stack_rows, take_rows
+
+logger = logging.getLogger(__name__)
+
+RESAMPLING_METHODS: tuple[str, ...] = ("none", "smote", "undersample")
+
+
+def data_fingerprint(X: FeatureMatrix, y: pd.Series) -> str:
+    digest = hashlib.sha256()
+    if isinstance(X, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    else:
+        # An array has no index to tell rows apart, so its bytes identify the rows.
+        digest.update(f"{X.dtype}:{X.shape}".encode())
+        digest.update(np.ascontiguousarray(X).data)
+    digest.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ResamplingCache:
+    """Resampled training sets, computed once per (training data, method, seed).
+
+    Keys are content hashes of the rows being resampled, so a CV fold, the full
+    training split and a tuner fold over the same rows all resolve to the same entry
+    whichever component asks first. Entries are kept in memory and, when ``cache_dir``
+    is set, on disk so other processes can reuse them.
+    """
+
+    def __init__(
+        self,
+        method: str = "smote",
+        random_state: int = 42,
+        cache_dir: str | Path | None = None,
+        n_jobs: int = -1,
+        k_neighbors: int = 5,
+        parallel_neighbors_min_samples: int = 5_000,
+    ) -> None:
+        if method not in RESAMPLING_METHODS:
+            raise ValueError(f"Unknown imbalance method: {method}")
+        self.method = method
+        self.random_state = random_state
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.n_jobs = n_jobs
+        self.k_neighbors = k_neighbors
+        self.parallel_neighbors_min_samples = parallel_neighbors_min_samples
+        self.hits = 0
+        self.misses = 0
+        self._memory: dict[str, tuple[FeatureMatrix, pd.Series]] = {}
+
+    def _key(self, X: FeatureMatrix, y: pd.Series) -> str:
+        digest = hashlib.sha256(data_fingerprint(X, y).encode())
+        digest.update(f"{self.method}:{self.random_state}:{self.k_neighbors}".encode())
+        return digest.hexdigest()
+
+    def _sampler(self, n_minority: int) -> SMOTE | RandomUnderSampler:
+        if self.method == "undersample":
+            return RandomUnderSampler(random_state=self.random_state)
+        k_neighbors: int | NearestNeighbors = self.k_neighbors
+        if n_minority >= self.parallel_neighbors_min_samples:
+            # Same exact neighbours as SMOTE's default estimator, but the distance
+            # computation is chunked across cores instead of running on one.
+            k_neighbors = NearestNeighbors(n_neighbors=self.k_neighbors + 1, n_jobs=self.n_jobs)
+        return SMOTE(random_state=self.random_state, k_neighbors=k_neighbors)
+
+    def resample(self, X: FeatureMatrix, y: pd.Series) -> tuple[FeatureMatrix, pd.Series]:
+        if self.method == "none":
+            return X, y
+        key = self._key(X, y)
+        if key in self._memory:
+            self.hits += 1
+            return self._memory[key]
+
+        path = self.cache_dir / f"{key}.pkl" if self.cache_dir is not None else None
+        if path is not None and path.exists():
+            self.hits += 1
+            self._memory[key] = joblib.load(path)
+            return self._memory[key]
+
+        self.misses += 1
+        logger.info("Applying %s resampling: before=%s", self.method, np.bincount(y))
+        sampler = self._sampler(int(np.bincount(y).min()))
+        X_resampled, y_resampled = sampler.fit_resample(X, y)
+        X_resampled = match_layout(X_resampled, X)
+        logger.info("After resampling: %s", np.bincount(y_resampled))
+        self._memory[key] = (X_resampled, y_resampled)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-process name, so concurrent writers never share a partial file.
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            joblib.dump(self._memory[key], tmp_path)
+            os.replace(tmp_path, path)
+        return self._memory[key]
+
+    def resample_folds(
+        self,
+        X: FeatureMatrix,
+        y: pd.Series,
+        splits: list[tuple[NDArray[np.intp], NDArray[np.intp]]],
+    ) -> list[tuple[FeatureMatrix, pd.Series]]:
+        return [self.resample(take_rows(X, train), y.iloc[train]) for train, _ in splits]
+
+    def augmented_search_data(
+        self,
+        X: FeatureMatrix,
+        y: pd.Series,
+        splits: list[tuple[NDArray[np.intp], NDArray[np.intp]]],
+    ) -> tuple[FeatureMatrix, pd.Series, list[tuple[NDArray[np.intp], NDArray[np.intp]]]]:
+        """Stack the original rows and each fold's resampled training set for a search.
+
+        The returned splits train on a fold's resampled block and validate on original
+        rows only, so ``GridSearchCV``/``RandomizedSearchCV`` score exactly what the
+        trainer's fold-aware CV scores, without resampling inside the search.
+        """
+        blocks: list[tuple[FeatureMatrix, pd.Series]] = [(X, y)]
+        aug_splits: list[tuple[NDArray[np.intp], NDArray[np.intp]]] = []
+        offset = len(X)
+        for (X_rs, y_rs), (_, val) in zip(self.resample_folds(X, y, splits), splits, strict=True):
+            blocks.append((X_rs, y_rs))
+            aug_splits.append((np.arange(offset, offset + len(X_rs)), val))
+            offset += len(X_rs)
+        X_aug = stack_rows([b[0] for b in blocks])
+        y_aug = stack_rows([b[1] for b in blocks])
+        return X_aug, y_aug, aug_splits
+
+    def __getstate__(self) -> dict[str, Any]:
+        # With a disk cache, workers read entries from disk instead of receiving copies.
+        state = self.__dict__.copy()
+        if self.cache_dir is not None:
+            state["_memory"] = {}
+        return state
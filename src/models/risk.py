@@ -0,0 +1,17 @@
+import numpy as np
+from numpy.typing import NDArray
+
+
+def get_risk_level(probability: float) -> str:
+    if probability < 0.3:
+        return "LOW"
+    if probability < 0.6:
+        return "MEDIUM"
+    return "HIGH"
+
+
+def get_risk_levels(probabilities: NDArray[np.float64]) -> NDArray[np.object_]:
+    levels: NDArray[np.object_] = np.select(
+        [probabilities < 0.3, probabilities < 0.6], ["LOW", "MEDIUM"], default="HIGH"
+    ).astype(object)
+    return levels
@@ -1,4 +1,7 @@
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -9,26 +12,67 @@ import mlflow.sklearn
 import mlflow.xgboost
 import numpy as np
 import pandas as pd
-from imblearn.over_sampling import SMOTE
-from imblearn.under_sampling import RandomUnderSampler
 from lightgbm import LGBMClassifier
 from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import f1_score, precision_score, recall_score, roc_auc_score
-from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
+from sklearn.model_selection import train_test_split
+from threadpoolctl import threadpool_limits
 from xgboost import XGBClassifier
 
+from src.evaluation.metrics import compute_metrics
+from src.features.matrix import FeatureMatrix, take_rows
+from src.models.cv import cross_validate, fold_indices
+from src.models.resampling import ResamplingCache
+
 logger = logging.getLogger(__name__)
 
 
+def allocate_threads(n_models: int, n_workers: int, n_cpus: int | None = None) -> tuple[int, int]:
+    """Split ``n_cpus`` between at most ``n_models`` workers: (workers, threads per worker)."""
+    n_cpus = n_cpus or os.cpu_count() or 1
+    workers = max(1, min(n_workers, n_models, n_cpus))
+    return workers, max(1, n_cpus // workers)
+
+
+def _set_thread_count(model: Any, threads: int) -> None:
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=threads)
+
+
+def _fit_in_worker(
+    trainer: "ChurnModelTrainer", model_name: str, model: Any, *args: Any
+) -> tuple[Any, dict[str, Any]]:
+    # Frames unpickled from the pool's call queue can wrap read-only buffers, which
+    # scikit-learn's input validation refuses; give the fit its own writeable copies.
+    args = tuple(
+        a.copy() if isinstance(a, pd.DataFrame | pd.Series)
+        or (isinstance(a, np.ndarray) and not a.flags.writeable) else a
+        for a in args
+    )
+    return trainer._fit_candidate(model_name, model, *args)
+
+
+def _limit_worker_threads(threads: int) -> None:
+    # Caps BLAS/OpenMP pools for models without an n_jobs parameter; the limit applies
+    # for the lifetime of the worker process.
+    threadpool_limits(limits=threads)
+
+
 class ChurnModelTrainer:
     def __init__(
         self,
         random_state: int = 42,
         mlflow_tracking_uri: str | None = None,
         experiment_name: str = "churn-prediction",
+        cv_n_jobs: int = 1,
+        cv_oof_threshold: bool = False,
+        resampling_cache_dir: str | None = None,
     ) -> None:
         self.random_state = random_state
+        self.cv_n_jobs = cv_n_jobs
+        self.cv_oof_threshold = cv_oof_threshold
+        self.resampling_cache_dir = resampling_cache_dir
+        self._resamplers: dict[str, ResamplingCache] = {}
         self.models: dict[str, Any] = {}
         self.results: dict[str, dict[str, Any]] = {}
         self.best_model: object = None
@@ -64,47 +108,47 @@ class ChurnModelTrainer:
         }
 
     def split_data(
-        self, X: pd.DataFrame, y: pd.Series, test_size: float = 0.2
-    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=self.random_state, stratify=y
+        self, X: FeatureMatrix, y: pd.Series, test_size: float = 0.2
+    ) -> tuple[FeatureMatrix, FeatureMatrix, pd.Series, pd.Series]:
+        # Splitting positions gives the same split as splitting X, and take_rows keeps an
+        # array's memory order, which fancy indexing would reset to C.
+        train, test = train_test_split(
+            np.arange(len(y)), test_size=test_size, random_state=self.random_state, stratify=y
         )
+        X_train, X_test = take_rows(X, train), take_rows(X, test)
+        y_train, y_test = y.iloc[train], y.iloc[test]
         logger.info(
             "Split — train: %d, test: %d, train_churn_rate: %.2f%%",
             len(X_train), len(X_test), float(y_train.mean()) * 100,
         )
         return X_train, X_test, y_train, y_test
 
+    def resampler(self, method: str) -> ResamplingCache:
+        """Shared resampling cache for ``method``; pass it to the tuner to reuse folds."""
+        if method not in self._resamplers:
+            self._resamplers[method] = ResamplingCache(
+                method, random_state=self.random_state, cache_dir=self.resampling_cache_dir
+            )
+        return self._resamplers[method]
+
     def handle_imbalance(
         self,
-        X_train: pd.DataFrame,
+        X_train: FeatureMatrix,
         y_train: pd.Series,
         method: str = "smote",
-    ) -> tuple[pd.DataFrame, pd.Series]:
-        if method == "none":
-            return X_train, y_train
-        logger.info("Applying %s resampling: before=%s", method, np.bincount(y_train))
-        if method == "smote":
-            sampler: SMOTE | RandomUnderSampler = SMOTE(random_state=self.random_state)
-        elif method == "undersample":
-            sampler = RandomUnderSampler(random_state=self.random_state)
-        else:
-            raise ValueError(f"Unknown imbalance method: {method}")
-        X_resampled, y_resampled = sampler.fit_resample(X_train, y_train)
-        logger.info("After resampling: %s", np.bincount(y_resampled))
-        return X_resampled, y_resampled
+    ) -> tuple[FeatureMatrix, pd.Series]:
+        return self.resampler(method).resample(X_train, y_train)
 
     def evaluate_model(
-        self, model: Any, X_test: pd.DataFrame, y_test: pd.Series, model_name: str
+        self, model: Any, X_test: FeatureMatrix, y_test: pd.Series, model_name: str
     ) -> dict[str, Any]:
-        y_pred = model.predict(X_test)
-        y_prob = model.predict_proba(X_test)[:, 1]
+        result = compute_metrics(y_test, model.predict_proba(X_test)[:, 1])
         metrics: dict[str, object] = {
             "model_name": model_name,
-            "precision": float(precision_score(y_test, y_pred)),
-            "recall": float(recall_score(y_test, y_pred)),
-            "f1_score": float(f1_score(y_test, y_pred)),
-            "roc_auc": float(roc_auc_score(y_test, y_prob)),
+            "precision": result.precision,
+            "recall": result.recall,
+            "f1_score": result.f1,
+            "roc_auc": result.roc_auc,
         }
         logger.info(
             "%s — F1=%.4f, ROC-AUC=%.4f", model_name, metrics["f1_score"], metrics["roc_auc"]
@@ -112,69 +156,128 @@ class ChurnModelTrainer:
         return metrics
 
     def cross_validate_model(
-        self, model: Any, X: pd.DataFrame, y: pd.Series, cv: int = 5
+        self,
+        model: Any,
+        X: FeatureMatrix,
+        y: pd.Series,
+        cv: int = 5,
+        imbalance_method: str = "none",
     ) -> dict[str, float]:
-        skf = StratifiedKFold(n_splits=cv, shuffle=True, random_state=self.random_state)
-        scores: dict[str, Any] = {
-            metric: cross_val_score(model, X, y, cv=skf, scoring=metric)
-            for metric in ("f1", "roc_auc")
-        }
-        return {
-            f"{m}_mean": float(v.mean()) for m, v in scores.items()
-        } | {
-            f"{m}_std": float(v.std()) for m, v in scores.items()
-        }
+        result = cross_validate(
+            model, X, y, cv=cv, random_state=self.random_state, n_jobs=self.cv_n_jobs,
+            resampler=self.resampler(imbalance_method) if imbalance_method != "none" else None,
+        )
+        summary = result.summary(("f1", "roc_auc"))
+        if self.cv_oof_threshold:
+            summary["oof_threshold"], summary["oof_f1"] = result.optimal_threshold()
+        return summary
 
     def train_all_models(
         self,
-        X_train: pd.DataFrame,
-        X_test: pd.DataFrame,
+        X_train: FeatureMatrix,
+        X_test: FeatureMatrix,
         y_train: pd.Series,
         y_test: pd.Series,
         imbalance_method: str = "smote",
         cv: bool = True,
         log_to_mlflow: bool = True,
+        n_workers: int = 1,
     ) -> None:
+        """Fit, evaluate and optionally cross-validate every candidate model.
+
+        With ``n_workers > 1`` the candidates are fitted concurrently in a process pool
+        and the machine's cores are split between the workers (see ``allocate_threads``).
+        Results and MLflow runs are always recorded in ``get_models()`` order.
+        """
         X_train_rs, y_train_rs = self.handle_imbalance(X_train, y_train, imbalance_method)
+        if cv:
+            # Resample every CV fold once up front; all candidates (and pool workers,
+            # which receive a copy of the trainer) then hit the cache.
+            self.resampler(imbalance_method).resample_folds(
+                X_train, y_train, fold_indices(X_train, y_train, random_state=self.random_state)
+            )
         models = self.get_models()
+        args = (X_train_rs, y_train_rs, X_test, y_test, X_train, y_train, cv, imbalance_method)
 
-        for model_name, model in models.items():
-            logger.info("Training: %s", model_name)
+        if n_workers > 1:
+            if cv and self.cv_n_jobs != 1:
+                logger.warning(
+                    "n_workers=%d with cv_n_jobs=%d starts fold processes inside every "
+                    "worker and oversubscribes the CPUs", n_workers, self.cv_n_jobs,
+                )
+            n_workers, threads = allocate_threads(len(models), n_workers)
+            logger.info("Training %d models on %d workers x %d threads",
+                        len(models), n_workers, threads)
+            for model in models.values():
+                _set_thread_count(model, threads)
+            # spawn rather than fork: forking after OpenMP (LightGBM, XGBoost) has started
+            # its thread pool can deadlock the child.
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_limit_worker_threads,
+                initargs=(threads,),
+            ) as pool:
+                futures = {
+                    name: pool.submit(_fit_in_worker, self, name, model, *args)
+                    for name, model in models.items()
+                }
+                fitted = {name: future.result() for name, future in futures.items()}
+        else:
+            fitted = {
+                name: self._fit_candidate(name, model, *args) for name, model in models.items()
+            }
+
+        for model_name, (model, metrics) in fitted.items():
+            self.models[model_name] = model
+            self.results[model_name] = metrics
             if log_to_mlflow:
-                with mlflow.start_run(run_name=model_name):
-                    mlflow.log_param("model_type", model_name)
-                    mlflow.log_param("imbalance_method", imbalance_method)
-                    mlflow.log_param("random_state", self.random_state)
-                    model.fit(X_train_rs, y_train_rs)
-                    self.models[model_name] = model
-                    metrics = self.evaluate_model(model, X_test, y_test, model_name)
-                    mlflow.log_metrics({
-                        k: v for k, v in metrics.items() if isinstance(v, float)
-                    })
-                    if cv:
-                        cv_results = self.cross_validate_model(model, X_train, y_train)
-                        metrics["cv_results"] = cv_results
-                        mlflow.log_metrics(cv_results)
-                    try:
-                        if "XGBoost" in model_name:
-                            mlflow.xgboost.log_model(model, "model")
-                        elif "LightGBM" in model_name:
-                            mlflow.lightgbm.log_model(model, "model")
-                        else:
-                            mlflow.sklearn.log_model(model, "model")
-                    except Exception as exc:
-                        logger.warning("Could not log model artifact: %s", exc)
-                    self.results[model_name] = metrics
-            else:
-                model.fit(X_train_rs, y_train_rs)
-                self.models[model_name] = model
-                metrics = self.evaluate_model(model, X_test, y_test, model_name)
-                if cv:
-                    metrics["cv_results"] = self.cross_validate_model(model, X_train, y_train)
-                self.results[model_name] = metrics
+                self._log_run(model_name, model, metrics, imbalance_method)
 
         self._select_best_model()
 
+    def _fit_candidate(
+        self,
+        model_name: str,
+        model: Any,
+        X_train_rs: FeatureMatrix,
+        y_train_rs: pd.Series,
+        X_test: FeatureMatrix,
+        y_test: pd.Series,
+        X_train: FeatureMatrix,
+        y_train: pd.Series,
+        cv: bool,
+        imbalance_method: str,
+    ) -> tuple[Any, dict[str, Any]]:
+        logger.info("Training: %s", model_name)
+        model.fit(X_train_rs, y_train_rs)
+        metrics = self.evaluate_model(model, X_test, y_test, model_name)
+        if cv:
+            metrics["cv_results"] = self.cross_validate_model(
+                model, X_train, y_train, imbalance_method=imbalance_method
+            )
+        return model, metrics
+
+    def _log_run(
+        self, model_name: str, model: Any, metrics: dict[str, Any], imbalance_method: str
+    ) -> None:
+        with mlflow.start_run(run_name=model_name):
+            mlflow.log_param("model_type", model_name)
+            mlflow.log_param("imbalance_method", imbalance_method)
+            mlflow.log_param("random_state", self.random_state)
+            mlflow.log_metrics({k: v for k, v in metrics.items() if isinstance(v, float)})
+            if "cv_results" in metrics:
+                mlflow.log_metrics(metrics["cv_results"])
+            try:
+                if "XGBoost" in model_name:
+                    mlflow.xgboost.log_model(model, "model")
+                elif "LightGBM" in model_name:
+                    mlflow.lightgbm.log_model(model, "model")
+                else:
+                    mlflow.sklearn.log_model(model, "model")
+            except Exception as exc:
+                logger.warning("Could not log model artifact: %s", exc)
+
     def _select_best_model(self) -> None:
         best_f1 = 0.0
         for model_name, metrics in self.results.items():
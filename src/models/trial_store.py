@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    study TEXT NOT NULL,
+    params_key TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    fold_scores TEXT,
+    mean_score REAL,
+    fit_seconds REAL,
+    worker TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (study, params_key)
+)
+"""
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars (e.g. from scipy's randint) expose .item(); distributions do not.
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "dist"):
+        return {"dist": value.dist.name, "args": value.args, "kwds": value.kwds}
+    return repr(value)
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=_json_default)
+
+
+def study_key(**parts: Any) -> str:
+    """Stable id for one search: model, data fingerprint, search space and CV setup."""
+    return hashlib.sha256(canonical_json(parts).encode()).hexdigest()[:32]
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _worker_alive(worker: str) -> bool:
+    host, _, pid = worker.rpartition(":")
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class Trial:
+    params: dict[str, Any]
+    status: str
+    fold_scores: list[float] | None
+    mean_score: float | None
+    fit_seconds: float | None
+    worker: str
+
+
+class TrialStore:
+    """SQLite-backed record of tuning trials, shared by concurrent local processes.
+
+    A trial is claimed (``status="running"``) before it is evaluated, so two processes
+    never fit the same configuration. Claims left by a process that died, or older than
+    ``stale_after`` seconds, can be taken over, which is what lets an interrupted
+    search resume.
+    """
+
+    def __init__(self, path: str | Path = "models/tuning/trials.sqlite",
+                 stale_after: float = 6 * 3600) -> None:
+        self.path = Path(path)
+        self.stale_after = stale_after
+        self.worker = _worker_id()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def params_key(params: Mapping[str, Any]) -> str:
+        return hashlib.sha256(canonical_json(dict(params)).encode()).hexdigest()
+
+    def get(self, study: str, params: Mapping[str, Any]) -> Trial | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT params, status, fold_scores, mean_score, fit_seconds, worker "
+                "FROM trials WHERE study = ? AND params_key = ?",
+                (study, self.params_key(params)),
+            ).fetchone()
+        if row is None:
+            return None
+        return Trial(
+            params=json.loads(row[0]),
+            status=row[1],
+            fold_scores=json.loads(row[2]) if row[2] is not None else None,
+            mean_score=row[3],
+            fit_seconds=row[4],
+            worker=row[5],
+        )
+
+    def claim(self, study: str, params: Mapping[str, Any]) -> bool:
+        """Reserve ``params`` for this process; False if another live process holds it."""
+        key, now = self.params_key(params), time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT status, worker, updated FROM trials "
+                    "WHERE study = ? AND params_key = ?",
+                    (study, key),
+                ).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO trials (study, params_key, params, status, worker, updated) "
+                        "VALUES (?, ?, ?, 'running', ?, ?)",
+                        (study, key, canonical_json(dict(params)), self.worker, now),
+                    )
+                    claimed = True
+                else:
+                    status, worker, updated = row
+                    claimed = status == "running" and (
+                        worker == self.worker
+                        or not _worker_alive(worker)
+                        or now - updated > self.stale_after
+                    )
+                    if claimed:
+                        conn.execute(
+                            "UPDATE trials SET worker = ?, updated = ? "
+                            "WHERE study = ? AND params_key = ?",
+                            (self.worker, now, study, key),
+                        )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return claimed
+
+    def complete(
+        self,
+        study: str,
+        params: Mapping[str, Any],
+        fold_scores: list[float],
+        fit_seconds: float,
+    ) -> None:
+        mean_score = sum(fold_scores) / len(fold_scores)
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE trials SET status = 'complete', fold_scores = ?, mean_score = ?, "
+                "fit_seconds = ?, updated = ? WHERE study = ? AND params_key = ?",
+                (json.dumps(fold_scores), mean_score, fit_seconds, time.time(),
+                 study, self.params_key(params)),
+            )
+
+    def trials(self, study: str) -> list[Trial]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT params, status, fold_scores, mean_score, fit_seconds, worker "
+                "FROM trials WHERE study = ? ORDER BY updated",
+                (study,),
+            ).fetchall()
+        return [
+            Trial(json.loads(p), s, json.loads(f) if f is not None else None, m, t, w)
+            for p, s, f, m, t, w in rows
+        ]
@@ -1,20 +1,37 @@
 import logging
+import math
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import joblib
+import lightgbm
+import numpy as np
 import pandas as pd
 from lightgbm import LGBMClassifier
 from scipy.stats import randint, uniform
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
 from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
 from sklearn.metrics import f1_score, make_scorer, roc_auc_score
 from sklearn.model_selection import (
     GridSearchCV,
+    HalvingGridSearchCV,
+    HalvingRandomSearchCV,
+    ParameterGrid,
+    ParameterSampler,
     RandomizedSearchCV,
     StratifiedKFold,
+    train_test_split,
 )
 from xgboost import XGBClassifier
 
+from src.features.matrix import FeatureMatrix
+from src.models.cv import cross_validate, fold_indices
+from src.models.resampling import ResamplingCache, data_fingerprint
+from src.models.trial_store import Trial, TrialStore, study_key
+
 logger = logging.getLogger(__name__)
 
 _PARAM_GRIDS: dict[str, dict[str, dict[str, object]]] = {
@@ -69,12 +86,175 @@ _PARAM_GRIDS: dict[str, dict[str, dict[str, object]]] = {
 }
 
 
+SEARCH_TYPES: tuple[str, ...] = ("grid", "random", "halving", "halving_grid")
+HALVING_SEARCH_TYPES: tuple[str, ...] = ("halving", "halving_grid")
+_SPACE_FOR_SEARCH: dict[str, str] = {
+    "grid": "grid", "random": "random", "halving": "random", "halving_grid": "grid",
+}
+_EARLY_STOPPING_MODELS: frozenset[str] = frozenset(["XGBoost", "LightGBM"])
+_MAX_ESTIMATORS = 500
+_HALVING_FACTOR = 3
+
+
+def _strip_prefix(params: dict[str, Any]) -> dict[str, object]:
+    return {k.removeprefix("estimator__"): v for k, v in params.items()}
+
+
+class EarlyStoppingClassifier(ClassifierMixin, BaseEstimator):  # type: ignore[misc]
+    """Fits an XGBoost/LightGBM classifier with native early stopping.
+
+    A stratified ``validation_fraction`` of whatever rows ``fit`` receives is held out
+    as the evaluation set, so inside a CV search every fold stops on its own data.
+    """
+
+    def __init__(
+        self,
+        estimator: Any = None,
+        validation_fraction: float = 0.1,
+        early_stopping_rounds: int = 20,
+        random_state: int = 42,
+    ) -> None:
+        self.estimator = estimator
+        self.validation_fraction = validation_fraction
+        self.early_stopping_rounds = early_stopping_rounds
+        self.random_state = random_state
+
+    def fit(self, X: FeatureMatrix, y: pd.Series) -> "EarlyStoppingClassifier":
+        X_fit, X_val, y_fit, y_val = train_test_split(
+            X, y, test_size=self.validation_fraction,
+            random_state=self.random_state, stratify=y,
+        )
+        estimator = clone(self.estimator)
+        if isinstance(estimator, XGBClassifier):
+            estimator.set_params(early_stopping_rounds=self.early_stopping_rounds)
+            estimator.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+            self.best_iteration_ = int(estimator.best_iteration) + 1
+        elif isinstance(estimator, LGBMClassifier):
+            estimator.fit(
+                X_fit, y_fit, eval_set=[(X_val, y_val)],
+                callbacks=[lightgbm.early_stopping(self.early_stopping_rounds, verbose=False)],
+            )
+            self.best_iteration_ = int(estimator.best_iteration_)
+        else:
+            raise ValueError(f"Early stopping not supported for {type(estimator).__name__}")
+        self.estimator_ = estimator
+        self.classes_ = estimator.classes_
+        if hasattr(X, "columns"):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        return self
+
+    def predict(self, X: FeatureMatrix) -> Any:
+        return self.estimator_.predict(X)
+
+    def predict_proba(self, X: FeatureMatrix) -> Any:
+        return self.estimator_.predict_proba(X)
+
+
+@dataclass
+class SearchReport:
+    """Best parameters found versus fitting time spent, for comparing search types."""
+
+    model_name: str
+    search_type: str
+    wall_seconds: float
+    n_candidates: int
+    n_fits: int
+    best_score: float
+    best_params: dict[str, object]
+    trace: list[tuple[float, float]] = field(default_factory=list)
+    n_cached: int = 0
+
+    @classmethod
+    def from_search(
+        cls,
+        model_name: str,
+        search_type: str,
+        search: Any,
+        best_params: dict[str, object],
+        wall_seconds: float,
+    ) -> "SearchReport":
+        results = search.cv_results_
+        n_splits = search.n_splits_
+        trace: list[tuple[float, float]] = []
+        elapsed, best = 0.0, -np.inf
+        # cv_results_ is in evaluation order (halving iterations are appended in turn).
+        for fit_time, score_time, score in zip(
+            results["mean_fit_time"], results["mean_score_time"], results["mean_test_score"],
+            strict=True,
+        ):
+            elapsed += (fit_time + score_time) * n_splits
+            if not np.isnan(score):
+                best = max(best, float(score))
+            trace.append((elapsed, best))
+        return cls(
+            model_name=model_name,
+            search_type=search_type,
+            wall_seconds=wall_seconds,
+            n_candidates=len(results["params"]),
+            n_fits=len(results["params"]) * n_splits,
+            best_score=float(search.best_score_),
+            best_params=best_params,
+            trace=trace,
+        )
+
+    @classmethod
+    def from_trials(
+        cls,
+        model_name: str,
+        search_type: str,
+        trials: list[Trial],
+        best_params: dict[str, object],
+        wall_seconds: float,
+        n_cached: int,
+    ) -> "SearchReport":
+        trace: list[tuple[float, float]] = []
+        elapsed, best = 0.0, -np.inf
+        for trial in trials:
+            elapsed += trial.fit_seconds or 0.0
+            best = max(best, trial.mean_score if trial.mean_score is not None else -np.inf)
+            trace.append((elapsed, best))
+        n_folds = len(trials[0].fold_scores or []) if trials else 0
+        return cls(
+            model_name=model_name,
+            search_type=search_type,
+            wall_seconds=wall_seconds,
+            n_candidates=len(trials),
+            n_fits=(len(trials) - n_cached) * n_folds,
+            best_score=best,
+            best_params=best_params,
+            trace=trace,
+            n_cached=n_cached,
+        )
+
+    def to_row(self) -> dict[str, object]:
+        return {
+            "Model": self.model_name,
+            "Search": self.search_type,
+            "Wall_Seconds": self.wall_seconds,
+            "Fits": self.n_fits,
+            "Cached_Trials": self.n_cached,
+            "Best_CV_Score": self.best_score,
+            "Best_Params": self.best_params,
+        }
+
+
 class HyperparameterTuner:
-    def __init__(self, random_state: int = 42, n_jobs: int = -1) -> None:
+    def __init__(
+        self,
+        random_state: int = 42,
+        n_jobs: int = -1,
+        resampler: ResamplingCache | None = None,
+        store: TrialStore | None = None,
+        store_poll_seconds: float = 1.0,
+    ) -> None:
         self.random_state = random_state
         self.n_jobs = n_jobs
+        self.resampler = resampler
+        self.store = store
+        self.store_poll_seconds = store_poll_seconds
         self.best_params: dict[str, dict[str, object]] = {}
         self.best_models: dict[str, object] = {}
+        self.reports: dict[str, SearchReport] = {}
 
     def _get_base_model(self, model_name: str) -> object:
         if model_name == "Random Forest":
@@ -91,38 +271,226 @@ class HyperparameterTuner:
             )
         raise ValueError(f"Unknown model: {model_name}")
 
+    def _search_model(self, model_name: str, search_type: str) -> Any:
+        base_model: Any = self._get_base_model(model_name)
+        if search_type in HALVING_SEARCH_TYPES and model_name in _EARLY_STOPPING_MODELS:
+            base_model.set_params(n_estimators=_MAX_ESTIMATORS)
+            return EarlyStoppingClassifier(base_model, random_state=self.random_state)
+        return base_model
+
+    def _param_space(self, model_name: str, search_type: str, model: Any) -> dict[str, Any]:
+        space = dict(_PARAM_GRIDS[model_name][_SPACE_FOR_SEARCH[search_type]])
+        if search_type in HALVING_SEARCH_TYPES:
+            # n_estimators becomes the halving resource, or is chosen by early stopping.
+            space.pop("n_estimators", None)
+        if isinstance(model, EarlyStoppingClassifier):
+            space = {f"estimator__{k}": v for k, v in space.items()}
+        return space
+
     def tune_model(
         self,
         model_name: str,
-        X_train: pd.DataFrame,
+        X_train: FeatureMatrix,
         y_train: pd.Series,
         search_type: str = "random",
         n_iter: int = 50,
         cv: int = 5,
         scoring: str = "f1",
     ) -> tuple[object, dict[str, object]]:
-        base_model = self._get_base_model(model_name)
-        param_grid = _PARAM_GRIDS[model_name][search_type]
-        cv_strategy = StratifiedKFold(n_splits=cv, shuffle=True, random_state=self.random_state)
-        scorer = make_scorer(f1_score) if scoring == "f1" else make_scorer(roc_auc_score, needs_proba=True)
+        """Search hyperparameters with ``search_type`` in ``SEARCH_TYPES``.
 
-        if search_type == "grid":
-            search: GridSearchCV | RandomizedSearchCV = GridSearchCV(
-                base_model, param_grid, cv=cv_strategy,
-                scoring=scorer, n_jobs=self.n_jobs, verbose=1,
+        ``"halving"``/``"halving_grid"`` run successive halving over the random/grid
+        space: Random Forest candidates compete on a growing ``n_estimators`` budget,
+        XGBoost/LightGBM on a growing sample with native early stopping on a held-out
+        part of each training fold. A ``SearchReport`` is kept in ``self.reports``.
+        """
+        if search_type not in SEARCH_TYPES:
+            raise ValueError(f"Unknown search type: {search_type}")
+        base_model = self._search_model(model_name, search_type)
+        param_grid = self._param_space(model_name, search_type, base_model)
+        if self.store is not None:
+            if search_type in HALVING_SEARCH_TYPES:
+                raise ValueError("The trial store supports grid and random searches only")
+            return self._tune_with_store(
+                self.store, model_name, base_model, param_grid, X_train, y_train,
+                search_type, n_iter, cv, scoring,
             )
-        else:
+        cv_strategy: Any = StratifiedKFold(
+            n_splits=cv, shuffle=True, random_state=self.random_state
+        )
+        X_search, y_search = X_train, y_train
+        if self.resampler is not None:
+            # Search on pre-resampled folds shared with the trainer, then refit once on
+            # the resampled training split below.
+            X_search, y_search, cv_strategy = self.resampler.augmented_search_data(
+                X_train, y_train, fold_indices(X_train, y_train, cv, self.random_state)
+            )
+        refit = self.resampler is None
+        scorer = (
+            make_scorer(f1_score) if scoring == "f1"
+            else make_scorer(roc_auc_score, needs_proba=True)
+        )
+        common: dict[str, Any] = {
+            "cv": cv_strategy, "scoring": scorer, "n_jobs": self.n_jobs,
+            "verbose": 1, "refit": refit,
+        }
+
+        search: Any
+        if search_type == "grid":
+            search = GridSearchCV(base_model, param_grid, **common)
+        elif search_type == "random":
             search = RandomizedSearchCV(
                 base_model, param_grid, n_iter=n_iter,
-                cv=cv_strategy, scoring=scorer, n_jobs=self.n_jobs,
-                verbose=1, random_state=self.random_state,
+                random_state=self.random_state, **common,
+            )
+        else:
+            n_candidates = (
+                len(ParameterGrid(param_grid)) if search_type == "halving_grid" else n_iter
             )
+            if not isinstance(base_model, EarlyStoppingClassifier) and "n_estimators" in (
+                base_model.get_params()
+            ):
+                resource, max_resources, floor = "n_estimators", _MAX_ESTIMATORS, 10
+            else:
+                resource, max_resources = "n_samples", len(X_search)
+                floor = 2 * cv * y_train.nunique()
+            # Pick the starting budget so the last round runs on the full budget.
+            n_rounds = 1 + math.ceil(math.log(max(n_candidates, 1), _HALVING_FACTOR))
+            halving: dict[str, Any] = {
+                "factor": _HALVING_FACTOR,
+                "resource": resource,
+                "max_resources": max_resources,
+                "min_resources": max(max_resources // _HALVING_FACTOR ** (n_rounds - 1), floor),
+                "random_state": self.random_state,
+            }
+            if search_type == "halving_grid":
+                search = HalvingGridSearchCV(base_model, param_grid, **halving, **common)
+            else:
+                search = HalvingRandomSearchCV(
+                    base_model, param_grid, n_candidates=n_iter, **halving, **common
+                )
+
+        start = time.perf_counter()
+        search.fit(X_search, y_search)
+        if self.resampler is None:
+            best_model = search.best_estimator_
+        else:
+            best_model = clone(base_model).set_params(**search.best_params_)
+            best_model.fit(*self.resampler.resample(X_train, y_train))
+        wall_seconds = time.perf_counter() - start
+
+        best_params = _strip_prefix(search.best_params_)
+        if isinstance(best_model, EarlyStoppingClassifier):
+            best_params["n_estimators"] = best_model.best_iteration_
+            best_model = best_model.estimator_
+        elif search_type in HALVING_SEARCH_TYPES and "n_estimators" in search.best_params_:
+            best_params["n_estimators"] = search.best_params_["n_estimators"]
+
+        self.best_params[model_name] = best_params
+        self.best_models[model_name] = best_model
+        self.reports[model_name] = SearchReport.from_search(
+            model_name, search_type, search, best_params, wall_seconds
+        )
+        logger.info(
+            "%s best CV score: %.4f (%s, %d fits, %.1fs)", model_name, search.best_score_,
+            search_type, self.reports[model_name].n_fits, wall_seconds,
+        )
+        return best_model, best_params
+
+    def _tune_with_store(
+        self,
+        store: TrialStore,
+        model_name: str,
+        base_model: Any,
+        param_grid: dict[str, Any],
+        X_train: FeatureMatrix,
+        y_train: pd.Series,
+        search_type: str,
+        n_iter: int,
+        cv: int,
+        scoring: str,
+    ) -> tuple[object, dict[str, object]]:
+        """Evaluate candidates one by one through ``store``.
+
+        Completed trials are read back instead of refitted, candidates claimed by
+        another live process are waited for, and everything else is fitted here with
+        the fold-once CV engine on the same splits the sklearn searches use.
+        """
+        candidates: list[dict[str, Any]] = (
+            list(ParameterGrid(param_grid)) if search_type == "grid"
+            else list(ParameterSampler(param_grid, n_iter, random_state=self.random_state))
+        )
+        study = study_key(
+            model=model_name,
+            data=data_fingerprint(X_train, y_train),
+            space=param_grid,
+            base_params={k: v for k, v in base_model.get_params().items() if k != "n_jobs"},
+            cv=cv,
+            scoring=scoring,
+            random_state=self.random_state,
+            resampling=(
+                [self.resampler.method, self.resampler.random_state]
+                if self.resampler is not None else None
+            ),
+        )
+        metric = "f1" if scoring == "f1" else "roc_auc"
+        start = time.perf_counter()
+        n_evaluated = n_cached = 0
+
+        pending = list(candidates)
+        while pending:
+            waiting: list[dict[str, Any]] = []
+            for params in pending:
+                trial = store.get(study, params)
+                if trial is not None and trial.status == "complete":
+                    n_cached += 1
+                    continue
+                if not store.claim(study, params):
+                    waiting.append(params)
+                    continue
+                fit_start = time.perf_counter()
+                result = cross_validate(
+                    clone(base_model).set_params(**params), X_train, y_train, cv=cv,
+                    random_state=self.random_state, n_jobs=self.n_jobs,
+                    resampler=self.resampler,
+                )
+                store.complete(
+                    study, params, result.scores(metric).tolist(),
+                    time.perf_counter() - fit_start,
+                )
+                n_evaluated += 1
+            if waiting:
+                logger.info("%d trials running in other processes; waiting", len(waiting))
+                time.sleep(self.store_poll_seconds)
+            pending = waiting
+
+        trials = [store.get(study, params) for params in candidates]
+        scores = [
+            t.mean_score if t is not None and t.mean_score is not None else -np.inf
+            for t in trials
+        ]
+        best = int(np.argmax(scores))
+        best_params: dict[str, object] = dict(candidates[best])
+        best_model = clone(base_model).set_params(**best_params)
+        if self.resampler is not None:
+            best_model.fit(*self.resampler.resample(X_train, y_train))
+        else:
+            best_model.fit(X_train, y_train)
+
+        self.best_params[model_name] = best_params
+        self.best_models[model_name] = best_model
+        self.reports[model_name] = SearchReport.from_trials(
+            model_name, search_type, [t for t in trials if t is not None],
+            best_params, time.perf_counter() - start, n_cached,
+        )
+        logger.info(
+            "%s best CV score: %.4f (%s, %d trials evaluated, %d from store)",
+            model_name, scores[best], search_type, n_evaluated, n_cached,
+        )
+        return best_model, best_params
 
-        search.fit(X_train, y_train)
-        self.best_params[model_name] = search.best_params_
-        self.best_models[model_name] = search.best_estimator_
-        logger.info("%s best CV score: %.4f", model_name, search.best_score_)
-        return search.best_estimator_, search.best_params_
+    def report_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame([r.to_row() for r in self.reports.values()])
 
     def save_results(self, path: str = "models/tuned") -> None:
         Path(path).mkdir(parents=True, exist_ok=True)
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -30,20 +31,35 @@ SAMPLE_CUSTOMER = {
 def mock_model() -> MagicMock:
     model = MagicMock()
     model.metadata = {"model_type": "RandomForestClassifier"}
-    model.predict_single.return_value = {
+    result = {
         "churn_prediction": 1,
         "churn_probability": 0.75,
         "no_churn_probability": 0.25,
         "confidence": 0.5,
     }
+    model.predict_single.return_value = result
+    model.predict_many.side_effect = lambda records: [result for _ in records]
     return model
 
 
 @pytest.fixture()
-def client(mock_model: MagicMock) -> TestClient:
+def client(mock_model: MagicMock) -> Iterator[TestClient]:
     with patch("api.predictor.get_model", return_value=mock_model):
         from api.main import app
-        return TestClient(app)
+        with patch("api.main.get_model", return_value=mock_model):
+            yield TestClient(app)
+
+
+@pytest.fixture()
+def cached_client(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[TestClient]:
+    from api.predictor import get_prediction_cache
+
+    monkeypatch.setenv("PREDICTION_CACHE_SIZE", "16")
+    get_prediction_cache.cache_clear()
+    yield client
+    get_prediction_cache.cache_clear()
 
 
 def test_health_returns_200(client: TestClient) -> None:
@@ -103,3 +119,51 @@ def test_batch_predict_count(client: TestClient) -> None:
     data = client.post("/predict/batch", json=payload).json()
     assert data["count"] == 2
     assert len(data["predictions"]) == 2
+
+
+def test_cache_stats_disabled_by_default(client: TestClient) -> None:
+    data = client.get("/cache/stats").json()
+    assert data["enabled"] is False
+
+
+def test_predict_serves_repeat_from_cache(
+    cached_client: TestClient, mock_model: MagicMock
+) -> None:
+    first = cached_client.post("/predict", json=SAMPLE_CUSTOMER).json()
+    second = cached_client.post("/predict", json=SAMPLE_CUSTOMER).json()
+    assert first == second
+    assert mock_model.predict_single.call_count == 1
+    stats = cached_client.get("/cache/stats").json()
+    assert stats["enabled"] is True
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_batch_predict_consults_cache(
+    cached_client: TestClient, mock_model: MagicMock
+) -> None:
+    cached_client.post("/predict", json=SAMPLE_CUSTOMER)
+    other = {**SAMPLE_CUSTOMER, "tenure": 3}
+    payload = {"customers": [SAMPLE_CUSTOMER, other, other]}
+    data = cached_client.post("/predict/batch", json=payload).json()
+    assert data["count"] == 3
+    mock_model.predict_many.assert_called_once()
+    assert len(mock_model.predict_many.call_args.args[0]) == 2
+
+
+def test_metrics_endpoint_fills_request_and_stage_histograms(client: TestClient) -> None:
+    client.post("/predict/batch", json={"customers": [SAMPLE_CUSTOMER] * 3})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    counts = {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in response.text.splitlines()
+        if line and not line.startswith("#")
+    }
+    labels = 'method="POST",route="/predict/batch"'
+    assert counts[f'http_requests_total{{{labels},status="200"}}'] >= 1
+    assert counts[f"http_request_duration_seconds_count{{{labels}}}"] >= 1
+    assert counts['prediction_stage_seconds_count{stage="validate"}'] >= 1
+    assert counts['prediction_stage_seconds_count{stage="respond"}'] >= 1
+    assert counts['prediction_records_bucket{le="2"}'] < counts['prediction_records_bucket{le="4"}']
@@ -0,0 +1,124 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from xgboost import XGBClassifier
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.artifact import MANIFEST_NAME, is_artifact, load_artifact
+from src.models.production import ProductionChurnModel
+
+
+@pytest.fixture(scope="module")
+def telco_df() -> pd.DataFrame:
+    return TelcoDataLoader().load_data()
+
+
+@pytest.fixture(scope="module")
+def fitted(telco_df: pd.DataFrame) -> tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]:
+    preprocessor = TelcoPreprocessor()
+    X, y, _ = preprocessor.prepare_features(telco_df, fit=True)
+    assert y is not None
+    return preprocessor, X, y
+
+
+@pytest.mark.parametrize("estimator", [
+    LogisticRegression(max_iter=1000),
+    SGDClassifier(loss="log_loss", average=True, random_state=0),
+    XGBClassifier(n_estimators=20, max_depth=3),
+    LGBMClassifier(n_estimators=20, max_depth=3, verbose=-1),
+])
+def test_lean_artifact_matches_pickled_model(
+    estimator: Any,
+    telco_df: pd.DataFrame,
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series],
+    tmp_path: Path,
+) -> None:
+    preprocessor, X, y = fitted
+    prod_model = ProductionChurnModel(estimator.fit(X, y), preprocessor, threshold=0.4)
+    prod_model.save_lean(str(tmp_path))
+    assert is_artifact(str(tmp_path))
+
+    lean = load_artifact(str(tmp_path))
+    records = telco_df.sample(50, random_state=0).to_dict("records")
+    expected = prod_model.predict_many(records)
+    for got, want in zip(lean.predict_many(records), expected, strict=True):
+        assert got["churn_prediction"] == want["churn_prediction"]
+        assert got["churn_probability"] == pytest.approx(want["churn_probability"], abs=1e-6)
+    single = lean.predict_single(records[0])
+    assert single["churn_probability"] == pytest.approx(
+        expected[0]["churn_probability"], abs=1e-6
+    )
+    assert lean.metadata["model_type"] == type(estimator).__name__
+
+
+def test_unsupported_estimator_is_rejected(
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series], tmp_path: Path
+) -> None:
+    preprocessor, X, y = fitted
+    forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    with pytest.raises(ValueError, match="No lean artifact format"):
+        ProductionChurnModel(forest, preprocessor).save_lean(str(tmp_path))
+    assert not (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_manifest_version_is_checked(
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series], tmp_path: Path
+) -> None:
+    preprocessor, X, y = fitted
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+    ProductionChurnModel(model, preprocessor).save_lean(str(tmp_path))
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    manifest["version"] = 99
+    (tmp_path / MANIFEST_NAME).write_text(json.dumps(manifest))
+    with pytest.raises(ValueError, match="Unsupported artifact version"):
+        load_artifact(str(tmp_path))
+
+
+def test_loading_artifact_does_not_import_pandas_or_joblib() -> None:
+    code = (
+        "import sys, src.models.artifact; "
+        "print(any(m in sys.modules for m in ('pandas', 'joblib')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_served_artifact_fills_load_and_stage_histograms(
+    telco_df: pd.DataFrame,
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series],
+    tmp_path: Path,
+) -> None:
+    from api.metrics import LOAD_BUCKETS, METRICS, STAGE_BUCKETS
+    from api.predictor import load_model
+
+    def stage_count(stage: str) -> int:
+        return METRICS.histogram(
+            "prediction_stage_seconds", "", STAGE_BUCKETS, {"stage": stage}
+        ).count
+
+    preprocessor, X, y = fitted
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+    ProductionChurnModel(model, preprocessor).save_lean(str(tmp_path))
+    loads = METRICS.histogram("model_load_seconds", "", LOAD_BUCKETS).count
+    before = {stage: stage_count(stage) for stage in ("features", "predict")}
+
+    served = load_model(str(tmp_path))
+    served.predict_many(telco_df.head(10).to_dict("records"))
+    served.predict_single(telco_df.iloc[0].to_dict())
+
+    assert METRICS.histogram("model_load_seconds", "", LOAD_BUCKETS).count == loads + 1
+    assert {stage: stage_count(stage) - n for stage, n in before.items()} == {
+        "features": 2, "predict": 2,
+    }
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.batching import MicroBatcher, QueueFullError
+from api.metrics import Histogram, MetricsRegistry
+from tests.test_api import SAMPLE_CUSTOMER
+
+
+class RecordingScorer:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls: list[int] = []
+        self.keys: list[Any] = []
+        self.delay = delay
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, records: list[dict[str, Any]], key: Any = None) -> list[dict[str, Any]]:
+        self.release.wait(timeout=5)
+        self.calls.append(len(records))
+        self.keys.append(key)
+        return [{"churn_probability": record["x"] / 10} for record in records]
+
+
+def test_histogram_cumulative_buckets() -> None:
+    histogram = Histogram([1, 5, 10])
+    for value in (0.5, 3, 7, 20):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"1": 1, "5": 2, "10": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(30.5)
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.", {"route": "/predict"}).inc()
+    registry.counter("requests_total", "Requests.", {"route": "/predict"}).inc()
+    registry.histogram("latency_seconds", "Latency.", [0.1, 1], {"stage": "clean"}).observe(0.5)
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/predict"} 2.0' in text
+    assert 'latency_seconds_bucket{stage="clean",le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{stage="clean",le="+Inf"} 1' in text
+    assert 'latency_seconds_count{stage="clean"} 1' in text
+    with pytest.raises(ValueError):
+        registry.histogram("requests_total", "Requests.", [1])
+
+
+def test_concurrent_requests_share_one_batch() -> None:
+    scorer = RecordingScorer()
+
+    async def scenario() -> list[dict[str, Any]]:
+        batcher = MicroBatcher(scorer, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit({"x": i}) for i in range(8)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(scenario())
+    assert [r["churn_probability"] for r in results] == [i / 10 for i in range(8)]
+    assert scorer.calls == [8]
+
+
+def test_batches_capped_at_max_batch_size() -> None:
+    scorer = RecordingScorer()
+
+    async def scenario() -> MicroBatcher:
+        batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_ms=20)
+        await batcher.start()
+        await asyncio.gather(*(batcher.submit({"x": i}) for i in range(10)))
+        await batcher.stop()
+        return batcher
+
+    batcher = asyncio.run(scenario())
+    assert max(scorer.calls) <= 4
+    assert sum(scorer.calls) == 10
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == len(scorer.calls)
+    assert stats["queue_wait_ms"]["count"] == 10
+
+
+def test_batches_never_mix_keys() -> None:
+    scorer = RecordingScorer()
+    first, second = object(), object()
+    keys = [first, first, second, second, first]
+
+    async def scenario() -> list[dict[str, Any]]:
+        batcher = MicroBatcher(scorer, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit({"x": i}, key=key) for i, key in enumerate(keys))
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(scenario())
+    assert [r["churn_probability"] for r in results] == [i / 10 for i in range(5)]
+    assert scorer.calls == [2, 2, 1]
+    assert scorer.keys == [first, second, first]
+
+
+def test_full_queue_rejects_requests() -> None:
+    scorer = RecordingScorer()
+    scorer.release.clear()
+
+    async def scenario() -> None:
+        batcher = MicroBatcher(scorer, max_batch_size=1, max_wait_ms=0, max_queue_size=2)
+        await batcher.start()
+        in_flight = [asyncio.create_task(batcher.submit({"x": 0}))]
+        await asyncio.sleep(0.05)
+        in_flight += [asyncio.create_task(batcher.submit({"x": i})) for i in (1, 2)]
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await batcher.submit({"x": 9})
+        scorer.release.set()
+        await asyncio.gather(*in_flight)
+        await batcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_scoring_errors_propagate_to_callers() -> None:
+    def failing(records: list[dict[str, Any]], key: Any) -> list[dict[str, Any]]:
+        raise RuntimeError("boom")
+
+    async def scenario() -> None:
+        batcher = MicroBatcher(failing, max_batch_size=2, max_wait_ms=5)
+        await batcher.start()
+        with pytest.raises(RuntimeError, match="boom"):
+            await batcher.submit({"x": 1})
+        await batcher.stop()
+
+    asyncio.run(scenario())
+
+
+def _batch_model(version: str, probability: float) -> MagicMock:
+    model = MagicMock()
+    model.metadata = {"model_type": "RandomForestClassifier", "registry_version": version}
+    result = {"churn_prediction": 1, "churn_probability": probability, "confidence": 0.5}
+    model.predict_single.return_value = result
+    model.predict_many.side_effect = lambda records: [result for _ in records]
+    return model
+
+
+@pytest.fixture()
+def batched_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    model = _batch_model("v001", 0.75)
+    monkeypatch.setenv("MICROBATCH_ENABLED", "1")
+    monkeypatch.setenv("MICROBATCH_MAX_WAIT_MS", "1")
+    from api.main import app
+
+    with patch("api.main.get_model", return_value=model), TestClient(app) as client:
+        yield client
+
+
+def test_predict_through_micro_batcher(batched_client: TestClient) -> None:
+    response = batched_client.post("/predict", json=SAMPLE_CUSTOMER)
+    assert response.status_code == 200
+    assert response.json()["churn_probability"] == 0.75
+    stats = batched_client.get("/batching/stats").json()
+    assert stats["enabled"] is True
+    assert stats["batch_size"]["count"] == 1
+    assert stats["queue_wait_ms"]["count"] == 1
+
+
+def test_batched_response_reports_the_model_that_scored_it(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MICROBATCH_ENABLED", "1")
+    monkeypatch.setenv("MICROBATCH_MAX_WAIT_MS", "1")
+    resolved, reloaded = _batch_model("v001", 0.75), _batch_model("v002", 0.25)
+    from api.main import app
+
+    with patch("api.main.get_model", return_value=resolved), TestClient(app) as client:
+        # A hot reload after /predict resolved its model must not change who scores it.
+        with patch("api.main.get_model", side_effect=[resolved, reloaded]):
+            response = client.post("/predict", json=SAMPLE_CUSTOMER)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["model_version"], body["churn_probability"]) == ("v001", 0.75)
+    reloaded.predict_single.assert_not_called()
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.evaluation.bootstrap import (
+    BOOTSTRAP_METRICS,
+    bootstrap_metrics,
+    paired_bootstrap,
+    resample_counts,
+    resampled_metrics,
+)
+from src.evaluation.evaluator import ModelEvaluator
+from src.evaluation.metrics import compute_metrics
+
+
+@pytest.fixture()
+def scored() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(2)
+    y_true = rng.integers(0, 2, 400)
+    y_prob = np.round(np.clip(y_true * 0.3 + rng.random(400) * 0.7, 0, 1), 2)
+    return y_true, y_prob
+
+
+def test_vectorized_resamples_match_explicit_resampling(
+    scored: tuple[np.ndarray, np.ndarray],
+) -> None:
+    y_true, y_prob = scored
+    counts = resample_counts(np.random.default_rng(0), len(y_true), 5)
+    assert (counts.sum(axis=1) == len(y_true)).all()
+    samples = resampled_metrics(y_true.astype(bool), y_prob, 0.4, counts)
+    for i, row in enumerate(counts.astype(int)):
+        idx = np.repeat(np.arange(len(y_true)), row)
+        expected = compute_metrics(y_true[idx], y_prob[idx], 0.4)
+        for metric in BOOTSTRAP_METRICS:
+            assert samples[metric][i] == pytest.approx(getattr(expected, metric))
+
+
+def test_intervals_bracket_estimate_and_ignore_n_jobs(
+    scored: tuple[np.ndarray, np.ndarray],
+) -> None:
+    y_true, y_prob = scored
+    result = bootstrap_metrics(y_true, y_prob, n_resamples=300, batch_size=64)
+    for ci in result.intervals.values():
+        assert ci.lower <= ci.estimate <= ci.upper
+    parallel = bootstrap_metrics(y_true, y_prob, n_resamples=300, batch_size=64, n_jobs=2)
+    assert parallel == result
+
+
+def test_paired_bootstrap(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    same = paired_bootstrap(y_true, y_prob, y_prob, n_resamples=200)
+    assert same.differences["f1"].lower == same.differences["f1"].upper == 0.0
+    noise = np.random.default_rng(3).random(len(y_true))
+    better = paired_bootstrap(y_true, y_prob, noise, n_resamples=200)
+    assert better.differences["roc_auc"].lower > 0
+    assert better.p_values["roc_auc"] < 0.05
+
+
+def test_evaluator_saves_intervals(
+    scored: tuple[np.ndarray, np.ndarray], tmp_path: Path
+) -> None:
+    y_true, y_prob = scored
+    X = pd.DataFrame({"p": y_prob})
+    model = MagicMock()
+    model.predict_proba.side_effect = lambda frame: np.c_[1 - frame["p"], frame["p"]]
+    evaluator = ModelEvaluator(model, "mock")
+    evaluator.evaluate(X, pd.Series(y_true))
+    evaluator.bootstrap(X, pd.Series(y_true), n_resamples=100)
+    evaluator.save_metrics(str(tmp_path))
+    (metrics_path,) = list(tmp_path.glob("*/metrics.json"))
+    saved = json.loads(metrics_path.read_text())
+    assert set(saved["confidence_intervals"]["intervals"]) == set(BOOTSTRAP_METRICS)
@@ -0,0 +1,86 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.data.loader import TelcoDataLoader
+from src.features.compiled import CompiledFeatureMap
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.production import ProductionChurnModel
+
+
+@pytest.fixture(scope="module")
+def telco_df() -> pd.DataFrame:
+    return TelcoDataLoader().load_data()
+
+
+@pytest.fixture(scope="module")
+def fitted(telco_df: pd.DataFrame) -> tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]:
+    preprocessor = TelcoPreprocessor()
+    X, y, _ = preprocessor.prepare_features(telco_df, fit=True)
+    assert y is not None
+    return preprocessor, X, y
+
+
+def test_transform_many_matches_pandas_path_on_full_dataset(
+    telco_df: pd.DataFrame, fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]
+) -> None:
+    preprocessor, X, _ = fitted
+    compiled = CompiledFeatureMap.from_preprocessor(preprocessor)
+    matrix = compiled.transform_many(telco_df.to_dict("records"))
+    np.testing.assert_array_equal(matrix, X.to_numpy(dtype=np.float64))
+
+
+def test_transform_one_matches_pandas_path_on_every_row(
+    telco_df: pd.DataFrame, fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]
+) -> None:
+    preprocessor, X, _ = fitted
+    compiled = CompiledFeatureMap.from_preprocessor(preprocessor)
+    expected = X.to_numpy(dtype=np.float64)
+    for i, record in enumerate(telco_df.to_dict("records")):
+        np.testing.assert_array_equal(compiled.transform_one(record), expected[i])
+
+
+def test_transform_one_accepts_numeric_total_charges(
+    telco_df: pd.DataFrame, fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]
+) -> None:
+    preprocessor, X, _ = fitted
+    compiled = CompiledFeatureMap.from_preprocessor(preprocessor)
+    record = telco_df.iloc[0].to_dict()
+    record["TotalCharges"] = float(record["TotalCharges"])
+    np.testing.assert_array_equal(
+        compiled.transform_one(record), X.iloc[0].to_numpy(dtype=np.float64)
+    )
+
+
+def test_compile_requires_fitted_preprocessor() -> None:
+    with pytest.raises(ValueError, match="not fitted"):
+        CompiledFeatureMap.from_preprocessor(TelcoPreprocessor())
+
+
+def test_predict_single_matches_batch_probabilities(
+    telco_df: pd.DataFrame, fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]
+) -> None:
+    preprocessor, X, y = fitted
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+    prod_model = ProductionChurnModel(model, preprocessor, threshold=0.4)
+    expected = model.predict_proba(X.iloc[:50])[:, 1]
+    for i, record in enumerate(telco_df.iloc[:50].to_dict("records")):
+        result = prod_model.predict_single(record)
+        assert result["churn_probability"] == pytest.approx(expected[i], rel=1e-12)
+        assert result["churn_prediction"] == int(expected[i] >= 0.4)
+
+
+def test_compiled_map_rebuilt_after_unpickling(
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]
+) -> None:
+    preprocessor, X, y = fitted
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+    prod_model = ProductionChurnModel(model, preprocessor)
+    state = prod_model.__getstate__()
+    assert "_compiled" not in state
+    restored: ProductionChurnModel = pickle.loads(pickle.dumps(prod_model))
+    assert restored._compiled is not None
+    assert restored._compiled.feature_names == preprocessor.feature_names
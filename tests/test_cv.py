@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+
+from src.data.loader import TelcoDataLoader
+from src.evaluation.thresholds import CostMatrix
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.cv import cross_validate
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[pd.DataFrame, pd.Series]:
+    X, y, _ = TelcoPreprocessor().prepare_features(TelcoDataLoader().load_data(), fit=True)
+    assert y is not None
+    return X.iloc[:2000], y.iloc[:2000]
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        LogisticRegression(max_iter=1000),
+        GradientBoostingClassifier(n_estimators=20, random_state=0),
+    ],
+)
+def test_summary_matches_cross_val_score(
+    data: tuple[pd.DataFrame, pd.Series], model: object
+) -> None:
+    X, y = data
+    skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    summary = cross_validate(model, X, y, cv=5, random_state=42).summary(("f1", "roc_auc"))
+    for metric in ("f1", "roc_auc"):
+        expected = cross_val_score(model, X, y, cv=skf, scoring=metric)
+        assert summary[f"{metric}_mean"] == expected.mean()
+        assert summary[f"{metric}_std"] == expected.std()
+
+
+def test_parallel_folds_match_serial(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    model = LogisticRegression(max_iter=1000)
+    serial = cross_validate(model, X, y, n_jobs=1)
+    parallel = cross_validate(model, X, y, n_jobs=2)
+    np.testing.assert_array_equal(parallel.oof_probabilities(), serial.oof_probabilities())
+
+
+def test_out_of_fold_predictions_cover_every_row(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    result = cross_validate(LogisticRegression(max_iter=1000), X, y, keep_models=True)
+    assert not np.isnan(result.oof_probabilities()).any()
+    np.testing.assert_array_equal(result.oof_labels(), y.to_numpy())
+    assert all(f.model is not None for f in result.folds)
+    threshold, f1 = result.optimal_threshold()
+    oof_pred = (result.oof_probabilities() >= threshold).astype(int)
+    assert f1 == pytest.approx(f1_score(y, oof_pred))
+    assert f1 >= result.scores("f1").min()
+    for fold in result.folds:
+        np.testing.assert_array_equal(fold.y_pred, fold.model.predict(X.iloc[fold.val_index]))
+
+    costs = CostMatrix(tp=1.0, fp=1.0, fn=5.0)
+    cost_threshold, _ = result.optimal_threshold("cost", costs=costs)
+    assert cost_threshold < threshold
+
+
+def test_unknown_metric(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    result = cross_validate(LogisticRegression(max_iter=1000), X, y)
+    with pytest.raises(ValueError, match="Unknown CV metric"):
+        result.scores("log_loss")
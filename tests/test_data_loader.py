@@ -44,3 +44,48 @@ def test_file_not_found_raises() -> None:
     loader = TelcoDataLoader(data_path="data/raw/nonexistent.csv")
     with pytest.raises(FileNotFoundError):
         loader.load_data()
+
+
+def test_load_data_applies_compact_schema(loader: TelcoDataLoader) -> None:
+    df = loader.load_data()
+    assert isinstance(df["Contract"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Churn"].dtype, pd.CategoricalDtype)
+    assert df["TotalCharges"].dtype == "float64"
+    assert df["tenure"].dtype == "int16"
+    assert df["SeniorCitizen"].dtype == "int8"
+
+
+def test_load_data_blank_total_charges_become_nan(loader: TelcoDataLoader) -> None:
+    df = loader.load_data()
+    assert df["TotalCharges"].isna().sum() == 11
+
+
+def test_load_data_usecols_projection() -> None:
+    df = TelcoDataLoader(usecols=["customerID", "tenure", "Churn"]).load_data()
+    assert list(df.columns) == ["customerID", "tenure", "Churn"]
+
+
+def test_pyarrow_engine_matches_c_engine() -> None:
+    expected = TelcoDataLoader().load_data()
+    actual = TelcoDataLoader(engine="pyarrow").load_data()
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_iter_chunks_covers_file(loader: TelcoDataLoader) -> None:
+    chunks = list(loader.iter_chunks(chunksize=2000))
+    assert [len(c) for c in chunks] == [2000, 2000, 2000, 1043]
+    assert all(c["tenure"].dtype == "int16" for c in chunks)
+
+
+def test_get_data_info_reports_memory_and_load_time(loader: TelcoDataLoader) -> None:
+    loader.load_data()
+    info = loader.get_data_info()
+    assert float(info["memory_mb"]) > 0  # type: ignore[arg-type]
+    assert float(info["load_seconds"]) >= 0  # type: ignore[arg-type]
+
+
+def test_categorical_features_include_category_dtype(loader: TelcoDataLoader) -> None:
+    loader.load_data()
+    categorical = loader.get_categorical_features()
+    assert "Contract" in categorical
+    assert "Churn" not in categorical
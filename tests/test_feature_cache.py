@@ -0,0 +1,86 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.data.loader import TelcoDataLoader
+from src.features.cache import FeatureCache, load_features
+from src.features.preprocessor import TelcoPreprocessor
+
+
+@pytest.fixture(scope="module")
+def expected() -> tuple[pd.DataFrame, pd.Series]:
+    X, y, _ = TelcoPreprocessor().prepare_features(TelcoDataLoader().load_data(), fit=True)
+    assert y is not None
+    return X, y
+
+
+@pytest.mark.parametrize("store_encoded", [False, True])
+def test_cache_hit_matches_uncached_features(
+    tmp_path: Path, expected: tuple[pd.DataFrame, pd.Series], store_encoded: bool
+) -> None:
+    cache = FeatureCache(tmp_path, store_encoded=store_encoded)
+    for _ in range(2):
+        preprocessor = TelcoPreprocessor()
+        X, y, _ = load_features(TelcoDataLoader(), preprocessor, cache)
+        pd.testing.assert_frame_equal(X, expected[0])
+        pd.testing.assert_series_equal(y, expected[1])
+    assert cache.hits == 1
+    assert preprocessor.is_fitted
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_load_features_leaves_loader_frame_intact(tmp_path: Path, cached: bool) -> None:
+    loader = TelcoDataLoader()
+    raw = loader.load_data().copy()
+    cache = FeatureCache(tmp_path, store_encoded=True) if cached else None
+    load_features(loader, TelcoPreprocessor(), cache)
+    pd.testing.assert_frame_equal(loader.df, raw)
+    assert "churn_rate" in loader.get_data_info()
+
+
+def test_key_changes_with_file_content(tmp_path: Path) -> None:
+    source = TelcoDataLoader().data_path
+    copy = tmp_path / "telco.csv"
+    shutil.copy(source, copy)
+    cache = FeatureCache(tmp_path / "cache")
+    preprocessor = TelcoPreprocessor()
+    assert cache.make_key(copy, preprocessor) == cache.make_key(source, preprocessor)
+    with open(copy, "a") as f:
+        f.write("\n")
+    assert cache.make_key(copy, preprocessor) != cache.make_key(source, preprocessor)
+
+
+def test_key_changes_with_preprocessor_options(tmp_path: Path) -> None:
+    source = TelcoDataLoader().data_path
+    cache = FeatureCache(tmp_path)
+    assert cache.make_key(source, TelcoPreprocessor()) != cache.make_key(
+        source, TelcoPreprocessor(handle_unknown="error")
+    )
+
+
+@pytest.mark.parametrize(("eviction", "evicted", "kept"), [("lru", "b", "a"), ("fifo", "a", "b")])
+def test_eviction_respects_size_cap(
+    tmp_path: Path, eviction: str, evicted: str, kept: str
+) -> None:
+    frame = pd.DataFrame({"x": range(50_000)})
+    cache = FeatureCache(tmp_path, max_size_mb=0.9, eviction=eviction)
+    cache.put("a", frame)
+    cache.put("b", frame)
+    assert cache.get("a") is not None
+    cache.put("c", frame)
+    assert cache.size_bytes() <= cache.max_bytes
+    assert cache.get(evicted) is None
+    assert cache.get(kept) is not None
+    assert cache.get("c") is not None
+
+
+def test_unknown_eviction_policy(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="eviction policy"):
+        FeatureCache(tmp_path, eviction="random")
+
+
+def test_start_from_encoded_requires_vocabulary() -> None:
+    with pytest.raises(ValueError, match="vocabulary not fitted"):
+        TelcoPreprocessor().prepare_features(pd.DataFrame({"tenure": [1]}), start="encoded")
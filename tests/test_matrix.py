@@ -0,0 +1,129 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.data.loader import TelcoDataLoader
+from src.features.matrix import match_layout, memory_order, stack_rows, take_rows
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.production import ProductionChurnModel
+from src.models.resampling import ResamplingCache
+from src.models.trainer import ChurnModelTrainer
+
+
+@pytest.fixture(scope="module")
+def telco_df() -> pd.DataFrame:
+    return TelcoDataLoader().load_data()
+
+
+@pytest.fixture(scope="module")
+def frame_features(telco_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    X, y, _ = TelcoPreprocessor().prepare_features(telco_df, fit=True)
+    assert y is not None
+    return X, y
+
+
+@pytest.mark.parametrize(("dtype", "order"), [("float32", "C"), ("float64", "F")])
+def test_array_output_matches_frame(
+    telco_df: pd.DataFrame,
+    frame_features: tuple[pd.DataFrame, pd.Series],
+    dtype: str,
+    order: str,
+) -> None:
+    expected_X, expected_y = frame_features
+    preprocessor = TelcoPreprocessor(output="array", dtype=dtype, order=order)
+    X, y, names = preprocessor.prepare_features(telco_df.copy(), fit=True, inplace=True)
+
+    assert isinstance(X, np.ndarray)
+    assert X.dtype == dtype
+    assert memory_order(X) == order
+    assert X.flags.c_contiguous if order == "C" else X.flags.f_contiguous
+    assert names == list(expected_X.columns)
+    np.testing.assert_array_equal(X, expected_X.to_numpy(dtype=dtype))
+    pd.testing.assert_series_equal(y, expected_y)
+
+
+def test_rejects_unknown_layout_options() -> None:
+    with pytest.raises(ValueError, match="output"):
+        TelcoPreprocessor(output="sparse")
+    with pytest.raises(ValueError, match="dtype"):
+        TelcoPreprocessor(dtype="float16")
+    with pytest.raises(ValueError, match="order"):
+        TelcoPreprocessor(order="A")
+
+
+def test_row_helpers_keep_dtype_and_order() -> None:
+    X = np.asfortranarray(np.arange(20, dtype=np.float32).reshape(10, 2))
+    rows = take_rows(X, np.array([7, 1, 4]))
+    assert memory_order(rows) == "F" and rows.dtype == np.float32
+    np.testing.assert_array_equal(rows, X[[7, 1, 4]])
+    np.testing.assert_array_equal(take_rows(X, X[:, 0] > 10), X[X[:, 0] > 10])
+
+    stacked = stack_rows([X, rows])
+    assert memory_order(stacked) == "F" and stacked.shape == (13, 2)
+    np.testing.assert_array_equal(stacked[10:], rows)
+
+    assert memory_order(match_layout(np.ascontiguousarray(X), like=X)) == "F"
+
+
+def test_split_and_resampling_keep_layout(telco_df: pd.DataFrame) -> None:
+    preprocessor = TelcoPreprocessor(output="array", dtype="float32", order="F")
+    X, y, _ = preprocessor.prepare_features(telco_df.copy(), fit=True, inplace=True)
+    assert y is not None
+    X_train, X_test, y_train, _ = ChurnModelTrainer().split_data(X, y)
+
+    frame_X, frame_y, _ = TelcoPreprocessor().prepare_features(telco_df, fit=True)
+    assert frame_y is not None
+    frame_train, _, _, _ = ChurnModelTrainer().split_data(frame_X, frame_y)
+    np.testing.assert_array_equal(X_train, frame_train.to_numpy(dtype=np.float32))
+
+    X_rs, y_rs = ResamplingCache("smote").resample(X_train, y_train)
+    assert isinstance(X_rs, np.ndarray)
+    assert X_rs.dtype == np.float32 and memory_order(X_rs) == "F"
+    assert len(X_rs) == len(y_rs) > len(X_train)
+    assert memory_order(X_test) == "F"
+
+
+def test_production_model_scores_arrays_like_frames(telco_df: pd.DataFrame) -> None:
+    frame_preprocessor = TelcoPreprocessor()
+    X, y, _ = frame_preprocessor.prepare_features(telco_df, fit=True)
+    frame_model = ProductionChurnModel(
+        LogisticRegression(max_iter=1000).fit(X, y), frame_preprocessor, threshold=0.4
+    )
+
+    preprocessor = TelcoPreprocessor(output="array")
+    X_array, y_array, _ = preprocessor.prepare_features(telco_df.copy(), fit=True, inplace=True)
+    array_model = ProductionChurnModel(
+        LogisticRegression(max_iter=1000).fit(X_array, y_array), preprocessor, threshold=0.4
+    )
+    features = array_model.prepare_frame(telco_df.head(50))
+    assert isinstance(features, np.ndarray) and features.shape == (50, len(X.columns))
+
+    records = telco_df.sample(20, random_state=0).to_dict("records")
+    for expected, result in zip(
+        frame_model.predict_many(records), array_model.predict_many(records), strict=True
+    ):
+        assert result["churn_probability"] == pytest.approx(expected["churn_probability"])
+    single = array_model.predict_single(records[0])
+    assert single["churn_probability"] == pytest.approx(
+        array_model.predict_many(records[:1])[0]["churn_probability"], rel=1e-9
+    )
+
+
+def test_preprocessor_pickled_before_array_output_produces_frames(
+    telco_df: pd.DataFrame,
+) -> None:
+    preprocessor = TelcoPreprocessor()
+    preprocessor.prepare_features(telco_df, fit=True)
+    state = preprocessor.__dict__.copy()
+    for option in ("output", "dtype", "order"):
+        del state[option]
+    old = TelcoPreprocessor.__new__(TelcoPreprocessor)
+    old.__setstate__(state)
+
+    restored = pickle.loads(pickle.dumps(old))
+    assert (restored.output, restored.dtype, restored.order) == ("frame", "float64", "C")
+    X, _, _ = restored.prepare_features(telco_df.head(5), fit=False)
+    assert isinstance(X, pd.DataFrame)
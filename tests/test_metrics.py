@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import (
+    average_precision_score,
+    confusion_matrix,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+
+from src.evaluation.evaluator import ModelEvaluator
+from src.evaluation.metrics import MetricsAccumulator, compute_metrics, evaluate_chunks
+
+
+@pytest.fixture()
+def scored() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 2, 2000)
+    y_prob = np.round(np.clip(y_true * 0.25 + rng.random(2000) * 0.75, 0, 1), 3)
+    return y_true, y_prob
+
+
+def test_metrics_match_sklearn(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    y_pred = (y_prob >= 0.4).astype(int)
+    result = compute_metrics(y_true, y_prob, threshold=0.4)
+    assert result.precision == pytest.approx(precision_score(y_true, y_pred))
+    assert result.recall == pytest.approx(recall_score(y_true, y_pred))
+    assert result.f1 == pytest.approx(f1_score(y_true, y_pred))
+    assert result.roc_auc == pytest.approx(roc_auc_score(y_true, y_prob), abs=1e-12)
+    assert result.avg_precision == pytest.approx(average_precision_score(y_true, y_prob))
+    assert result.confusion_matrix == confusion_matrix(y_true, y_pred).tolist()
+
+
+def test_chunked_accumulation_matches_single_pass(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    accumulator = MetricsAccumulator()
+    for start in range(0, len(y_true), 300):
+        accumulator.update(y_true[start:start + 300], y_prob[start:start + 300])
+    assert accumulator.result() == compute_metrics(y_true, y_prob)
+
+
+def test_resolution_bounds_distinct_scores(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    accumulator = MetricsAccumulator(resolution=0.01).update(y_true, y_prob)
+    assert len(accumulator.curve().thresholds) <= 101
+    assert accumulator.result().roc_auc == pytest.approx(roc_auc_score(y_true, y_prob), abs=5e-3)
+
+
+def test_single_class_has_undefined_ranking_metrics() -> None:
+    result = compute_metrics(np.zeros(10), np.linspace(0, 1, 10))
+    assert np.isnan(result.roc_auc)
+    assert result.f1 == 0.0
+
+
+def test_evaluator_chunks_match_in_memory(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    X = pd.DataFrame({"p": y_prob})
+    model = MagicMock()
+    model.predict_proba.side_effect = lambda frame: np.c_[1 - frame["p"], frame["p"]]
+    evaluator = ModelEvaluator(model, "mock", threshold=0.4)
+    expected = evaluator.evaluate(X, pd.Series(y_true))
+    chunks = ((X.iloc[i:i + 500], pd.Series(y_true[i:i + 500])) for i in range(0, 2000, 500))
+    assert evaluator.evaluate_chunks(chunks) == expected
+    assert evaluate_chunks(model, [(X, pd.Series(y_true))], threshold=0.4).f1 == expected.f1
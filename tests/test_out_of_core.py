@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.artifact import load_artifact
+from src.models.out_of_core import FeatureChunks, OutOfCoreTrainer, holdout_mask
+from src.models.production import ProductionChurnModel
+
+
+@pytest.fixture(scope="module")
+def chunks() -> FeatureChunks:
+    preprocessor = TelcoPreprocessor(output="array", dtype="float32")
+    return FeatureChunks(TelcoDataLoader(), preprocessor, chunksize=1000).fit()
+
+
+@pytest.fixture(scope="module")
+def trainer(chunks: FeatureChunks) -> OutOfCoreTrainer:
+    trainer = OutOfCoreTrainer(sgd_epochs=2)
+    trainer.train_chunked(chunks, log_to_mlflow=False)
+    return trainer
+
+
+def test_holdout_mask_ignores_chunk_size() -> None:
+    whole = holdout_mask(0, 10_000, test_size=0.2, random_state=42)
+    pieces = np.concatenate([holdout_mask(s, 700, 0.2, 42) for s in range(0, 10_000, 700)])
+    np.testing.assert_array_equal(pieces[:10_000], whole)
+    assert whole.mean() == pytest.approx(0.2, abs=0.02)
+    assert not np.array_equal(whole, holdout_mask(0, 10_000, 0.2, random_state=7))
+
+
+def test_chunks_split_every_row_once(chunks: FeatureChunks) -> None:
+    df = TelcoDataLoader().load_data()
+    holdout = holdout_mask(0, len(df), chunks.test_size, chunks.random_state)
+    train = list(chunks.iter_train())
+    test = list(chunks.iter_test())
+    assert sum(len(y) for _, y in train) == len(chunks.train_labels) == int((~holdout).sum())
+    assert sum(len(y) for _, y in test) == chunks.n_test == int(holdout.sum())
+    np.testing.assert_array_equal(np.concatenate([y for _, y in train]), chunks.train_labels)
+
+    X_train = np.concatenate([X for X, _ in train])
+    names = TelcoPreprocessor().prepare_features(df)[2]
+    assert chunks.preprocessor.feature_names == names
+    assert X_train.dtype == np.float32 and X_train.shape == (len(chunks.train_labels), len(names))
+
+
+def test_refit_starts_over() -> None:
+    data = FeatureChunks(TelcoDataLoader(), TelcoPreprocessor(), chunksize=2000).fit()
+    n_test, labels = data.n_test, data.train_labels
+    mean, categories = data.preprocessor.scaler.mean_.copy(), data.preprocessor.categories
+    data.fit()
+    assert data.n_test == n_test
+    np.testing.assert_array_equal(data.train_labels, labels)
+    assert data.preprocessor.scaler.n_samples_seen_ == n_test + len(labels)
+    np.testing.assert_allclose(data.preprocessor.scaler.mean_, mean)
+    assert data.preprocessor.categories == categories
+
+
+def test_chunked_fits_require_both_classes() -> None:
+    data = FeatureChunks(TelcoDataLoader(), TelcoPreprocessor())
+    data.train_labels = np.zeros(100, dtype=np.int8)
+    trainer = OutOfCoreTrainer()
+    models = trainer.get_models()
+    for fit, name in [
+        (trainer.fit_sgd, "SGD Logistic Regression"),
+        (trainer.fit_xgboost, "XGBoost"),
+        (trainer.fit_lightgbm, "LightGBM"),
+    ]:
+        with pytest.raises(ValueError, match="both classes"):
+            fit(models[name], data)
+
+
+def test_trains_every_candidate_out_of_core(
+    trainer: OutOfCoreTrainer, chunks: FeatureChunks
+) -> None:
+    assert list(trainer.results) == ["SGD Logistic Regression", "XGBoost", "LightGBM"]
+    assert trainer.best_model_name in trainer.results
+    X, _ = next(chunks.iter_test())
+    for name, metrics in trainer.results.items():
+        assert metrics["roc_auc"] > 0.8, name
+        assert trainer.models[name].predict_proba(X).shape == (len(X), 2)
+        assert len(trainer.curves[name].thresholds) > 0
+
+
+def test_xgboost_external_memory_matches_in_memory(
+    trainer: OutOfCoreTrainer, chunks: FeatureChunks, tmp_path: Path
+) -> None:
+    cache_dir = tmp_path / "xgboost"
+    paged = OutOfCoreTrainer(xgboost_cache_dir=str(cache_dir))
+    model = paged.fit_xgboost(paged.get_models()["XGBoost"], chunks)
+    # XGBoost deletes its pages once the DMatrix is freed; only the directory remains.
+    assert cache_dir.is_dir()
+    X, _ = next(chunks.iter_test())
+    np.testing.assert_allclose(
+        model.predict_proba(X), trainer.models["XGBoost"].predict_proba(X), rtol=1e-6
+    )
+
+
+@pytest.mark.parametrize("name", ["SGD Logistic Regression", "XGBoost", "LightGBM"])
+def test_out_of_core_models_ship_as_production_artifacts(
+    trainer: OutOfCoreTrainer, chunks: FeatureChunks, name: str, tmp_path: Path
+) -> None:
+    prod_model = ProductionChurnModel(trainer.models[name], chunks.preprocessor, threshold=0.4)
+    prod_model.save_lean(str(tmp_path))
+    lean = load_artifact(str(tmp_path))
+
+    records = TelcoDataLoader().load_data().sample(30, random_state=0).to_dict("records")
+    expected = prod_model.predict_many(records)
+    for got, want in zip(lean.predict_many(records), expected, strict=True):
+        assert got["churn_probability"] == pytest.approx(want["churn_probability"], abs=1e-5)
+    frame = pd.DataFrame(records)
+    assert prod_model.predict_proba(prod_model.prepare_frame(frame)).shape == (30, 2)
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from api.predictor import PredictionCache, content_identity, get_risk_level, model_identity
+
+RESULT = {"churn_prediction": 1, "churn_probability": 0.7}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_make_key_is_order_independent() -> None:
+    a = PredictionCache.make_key({"tenure": 1, "gender": "Male"}, "m1")
+    b = PredictionCache.make_key({"gender": "Male", "tenure": 1}, "m1")
+    assert a == b
+
+
+def test_make_key_includes_model_identity() -> None:
+    record = {"tenure": 1}
+    assert PredictionCache.make_key(record, "m1") != PredictionCache.make_key(record, "m2")
+
+
+def test_content_identity_follows_file_content(tmp_path: Path) -> None:
+    model_file = tmp_path / "model.pkl"
+    model_file.write_bytes(b"weights-1")
+    first = content_identity(str(model_file))
+    assert content_identity(str(model_file)) == first
+    assert content_identity(str(model_file), "onnx") != first
+    model_file.write_bytes(b"weights-2")
+    assert content_identity(str(model_file)) != first
+
+    artifact = tmp_path / "lean"
+    artifact.mkdir()
+    (artifact / "manifest.json").write_text("{}")
+    before = content_identity(str(artifact))
+    (artifact / "model.json").write_text("{}")
+    assert content_identity(str(artifact)) != before
+
+
+def test_model_identity_is_stored_on_the_model() -> None:
+    class Model:
+        metadata = {"model_type": "Fake", "identity": "abc"}
+
+    assert model_identity(Model()) == "abc"
+    unloaded = Model()
+    unloaded.metadata = {"model_type": "Fake"}
+    identity = model_identity(unloaded)
+    assert unloaded.metadata["identity"] == identity
+
+
+def test_cache_returns_copies() -> None:
+    cache = PredictionCache(max_size=2)
+    result = dict(RESULT)
+    cache.put("a", result)
+    result["churn_prediction"] = 0
+    hit = cache.get("a")
+    assert hit == RESULT
+    assert hit is not None
+    hit["churn_probability"] = 0.0
+    assert cache.get("a") == RESULT
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = PredictionCache(max_size=2)
+    cache.put("a", RESULT)
+    cache.put("b", RESULT)
+    assert cache.get("a") == RESULT
+    cache.put("c", RESULT)
+    assert cache.get("b") is None
+    assert cache.get("a") == RESULT
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_cache_expires_entries_after_ttl() -> None:
+    clock = FakeClock()
+    cache = PredictionCache(max_size=4, ttl_seconds=10, clock=clock)
+    cache.put("a", RESULT)
+    clock.now = 5
+    assert cache.get("a") == RESULT
+    clock.now = 20
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_get_risk_level_bands() -> None:
+    assert get_risk_level(0.1) == "LOW"
+    assert get_risk_level(0.45) == "MEDIUM"
+    assert get_risk_level(0.9) == "HIGH"
@@ -1,3 +1,5 @@
+import pickle
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -102,3 +104,121 @@ def test_is_fitted_after_prepare(
 ) -> None:
     preprocessor.prepare_features(raw_df, fit=True)
     assert preprocessor.is_fitted is True
+
+
+def test_encode_records_category_vocabulary(
+    preprocessor: TelcoPreprocessor, raw_df: pd.DataFrame
+) -> None:
+    preprocessor.prepare_features(raw_df, fit=True)
+    assert preprocessor.categories["Contract"] == ["Month-to-month", "One year", "Two year"]
+    assert preprocessor.categories["tenure_group"] == [
+        "0-1year", "1-2years", "2-4years", "4-6years",
+    ]
+
+
+def test_transform_single_row_matches_fitted_columns(
+    preprocessor: TelcoPreprocessor, raw_df: pd.DataFrame
+) -> None:
+    X_fit, _, feature_names = preprocessor.prepare_features(raw_df, fit=True)
+    for i in range(len(raw_df)):
+        X_row, _, _ = preprocessor.prepare_features(raw_df.iloc[[i]], fit=False)
+        assert list(X_row.columns) == feature_names
+        np.testing.assert_array_equal(
+            X_row.to_numpy(dtype=float), X_fit.iloc[[i]].to_numpy(dtype=float)
+        )
+
+
+def test_unknown_category_ignored_by_default(
+    preprocessor: TelcoPreprocessor, raw_df: pd.DataFrame
+) -> None:
+    preprocessor.prepare_features(raw_df, fit=True)
+    row = raw_df.iloc[[0]].assign(Contract="Weekly")
+    X_row, _, _ = preprocessor.prepare_features(row, fit=False)
+    assert X_row["Contract_One year"].iloc[0] == 0
+    assert X_row["Contract_Two year"].iloc[0] == 0
+
+
+def test_unknown_category_raises_when_configured(raw_df: pd.DataFrame) -> None:
+    preprocessor = TelcoPreprocessor(handle_unknown="error")
+    preprocessor.prepare_features(raw_df, fit=True)
+    row = raw_df.iloc[[0]].assign(Contract="Weekly")
+    with pytest.raises(ValueError, match="Unknown categories for Contract"):
+        preprocessor.prepare_features(row, fit=False)
+
+
+def test_encode_requires_fitted_vocabulary(
+    preprocessor: TelcoPreprocessor, raw_df: pd.DataFrame
+) -> None:
+    engineered = preprocessor.engineer_features(preprocessor.clean_data(raw_df))
+    with pytest.raises(ValueError, match="not fitted"):
+        preprocessor.encode_features(engineered, fit=False)
+
+
+def test_pickle_without_handle_unknown_ignores_unknown_categories(
+    preprocessor: TelcoPreprocessor, raw_df: pd.DataFrame
+) -> None:
+    preprocessor.prepare_features(raw_df, fit=True)
+    state = pickle.loads(pickle.dumps(preprocessor)).__dict__
+    del state["handle_unknown"]
+    old = TelcoPreprocessor.__new__(TelcoPreprocessor)
+    old.__setstate__(state)
+    assert old.handle_unknown == "ignore"
+    X_row, _, _ = old.prepare_features(raw_df.iloc[[0]].assign(Contract="Weekly"), fit=False)
+    assert X_row["Contract_Two year"].iloc[0] == 0
+
+
+def test_pickle_without_vocabulary_requires_refit(
+    preprocessor: TelcoPreprocessor, raw_df: pd.DataFrame
+) -> None:
+    preprocessor.prepare_features(raw_df, fit=True)
+    state = preprocessor.__dict__.copy()
+    for attr in ("categories", "handle_unknown"):
+        del state[attr]
+    old = TelcoPreprocessor.__new__(TelcoPreprocessor)
+    old.__dict__.update(state)
+    with pytest.raises(ValueError, match="re-fit"):
+        pickle.loads(pickle.dumps(old))
+
+
+@pytest.mark.parametrize("start", ["raw", "engineered", "encoded"])
+def test_inplace_matches_copying_pipeline(raw_df: pd.DataFrame, start: str) -> None:
+    reference = TelcoPreprocessor()
+    expected_X, expected_y, _ = reference.prepare_features(raw_df, fit=True)
+
+    lean = TelcoPreprocessor()
+    frame = raw_df.copy()
+    if start != "raw":
+        frame = lean.engineer_features(lean.clean_data(frame))
+    if start == "encoded":
+        frame = lean.encode_features(frame, fit=True)
+    X, y, _ = lean.prepare_features(frame, fit=True, start=start, inplace=True)
+
+    pd.testing.assert_frame_equal(X, expected_X)
+    pd.testing.assert_series_equal(y, expected_y)
+    assert X is frame
+
+
+def test_copying_pipeline_leaves_input_untouched(
+    preprocessor: TelcoPreprocessor, raw_df: pd.DataFrame
+) -> None:
+    before = raw_df.copy()
+    preprocessor.prepare_features(raw_df, fit=True)
+    pd.testing.assert_frame_equal(raw_df, before)
+
+
+def test_partial_fit_over_chunks_matches_fit(raw_df: pd.DataFrame) -> None:
+    reference = TelcoPreprocessor()
+    expected_X, _, _ = reference.prepare_features(raw_df, fit=True)
+
+    chunked = TelcoPreprocessor()
+    for start in range(len(raw_df)):
+        chunked.partial_fit(raw_df.iloc[start:start + 1])
+    assert chunked.categories == reference.categories
+    np.testing.assert_allclose(chunked.scaler.mean_, reference.scaler.mean_)
+    np.testing.assert_allclose(chunked.scaler.scale_, reference.scaler.scale_)
+
+    X = pd.concat(
+        [chunked.prepare_features(raw_df.iloc[[i]], fit=False)[0] for i in range(len(raw_df))]
+    )
+    assert list(X.columns) == list(expected_X.columns)
+    np.testing.assert_allclose(X.to_numpy(dtype=float), expected_X.to_numpy(dtype=float))
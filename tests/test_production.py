@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.production import COMPILED_BATCH_MAX_ROWS, ProductionChurnModel
+
+
+@pytest.fixture(scope="module")
+def telco_df() -> pd.DataFrame:
+    return TelcoDataLoader().load_data()
+
+
+@pytest.fixture(scope="module")
+def prod_model(telco_df: pd.DataFrame) -> ProductionChurnModel:
+    preprocessor = TelcoPreprocessor()
+    X, y, _ = preprocessor.prepare_features(telco_df, fit=True)
+    model = LogisticRegression(max_iter=1000).fit(X, y)
+    return ProductionChurnModel(model, preprocessor, threshold=0.4)
+
+
+def test_prepare_frame_matches_training_features(
+    telco_df: pd.DataFrame, prod_model: ProductionChurnModel
+) -> None:
+    expected, _, _ = TelcoPreprocessor().prepare_features(telco_df, fit=True)
+    features = prod_model.prepare_frame(telco_df)
+    assert list(features.columns) == prod_model.preprocessor.feature_names
+    np.testing.assert_array_equal(
+        features.to_numpy(dtype=np.float64), expected.to_numpy(dtype=np.float64)
+    )
+
+
+def test_prepare_frame_fills_categories_missing_from_batch(
+    telco_df: pd.DataFrame, prod_model: ProductionChurnModel
+) -> None:
+    batch = telco_df[telco_df["Contract"] == "Two year"].head(5)
+    features = prod_model.prepare_frame(batch)
+    assert list(features.columns) == prod_model.preprocessor.feature_names
+    assert (features["Contract_Two year"] == 1).all()
+    assert (features["Contract_One year"] == 0).all()
+
+
+def test_predict_many_matches_predict_single(
+    telco_df: pd.DataFrame, prod_model: ProductionChurnModel
+) -> None:
+    records = telco_df.sample(40, random_state=0).to_dict("records")
+    batch = prod_model.predict_many(records)
+    assert len(batch) == len(records)
+    for record, result in zip(records, batch, strict=True):
+        single = prod_model.predict_single(record)
+        assert result["churn_prediction"] == single["churn_prediction"]
+        assert result["churn_probability"] == pytest.approx(single["churn_probability"], rel=1e-12)
+        assert result["confidence"] == pytest.approx(single["confidence"], rel=1e-9)
+
+
+def test_predict_many_single_category_batch(
+    telco_df: pd.DataFrame, prod_model: ProductionChurnModel
+) -> None:
+    record = telco_df.iloc[0].to_dict()
+    batch = prod_model.predict_many([record])
+    single = prod_model.predict_single(record)
+    assert batch[0]["churn_probability"] == pytest.approx(single["churn_probability"], rel=1e-12)
+
+
+def test_predict_many_empty(prod_model: ProductionChurnModel) -> None:
+    assert prod_model.predict_many([]) == []
+
+
+def test_predict_many_falls_back_to_pandas_path(
+    telco_df: pd.DataFrame, prod_model: ProductionChurnModel
+) -> None:
+    records = telco_df.sample(40, random_state=1).to_dict("records")
+    expected = prod_model.predict_many(records)
+    timings: list[str] = []
+    compiled, prod_model._compiled = prod_model._compiled, None
+    prod_model.stage_observer = lambda stage, _: timings.append(stage)
+    try:
+        batch = prod_model.predict_many(records)
+    finally:
+        prod_model._compiled, prod_model.stage_observer = compiled, None
+    assert timings == ["clean", "engineer", "encode", "scale", "predict"]
+    for got, want in zip(batch, expected, strict=True):
+        assert got["churn_probability"] == pytest.approx(want["churn_probability"], rel=1e-9)
+
+
+def test_large_batches_take_the_pandas_path(
+    telco_df: pd.DataFrame, prod_model: ProductionChurnModel
+) -> None:
+    records = telco_df.sample(COMPILED_BATCH_MAX_ROWS + 1, random_state=2).to_dict("records")
+    timings: list[str] = []
+    prod_model.stage_observer = lambda stage, _: timings.append(stage)
+    try:
+        batch = prod_model.predict_many(records)
+        small = prod_model.predict_many(records[:COMPILED_BATCH_MAX_ROWS])
+    finally:
+        prod_model.stage_observer = None
+    assert timings == ["clean", "engineer", "encode", "scale", "predict", "features", "predict"]
+    for got, want in zip(batch, small, strict=False):
+        assert got["churn_probability"] == pytest.approx(want["churn_probability"], rel=1e-9)
+
+
+def test_stage_observer_times_each_stage(
+    telco_df: pd.DataFrame, prod_model: ProductionChurnModel
+) -> None:
+    timings: list[tuple[str, float]] = []
+    prod_model.stage_observer = lambda stage, seconds: timings.append((stage, seconds))
+    try:
+        prod_model.predict_many(telco_df.head(20).to_dict("records"))
+        prod_model.predict_single(telco_df.iloc[0].to_dict())
+    finally:
+        prod_model.stage_observer = None
+    stages = [stage for stage, _ in timings]
+    assert stages == ["features", "predict", "features", "predict"]
+    assert all(seconds >= 0 for _, seconds in timings)
+    assert "stage_observer" not in prod_model.__getstate__()
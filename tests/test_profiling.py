@@ -0,0 +1,78 @@
+import json
+import pstats
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.features.profiling import copied_bytes, profile_preprocessing
+
+
+@pytest.fixture(scope="module")
+def telco_df() -> pd.DataFrame:
+    return TelcoDataLoader().load_data()
+
+
+def test_profile_records_each_stage_without_changing_features(telco_df: pd.DataFrame) -> None:
+    expected, _, _ = TelcoPreprocessor().prepare_features(telco_df)
+    with profile_preprocessing() as profile:
+        X, _, _ = TelcoPreprocessor().prepare_features(telco_df)
+    pd.testing.assert_frame_equal(X, expected)
+
+    assert [s.stage for s in profile.stages] == ["clean", "engineer", "encode", "scale"]
+    for stage in profile.stages:
+        assert stage.seconds > 0
+        assert stage.rows == len(telco_df)
+        assert stage.peak_memory_bytes is not None and stage.peak_memory_bytes > 0
+        # Every stage starts with a full copy of its input.
+        assert stage.bytes_copied > 0
+    starts = [s.started_at for s in profile.stages]
+    assert starts == sorted(starts)
+
+
+def test_inplace_stages_report_only_the_columns_they_replace(telco_df: pd.DataFrame) -> None:
+    with profile_preprocessing(memory=False) as copying:
+        TelcoPreprocessor().prepare_features(telco_df)
+    with profile_preprocessing(memory=False) as inplace:
+        TelcoPreprocessor().prepare_features(telco_df.copy(), inplace=True)
+    copied = {s.stage: s.bytes_copied for s in inplace.stages}
+    assert copied["encode"] > 0 and copied["scale"] > 0
+    for stage in copying.stages:
+        assert copied[stage.stage] < stage.bytes_copied
+
+
+def test_stages_outside_the_context_are_not_recorded(telco_df: pd.DataFrame) -> None:
+    with profile_preprocessing(memory=False) as profile:
+        TelcoPreprocessor().clean_data(telco_df)
+    TelcoPreprocessor().clean_data(telco_df)
+    assert [s.stage for s in profile.stages] == ["clean"]
+    assert profile.stages[0].peak_memory_bytes is None
+
+
+def test_copied_bytes_ignores_shared_buffers() -> None:
+    df = pd.DataFrame({"a": range(1000), "b": [0.5] * 1000})
+    assert copied_bytes(df, df) == 0
+    assert copied_bytes(df, df.copy()) == df.memory_usage(index=False).sum()
+
+
+def test_save_writes_chrome_trace_and_cprofile_report(
+    telco_df: pd.DataFrame, tmp_path: Path
+) -> None:
+    with profile_preprocessing(memory=False, profiler="cprofile") as profile:
+        TelcoPreprocessor().prepare_features(telco_df)
+    trace_path, report_path = profile.save(tmp_path)
+
+    with open(trace_path) as f:
+        events = json.load(f)["traceEvents"]
+    assert [e["name"] for e in events] == ["clean", "engineer", "encode", "scale"]
+    assert all(e["ph"] == "X" and e["dur"] > 0 for e in events)
+    functions = {name for _, _, name in pstats.Stats(str(report_path)).stats}
+    assert "encode_features" in functions
+
+
+def test_unknown_profiler_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        with profile_preprocessing(profiler="perf"):
+            pass
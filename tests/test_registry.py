@@ -0,0 +1,126 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.registry import ModelNotFoundError, ModelRegistry
+from tests.test_api import SAMPLE_CUSTOMER
+
+WARMUP = {"tenure": 1}
+
+
+class FakeModel:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.metadata: dict[str, Any] = {"model_type": "Fake"}
+
+    def predict_single(self, record: dict[str, Any]) -> dict[str, Any]:
+        if "broken" in self.path:
+            raise RuntimeError("warm-up failed")
+        version = self.metadata["registry_version"]
+        return {"churn_prediction": 1, "churn_probability": 0.5, "confidence": 0.1,
+                "version": version}
+
+    def predict_many(self, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [self.predict_single(r) for r in records]
+
+
+def publish(root: Path, name: str, version: str) -> None:
+    (root / name / version).mkdir(parents=True)
+
+
+@pytest.fixture()
+def registry(tmp_path: Path) -> ModelRegistry:
+    publish(tmp_path, "churn", "v001")
+    publish(tmp_path, "churn", "v002")
+    registry = ModelRegistry(str(tmp_path), FakeModel, WARMUP, keep_versions=2)
+    registry.scan()
+    return registry
+
+
+def test_scan_activates_newest_and_keeps_older_for_routing(registry: ModelRegistry) -> None:
+    assert registry.get().metadata["registry_version"] == "v002"
+    assert registry.get("churn", "v001").metadata["registry_version"] == "v001"
+    with pytest.raises(ModelNotFoundError):
+        registry.get("churn", "v999")
+    with pytest.raises(ModelNotFoundError):
+        registry.get("other")
+
+
+def test_new_version_switches_over_and_prunes(registry: ModelRegistry, tmp_path: Path) -> None:
+    previous = registry.get()
+    publish(tmp_path, "churn", "v003")
+    assert registry.scan() == [("churn", "v003")]
+    assert registry.get().metadata["registry_version"] == "v003"
+    assert previous.metadata["registry_version"] == "v002"
+    assert registry.describe()["models"][0]["versions"] == ["v002", "v003"]
+    assert registry.scan() == []
+
+
+def test_failed_warmup_keeps_serving_previous_version(
+    registry: ModelRegistry, tmp_path: Path
+) -> None:
+    publish(tmp_path, "churn", "v003-broken")
+    assert registry.scan() == []
+    assert registry.get().metadata["registry_version"] == "v002"
+    failed = registry.describe()["models"][0]["failed"]
+    assert "warm-up failed" in failed["v003-broken"]
+
+
+def test_rollback_survives_rescan(registry: ModelRegistry) -> None:
+    assert registry.rollback("churn") == "v001"
+    registry.scan()
+    assert registry.get().metadata["registry_version"] == "v001"
+    with pytest.raises(ModelNotFoundError):
+        registry.rollback("churn")
+
+
+def test_watcher_picks_up_new_versions(tmp_path: Path) -> None:
+    publish(tmp_path, "churn", "v001")
+    registry = ModelRegistry(str(tmp_path), FakeModel, WARMUP, poll_seconds=0.01)
+    registry.scan()
+    registry.start()
+    try:
+        publish(tmp_path, "churn", "v002")
+        for _ in range(500):
+            if registry.get().metadata["registry_version"] == "v002":
+                break
+            registry._stop.wait(0.01)
+    finally:
+        registry.stop()
+    assert registry.get().metadata["registry_version"] == "v002"
+
+
+@pytest.fixture()
+def client(registry: ModelRegistry) -> Iterator[TestClient]:
+    from api import predictor
+    from api.main import app
+
+    # api.main may have been first imported while another test patched get_model.
+    with patch.object(predictor, "get_registry", return_value=registry), \
+            patch("api.main.get_registry", return_value=registry), \
+            patch("api.main.get_model", predictor.get_model):
+        yield TestClient(app)
+
+
+def test_api_routes_by_header_and_exposes_admin(client: TestClient) -> None:
+    default = client.post("/predict", json=SAMPLE_CUSTOMER).json()
+    assert default["model_version"] == "v002"
+    pinned = client.post(
+        "/predict", json=SAMPLE_CUSTOMER, headers={"X-Model-Version": "v001"}
+    ).json()
+    assert pinned["model_version"] == "v001"
+    missing = client.post("/predict", json=SAMPLE_CUSTOMER, headers={"X-Model-Name": "nope"})
+    assert missing.status_code == 404
+
+    listing = client.get("/models").json()
+    assert listing["enabled"] is True
+    assert listing["models"][0]["active_version"] == "v002"
+    rolled = client.post("/models/churn/rollback").json()
+    assert rolled["models"][0]["active_version"] == "v001"
+    assert client.post("/models/churn/activate/v002").status_code == 200
+    assert client.post("/models/churn/activate/v999").status_code == 404
+    assert client.post("/models/reload").status_code == 200
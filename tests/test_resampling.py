@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.cv import cross_validate, fold_indices
+from src.models.resampling import ResamplingCache
+from src.models.trainer import ChurnModelTrainer
+from src.models.tuner import HyperparameterTuner
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[pd.DataFrame, pd.Series]:
+    X, y, _ = TelcoPreprocessor().prepare_features(TelcoDataLoader().load_data(), fit=True)
+    assert y is not None
+    return X.iloc[:2000], y.iloc[:2000]
+
+
+def test_resample_is_cached_by_content(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    cache = ResamplingCache("smote")
+    first = cache.resample(X, y)
+    second = cache.resample(X.copy(), y.copy())
+    assert second[0] is first[0]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert np.bincount(first[1]).tolist() == [np.bincount(y).max()] * 2
+
+
+def test_disk_cache_is_shared_between_instances(
+    tmp_path: Path, data: tuple[pd.DataFrame, pd.Series]
+) -> None:
+    X, y = data
+    expected = ResamplingCache("undersample", cache_dir=tmp_path).resample(X, y)
+    other = ResamplingCache("undersample", cache_dir=tmp_path)
+    X_rs, y_rs = other.resample(X, y)
+    assert other.hits == 1
+    pd.testing.assert_frame_equal(X_rs, expected[0])
+
+
+def test_parallel_neighbors_match_default(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    default = ResamplingCache("smote").resample(X, y)
+    parallel = ResamplingCache("smote", parallel_neighbors_min_samples=0).resample(X, y)
+    pd.testing.assert_frame_equal(parallel[0], default[0])
+
+
+def test_cross_validate_resamples_only_training_folds(
+    data: tuple[pd.DataFrame, pd.Series]
+) -> None:
+    X, y = data
+    cache = ResamplingCache("smote")
+    result = cross_validate(LogisticRegression(max_iter=1000), X, y, resampler=cache)
+    assert cache.misses == 5
+    np.testing.assert_array_equal(result.oof_labels(), y.to_numpy())
+    cross_validate(LogisticRegression(max_iter=1000), X, y, resampler=cache)
+    assert (cache.hits, cache.misses) == (5, 5)
+
+
+def test_augmented_search_data_validates_on_original_rows(
+    data: tuple[pd.DataFrame, pd.Series]
+) -> None:
+    X, y = data
+    splits = fold_indices(X, y, cv=3)
+    X_aug, y_aug, aug_splits = ResamplingCache("smote").augmented_search_data(X, y, splits)
+    assert len(X_aug) == len(y_aug)
+    for (train, val), (orig_train, orig_val) in zip(aug_splits, splits, strict=True):
+        np.testing.assert_array_equal(val, orig_val)
+        assert train.min() >= len(X)
+        majority = np.bincount(y.iloc[orig_train]).max()
+        assert np.bincount(y_aug.iloc[train]).tolist() == [majority, majority]
+
+
+def test_tuner_reuses_trainer_folds(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    trainer = ChurnModelTrainer()
+    resampler = trainer.resampler("smote")
+    resampler.resample_folds(X, y, fold_indices(X, y, cv=3))
+    resampler.resample(X, y)
+    tuner = HyperparameterTuner(n_jobs=1, resampler=resampler)
+    model, params = tuner.tune_model("LightGBM", X, y, n_iter=2, cv=3)
+    assert resampler.misses == 4
+    assert resampler.hits >= 4
+    assert model.get_params()["n_estimators"] == params["n_estimators"]
+
+
+def test_unknown_imbalance_method() -> None:
+    with pytest.raises(ValueError, match="Unknown imbalance method"):
+        ResamplingCache("adasyn")
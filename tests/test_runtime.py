@@ -0,0 +1,133 @@
+import pickle
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.artifact import load_artifact
+from src.models.production import ProductionChurnModel
+from src.models.runtime import compile_runtime, default_runtime
+from src.models.trainer import ChurnModelTrainer
+
+# LightGBM splits on float64 thresholds that ONNX stores as float32, so a few rows
+# sitting right on a split land in the other leaf; Treelite keeps it exact.
+PARITY: list[tuple[str, str, float]] = [
+    ("Logistic Regression", "onnx", 1e-6),
+    ("Random Forest", "onnx", 1e-6),
+    ("Random Forest", "treelite", 1e-9),
+    ("Gradient Boosting", "onnx", 1e-6),
+    ("Gradient Boosting", "treelite", 1e-9),
+    ("XGBoost", "onnx", 1e-6),
+    ("XGBoost", "treelite", 1e-6),
+    ("LightGBM", "onnx", 2e-2),
+    ("LightGBM", "treelite", 1e-9),
+]
+
+
+@pytest.fixture(scope="module")
+def telco_df() -> pd.DataFrame:
+    return TelcoDataLoader().load_data()
+
+
+@pytest.fixture(scope="module")
+def fitted(telco_df: pd.DataFrame) -> tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]:
+    preprocessor = TelcoPreprocessor()
+    X, y, _ = preprocessor.prepare_features(telco_df, fit=True)
+    assert y is not None
+    return preprocessor, X, y
+
+
+@pytest.fixture(scope="module")
+def models(fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series]) -> dict[str, Any]:
+    _, X, y = fitted
+    candidates = ChurnModelTrainer().get_models()
+    for model in candidates.values():
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=1)
+        model.fit(X, y)
+    return candidates
+
+
+@pytest.mark.parametrize(("model_name", "kind", "tolerance"), PARITY)
+def test_runtime_matches_native_predict_proba(
+    model_name: str,
+    kind: str,
+    tolerance: float,
+    models: dict[str, Any],
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series],
+) -> None:
+    _, X, _ = fitted
+    model = models[model_name]
+    backend = compile_runtime(model, kind).backend(threads=1)
+    got = backend.predict_proba(X.to_numpy(dtype=np.float64))
+    np.testing.assert_allclose(got, model.predict_proba(X), atol=tolerance, rtol=0)
+
+
+def test_default_runtime() -> None:
+    models = ChurnModelTrainer().get_models()
+    assert default_runtime(models["Logistic Regression"]) == "onnx"
+    assert default_runtime(models["XGBoost"]) == "onnx"
+    assert default_runtime(models["LightGBM"]) == "treelite"
+
+
+def test_treelite_rejects_linear_models(models: dict[str, Any]) -> None:
+    with pytest.raises(ValueError, match="tree ensembles only"):
+        compile_runtime(models["Logistic Regression"], "treelite")
+
+
+def test_production_model_dispatches_to_runtime_and_survives_pickle(
+    telco_df: pd.DataFrame,
+    models: dict[str, Any],
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series],
+) -> None:
+    preprocessor, _, _ = fitted
+    prod_model = ProductionChurnModel(models["LightGBM"], preprocessor, threshold=0.4)
+    records = telco_df.sample(30, random_state=1).to_dict("records")
+    native = prod_model.predict_many(records)
+
+    prod_model.use_runtime("auto", threads=2)
+    assert prod_model.metadata["runtime"] == "treelite"
+    restored = pickle.loads(pickle.dumps(prod_model))
+    for model in (prod_model, restored):
+        for got, want in zip(model.predict_many(records), native, strict=True):
+            assert got["churn_probability"] == pytest.approx(want["churn_probability"], abs=1e-9)
+
+    prod_model.use_runtime("native")
+    assert prod_model.runtime is None
+    assert prod_model.metadata["runtime"] == "native"
+
+
+def test_runtime_scores_mixed_dtype_frames(
+    telco_df: pd.DataFrame,
+    models: dict[str, Any],
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series],
+) -> None:
+    preprocessor, _, _ = fitted
+    prod_model = ProductionChurnModel(models["Logistic Regression"], preprocessor)
+    frame = prod_model.prepare_frame(telco_df.head(20))
+    assert isinstance(frame, pd.DataFrame) and frame.dtypes.nunique() > 1
+    native = prod_model.predict_proba(frame)
+    prod_model.use_runtime("onnx")
+    np.testing.assert_allclose(prod_model.predict_proba(frame), native, atol=1e-5, rtol=0)
+
+
+def test_lean_artifact_carries_compiled_runtime(
+    telco_df: pd.DataFrame,
+    models: dict[str, Any],
+    fitted: tuple[TelcoPreprocessor, pd.DataFrame, pd.Series],
+    tmp_path: Path,
+) -> None:
+    preprocessor, _, _ = fitted
+    prod_model = ProductionChurnModel(models["Random Forest"], preprocessor, threshold=0.4)
+    prod_model.use_runtime("treelite")
+    prod_model.save_lean(str(tmp_path))
+    assert (tmp_path / "model.tl").exists()
+
+    lean = load_artifact(str(tmp_path), threads=1)
+    records = telco_df.sample(30, random_state=2).to_dict("records")
+    for got, want in zip(lean.predict_many(records), prod_model.predict_many(records), strict=True):
+        assert got["churn_probability"] == pytest.approx(want["churn_probability"], abs=1e-9)
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from pipelines.score_pipeline import score_file
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.production import ProductionChurnModel
+
+
+@pytest.fixture(scope="module")
+def telco_sample() -> pd.DataFrame:
+    return TelcoDataLoader().load_data().head(300)
+
+
+@pytest.fixture(scope="module")
+def model_path(telco_sample: pd.DataFrame, tmp_path_factory: pytest.TempPathFactory) -> str:
+    preprocessor = TelcoPreprocessor()
+    X, y, _ = preprocessor.prepare_features(telco_sample, fit=True)
+    model = ProductionChurnModel(LogisticRegression(max_iter=1000).fit(X, y), preprocessor, 0.4)
+    out_dir = tmp_path_factory.mktemp("production")
+    model.save(str(out_dir))
+    return str(out_dir / "churn_model_production.pkl")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_file_csv_matches_in_process_scoring(
+    telco_sample: pd.DataFrame, model_path: str, tmp_path: Path, workers: int
+) -> None:
+    source = tmp_path / "input.csv"
+    telco_sample.to_csv(source, index=False)
+    report = score_file(
+        str(source), str(tmp_path / "scores.csv"), model_path, chunk_size=70, workers=workers
+    )
+
+    scores = pd.read_csv(tmp_path / "scores.csv")
+    assert report["rows"] == len(telco_sample)
+    assert list(scores.columns) == [
+        "customerID", "churn_probability", "churn_prediction", "risk_level",
+    ]
+    assert scores["customerID"].tolist() == telco_sample["customerID"].tolist()
+    expected = ProductionChurnModel.load(model_path).predict_many(
+        telco_sample.to_dict("records")
+    )
+    np.testing.assert_allclose(
+        scores["churn_probability"], [r["churn_probability"] for r in expected], rtol=1e-9
+    )
+
+
+def test_score_file_parquet_round_trip(
+    telco_sample: pd.DataFrame, model_path: str, tmp_path: Path
+) -> None:
+    source = tmp_path / "input.parquet"
+    telco_sample.to_parquet(source, index=False)
+    report = score_file(
+        str(source), str(tmp_path / "scores.parquet"), model_path, chunk_size=100, workers=2
+    )
+    scores = pd.read_parquet(tmp_path / "scores.parquet")
+    assert len(scores) == len(telco_sample)
+    assert set(scores["risk_level"]).issubset({"LOW", "MEDIUM", "HIGH"})
+    assert report["rows_per_second"] > 0
+
+
+def test_score_file_missing_input_raises(model_path: str, tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        score_file(str(tmp_path / "missing.csv"), str(tmp_path / "out.csv"), model_path)
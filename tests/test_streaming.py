@@ -0,0 +1,213 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from api.schemas import CustomerData
+from api.streaming import MAX_LINE_BYTES, iter_lines
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.production import COMPILED_BATCH_MAX_ROWS, ProductionChurnModel
+from tests.test_api import SAMPLE_CUSTOMER
+
+CSV_HEADER = ",".join(["customerID", *SAMPLE_CUSTOMER])
+
+
+def _csv_line(customer_id: str, **overrides: Any) -> str:
+    values = {**SAMPLE_CUSTOMER, **overrides}
+    return ",".join([customer_id, *(str(v) for v in values.values())])
+
+
+def _score(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    probabilities = [0.9 if r["tenure"] < 12 else 0.1 for r in records]
+    return [{"churn_prediction": int(p > 0.5), "churn_probability": p} for p in probabilities]
+
+
+@pytest.fixture()
+def stream_model() -> MagicMock:
+    model = MagicMock()
+    model.metadata = {"model_type": "RandomForestClassifier"}
+    model.predict_many.side_effect = _score
+    return model
+
+
+@pytest.fixture()
+def stream_client(stream_model: MagicMock) -> Iterator[TestClient]:
+    from api.main import app
+
+    with patch("api.main.get_model", return_value=stream_model):
+        yield TestClient(app)
+
+
+def _lines(body: str) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def test_iter_lines_reassembles_split_chunks() -> None:
+    async def chunks() -> AsyncIterator[bytes]:
+        for part in (b"a\nb", b"c\r\n", b"d"):
+            yield part
+
+    async def collect() -> list[str | None]:
+        return [line async for line in iter_lines(chunks())]
+
+    assert asyncio.run(collect()) == ["a", "bc", "d"]
+
+
+def test_iter_lines_skips_lines_over_the_cap() -> None:
+    async def chunks() -> AsyncIterator[bytes]:
+        for part in (b"ok\nxxxx", b"xxxx", b"xx\nyy", b"yyyyyy\nlast"):
+            yield part
+
+    async def collect() -> list[str | None]:
+        return [line async for line in iter_lines(chunks(), max_line_bytes=5)]
+
+    assert asyncio.run(collect()) == ["ok", None, None, "last"]
+
+
+def test_stream_reports_body_without_newlines(stream_client: TestClient) -> None:
+    row = json.dumps({**SAMPLE_CUSTOMER, "customerID": "after"})
+    body = "x" * (8 * MAX_LINE_BYTES) + "\n" + row
+    response = stream_client.post(
+        "/predict/stream", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    results = _lines(response.text)
+    assert f"exceeds {MAX_LINE_BYTES} bytes" in results[0]["error"]
+    assert [r["row"] for r in results] == [0, 1]
+    assert results[1]["customerID"] == "after" and "error" not in results[1]
+
+
+def test_stream_ndjson_scores_every_row_in_chunks(
+    stream_client: TestClient, stream_model: MagicMock
+) -> None:
+    rows = [{**SAMPLE_CUSTOMER, "customerID": f"c{i}", "tenure": i * 5} for i in range(5)]
+    body = "\n".join(json.dumps(r) for r in rows)
+    response = stream_client.post(
+        "/predict/stream?chunk_size=2",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = _lines(response.text)
+    assert [r["customerID"] for r in results] == [f"c{i}" for i in range(5)]
+    assert [r["risk_level"] for r in results] == ["HIGH", "HIGH", "HIGH", "LOW", "LOW"]
+    assert [len(c.args[0]) for c in stream_model.predict_many.call_args_list] == [2, 2, 1]
+
+
+def test_stream_csv_with_blank_total_charges(stream_client: TestClient) -> None:
+    body = "\n".join([
+        CSV_HEADER,
+        _csv_line("a"),
+        _csv_line("b", tenure=0, TotalCharges=" "),
+    ])
+    response = stream_client.post(
+        "/predict/stream", content=body, headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    results = _lines(response.text)
+    assert [r["customerID"] for r in results] == ["a", "b"]
+    assert all("error" not in r for r in results)
+
+
+def test_stream_reports_invalid_rows_and_continues(stream_client: TestClient) -> None:
+    body = "\n".join([
+        json.dumps({**SAMPLE_CUSTOMER, "customerID": "ok"}),
+        json.dumps({**SAMPLE_CUSTOMER, "customerID": "bad", "Contract": "Weekly"}),
+        "{not json",
+        json.dumps({**SAMPLE_CUSTOMER, "customerID": "ok2"}),
+    ])
+    response = stream_client.post(
+        "/predict/stream", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    results = _lines(response.text)
+    errors = [r for r in results if "error" in r]
+    assert [r["row"] for r in errors] == [1, 2]
+    assert errors[0]["customerID"] == "bad"
+    assert [r["customerID"] for r in results if "error" not in r] == ["ok", "ok2"]
+
+
+def test_stream_csv_quoted_field_spanning_lines(stream_client: TestClient) -> None:
+    body = "\n".join([
+        CSV_HEADER,
+        _csv_line('"multi\nline"'),
+        _csv_line("b"),
+        _csv_line('"never closed'),
+        _csv_line("c"),
+    ])
+    response = stream_client.post(
+        "/predict/stream", content=body, headers={"Content-Type": "text/csv"}
+    )
+    results = _lines(response.text)
+    assert [r["customerID"] for r in results if "error" not in r] == ["multi\nline", "b"]
+    errors = [r for r in results if "error" in r]
+    assert [r["row"] for r in errors] == [2]
+    assert "unterminated quoted field" in errors[0]["error"]
+
+
+def test_stream_reports_failed_chunk_and_continues(
+    stream_client: TestClient, stream_model: MagicMock
+) -> None:
+    def flaky(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if any(r["tenure"] == 71 for r in records):
+            raise RuntimeError("model exploded")
+        return _score(records)
+
+    stream_model.predict_many.side_effect = flaky
+    ids = ["a", "boom", "c", "d"]
+    body = "\n".join(
+        json.dumps({**SAMPLE_CUSTOMER, "customerID": i, "tenure": 71 if i == "boom" else 5})
+        for i in ids
+    )
+    response = stream_client.post(
+        "/predict/stream?chunk_size=2",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = _lines(response.text)
+    assert [r["customerID"] for r in results] == ids
+    assert [r.get("error") for r in results] == ["Scoring failed", "Scoring failed", None, None]
+    assert [r["row"] for r in results] == [0, 1, 2, 3]
+
+
+def test_stream_large_chunks_take_the_frame_path() -> None:
+    from api.main import app
+
+    telco_df = TelcoDataLoader().load_data().dropna()
+    preprocessor = TelcoPreprocessor()
+    X, y, _ = preprocessor.prepare_features(telco_df, fit=True)
+    model = ProductionChurnModel(LogisticRegression(max_iter=1000).fit(X, y), preprocessor)
+    stages: list[str] = []
+    model.stage_observer = lambda stage, _: stages.append(stage)
+
+    size = COMPILED_BATCH_MAX_ROWS + 200
+    rows = telco_df.head(size).to_dict("records")
+    body = "\n".join(json.dumps(r) for r in rows)
+    with patch("api.main.get_model", return_value=model):
+        response = TestClient(app).post(
+            f"/predict/stream?chunk_size={size}",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+    results = _lines(response.text)
+    assert len(results) == size and all("error" not in r for r in results)
+    assert stages == ["clean", "engineer", "encode", "scale", "predict"]
+
+    model.stage_observer = None
+    records = [CustomerData.model_validate(r).model_dump() for r in rows]
+    expected = [*model.predict_many(records[:500]), *model.predict_many(records[500:1000])]
+    for got, want in zip(results, expected, strict=False):
+        assert got["churn_probability"] == pytest.approx(want["churn_probability"], rel=1e-9)
+
+
+def test_stream_rejects_unsupported_content_type(stream_client: TestClient) -> None:
+    response = stream_client.post(
+        "/predict/stream", content="x", headers={"Content-Type": "text/plain"}
+    )
+    assert response.status_code == 415
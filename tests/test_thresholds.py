@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import f1_score, fbeta_score, precision_score, recall_score
+
+from src.evaluation.evaluator import ModelEvaluator
+from src.evaluation.thresholds import CostMatrix, threshold_curve
+
+
+@pytest.fixture()
+def scored() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 500)
+    # Rounded so that many rows share a probability, as tree ensembles produce.
+    y_prob = np.round(np.clip(y_true * 0.3 + rng.random(500) * 0.7, 0, 1), 2)
+    return y_true, y_prob
+
+
+def test_curve_matches_sklearn_at_every_cut_point(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    curve = threshold_curve(y_true, y_prob)
+    np.testing.assert_array_equal(curve.thresholds, np.unique(y_prob)[::-1])
+    for i, t in enumerate(curve.thresholds):
+        y_pred = (y_prob >= t).astype(int)
+        assert curve.precision[i] == pytest.approx(precision_score(y_true, y_pred, zero_division=0))
+        assert curve.recall[i] == pytest.approx(recall_score(y_true, y_pred))
+        assert curve.f1[i] == pytest.approx(f1_score(y_true, y_pred))
+        assert curve.fbeta(2.0)[i] == pytest.approx(fbeta_score(y_true, y_pred, beta=2.0))
+    assert (curve.tp + curve.fp + curve.fn + curve.tn == len(y_true)).all()
+
+
+def test_best_f1_beats_fixed_grid(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    _, best_f1 = threshold_curve(y_true, y_prob).best("f1")
+    grid = max(f1_score(y_true, (y_prob >= t).astype(int)) for t in np.arange(0.1, 0.9, 0.02))
+    assert best_f1 >= grid
+
+
+def test_cost_objective_minimises_total_cost(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    costs = CostMatrix(tp=50, fp=50, fn=500)
+    threshold, cost = threshold_curve(y_true, y_prob).best("cost", costs=costs)
+    brute = {
+        t: 50 * ((y_prob >= t).sum()) + 500 * ((y_prob < t) & (y_true == 1)).sum()
+        for t in np.unique(y_prob)
+    }
+    assert cost == min(brute.values())
+    assert brute[threshold] == cost
+
+
+def test_cost_objective_requires_matrix(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    with pytest.raises(ValueError, match="CostMatrix"):
+        threshold_curve(*scored).best("cost")
+
+
+def test_evaluator_scores_test_set_once(scored: tuple[np.ndarray, np.ndarray]) -> None:
+    y_true, y_prob = scored
+    model = MagicMock()
+    model.predict.return_value = (y_prob >= 0.5).astype(int)
+    model.predict_proba.return_value = np.c_[1 - y_prob, y_prob]
+    X = pd.DataFrame({"x": y_prob})
+    evaluator = ModelEvaluator(model, "mock")
+    evaluator.evaluate(X, pd.Series(y_true))
+    threshold, _ = evaluator.find_optimal_threshold(X, pd.Series(y_true))
+    assert model.predict_proba.call_count == 1
+    assert threshold in set(y_prob)
+    assert evaluator.threshold_curve(X, pd.Series(y_true)).to_frame().shape[0] == len(
+        np.unique(y_prob)
+    )
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.trainer import ChurnModelTrainer, allocate_threads
+
+
+@pytest.fixture(scope="module")
+def splits() -> tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    X, y, _ = TelcoPreprocessor().prepare_features(TelcoDataLoader().load_data(), fit=True)
+    assert y is not None
+    return ChurnModelTrainer().split_data(X, y)
+
+
+def test_allocate_threads_splits_cores() -> None:
+    assert allocate_threads(n_models=5, n_workers=5, n_cpus=32) == (5, 6)
+    assert allocate_threads(n_models=5, n_workers=8, n_cpus=4) == (4, 1)
+    assert allocate_threads(n_models=5, n_workers=2, n_cpus=1) == (1, 1)
+
+
+def test_parallel_training_matches_serial(
+    splits: tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]
+) -> None:
+    serial = ChurnModelTrainer()
+    serial.train_all_models(*splits, cv=False, log_to_mlflow=False)
+    parallel = ChurnModelTrainer()
+    parallel.train_all_models(*splits, cv=False, log_to_mlflow=False, n_workers=2)
+
+    assert list(parallel.results) == list(serial.results)
+    assert parallel.best_model_name == serial.best_model_name
+    for name, metrics in serial.results.items():
+        for key in ("precision", "recall", "f1_score", "roc_auc"):
+            assert parallel.results[name][key] == pytest.approx(metrics[key], abs=1e-6)
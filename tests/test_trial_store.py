@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import socket
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sklearn.metrics import f1_score, make_scorer
+from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.trial_store import TrialStore, study_key
+from src.models.tuner import HyperparameterTuner
+
+
+def _data() -> tuple[pd.DataFrame, pd.Series]:
+    X, y, _ = TelcoPreprocessor().prepare_features(TelcoDataLoader().load_data(), fit=True)
+    assert y is not None
+    return X.iloc[:1000], y.iloc[:1000]
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[pd.DataFrame, pd.Series]:
+    return _data()
+
+
+def _tune_in_process(store_path: str) -> int:
+    X, y = _data()
+    tuner = HyperparameterTuner(n_jobs=1, store=TrialStore(store_path), store_poll_seconds=0.1)
+    tuner.tune_model("LightGBM", X, y, n_iter=6, cv=2)
+    report = tuner.reports["LightGBM"]
+    return report.n_candidates - report.n_cached
+
+
+def test_claim_respects_live_workers_and_takes_over_dead_ones(tmp_path: Path) -> None:
+    store = TrialStore(tmp_path / "trials.sqlite")
+    study, params = study_key(model="m"), {"max_depth": 3}
+    assert store.claim(study, params)
+    assert store.claim(study, params)
+
+    other = TrialStore(tmp_path / "trials.sqlite")
+    other.worker = f"{socket.gethostname()}:{os.getppid()}"
+    assert other.claim(study, {"max_depth": 5})
+    assert not store.claim(study, {"max_depth": 5})
+
+    other.worker = f"{socket.gethostname()}:999999999"
+    assert other.claim(study, {"max_depth": 6})
+    assert store.claim(study, {"max_depth": 6})
+
+    store.complete(study, params, [0.5, 0.7], fit_seconds=1.0)
+    trial = store.get(study, params)
+    assert trial is not None
+    assert trial.status == "complete"
+    assert trial.mean_score == pytest.approx(0.6)
+    assert not other.claim(study, params)
+
+
+def test_store_scores_match_randomized_search(
+    tmp_path: Path, data: tuple[pd.DataFrame, pd.Series]
+) -> None:
+    X, y = data
+    tuner = HyperparameterTuner(n_jobs=1, store=TrialStore(tmp_path / "trials.sqlite"))
+    _, params = tuner.tune_model("LightGBM", X, y, n_iter=4, cv=3)
+
+    search = RandomizedSearchCV(
+        tuner._get_base_model("LightGBM"),
+        tuner._param_space("LightGBM", "random", None),
+        n_iter=4, random_state=42, scoring=make_scorer(f1_score),
+        cv=StratifiedKFold(n_splits=3, shuffle=True, random_state=42),
+    ).fit(X, y)
+    assert tuner.reports["LightGBM"].best_score == pytest.approx(search.best_score_)
+    assert params == search.best_params_
+
+
+def test_second_run_is_served_from_store(
+    tmp_path: Path, data: tuple[pd.DataFrame, pd.Series]
+) -> None:
+    X, y = data
+    path = tmp_path / "trials.sqlite"
+    first = HyperparameterTuner(n_jobs=1, store=TrialStore(path))
+    first.tune_model("LightGBM", X, y, n_iter=3, cv=2)
+    second = HyperparameterTuner(n_jobs=1, store=TrialStore(path))
+    second.tune_model("LightGBM", X, y, n_iter=5, cv=2)
+    report = second.reports["LightGBM"]
+    assert report.n_cached == 3
+    assert report.n_fits == 2 * 2
+    assert report.best_score >= first.reports["LightGBM"].best_score
+
+
+def test_interrupted_trial_is_resumed(
+    tmp_path: Path, data: tuple[pd.DataFrame, pd.Series]
+) -> None:
+    X, y = data
+    path = tmp_path / "trials.sqlite"
+    HyperparameterTuner(n_jobs=1, store=TrialStore(path)).tune_model(
+        "LightGBM", X, y, n_iter=2, cv=2
+    )
+    dead_worker = f"{socket.gethostname()}:999999999"
+    with sqlite3.connect(path) as conn:
+        (study,) = {row[0] for row in conn.execute("SELECT study FROM trials")}
+        conn.execute(
+            "UPDATE trials SET status = 'running', worker = ? WHERE rowid = 1", (dead_worker,)
+        )
+    store = TrialStore(path)
+    tuner = HyperparameterTuner(n_jobs=1, store=store)
+    tuner.tune_model("LightGBM", X, y, n_iter=2, cv=2)
+    assert tuner.reports["LightGBM"].n_cached == 1
+    assert all(t.status == "complete" for t in store.trials(study))
+
+
+def test_concurrent_processes_share_trials(tmp_path: Path) -> None:
+    path = str(tmp_path / "trials.sqlite")
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        evaluated = pool.map(_tune_in_process, [path, path])
+    assert sum(evaluated) == 6
+
+
+def test_store_rejects_halving(tmp_path: Path, data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    tuner = HyperparameterTuner(store=TrialStore(tmp_path / "trials.sqlite"))
+    with pytest.raises(ValueError, match="grid and random"):
+        tuner.tune_model("LightGBM", X, y, search_type="halving")
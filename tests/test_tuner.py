@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from xgboost import XGBClassifier
+
+from src.data.loader import TelcoDataLoader
+from src.features.preprocessor import TelcoPreprocessor
+from src.models.tuner import EarlyStoppingClassifier, HyperparameterTuner
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[pd.DataFrame, pd.Series]:
+    X, y, _ = TelcoPreprocessor().prepare_features(TelcoDataLoader().load_data(), fit=True)
+    assert y is not None
+    return X.iloc[:1500], y.iloc[:1500]
+
+
+@pytest.mark.parametrize(
+    "estimator",
+    [
+        XGBClassifier(n_estimators=500, learning_rate=0.3, eval_metric="logloss"),
+        LGBMClassifier(n_estimators=500, learning_rate=0.3, verbose=-1),
+    ],
+)
+def test_early_stopping_cuts_boosting_rounds(
+    data: tuple[pd.DataFrame, pd.Series], estimator: object
+) -> None:
+    X, y = data
+    model = EarlyStoppingClassifier(estimator, early_stopping_rounds=10).fit(X, y)
+    assert 1 <= model.best_iteration_ < 500
+    assert model.predict_proba(X).shape == (len(X), 2)
+    assert list(model.feature_names_in_) == list(X.columns)
+
+
+def test_halving_search_with_early_stopping(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    tuner = HyperparameterTuner(n_jobs=1)
+    model, params = tuner.tune_model("LightGBM", X, y, search_type="halving", n_iter=6, cv=2)
+    assert isinstance(model, LGBMClassifier)
+    assert params["n_estimators"] < 500
+    assert not any(k.startswith("estimator__") for k in params)
+    report = tuner.reports["LightGBM"]
+    assert report.n_candidates > 6
+    assert [t[1] for t in report.trace] == sorted(t[1] for t in report.trace)
+    assert report.trace[-1][1] == pytest.approx(report.best_score)
+
+
+def test_halving_grid_uses_n_estimators_budget(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    tuner = HyperparameterTuner(n_jobs=1)
+    tuner._param_space = lambda *_: {"max_depth": [5, 10], "min_samples_leaf": [1, 4]}  # type: ignore[method-assign]
+    model, params = tuner.tune_model("Random Forest", X, y, search_type="halving_grid", cv=2)
+    assert model.n_estimators == params["n_estimators"]
+    assert tuner.report_dataframe()["Search"].tolist() == ["halving_grid"]
+
+
+def test_unknown_search_type(data: tuple[pd.DataFrame, pd.Series]) -> None:
+    X, y = data
+    with pytest.raises(ValueError, match="Unknown search type"):
+        HyperparameterTuner().tune_model("LightGBM", X, y, search_type="bayes")